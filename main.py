@@ -2,6 +2,8 @@
 3D 노드 에디터 메인 프로그램
 """
 import sys
+import shutil
+import tempfile
 from pathlib import Path
 
 # src 디렉토리를 Python 경로에 추가
@@ -9,15 +11,21 @@ sys.path.append(str(Path(__file__).parent))
 
 from src.scene_manager import NodeEditor3D
 from src.data_structures import LineType
+from src.scene_events import DirtyTracker, SceneEventType
+from src.connection_order import CONNECTION_ORDERS
+from src.grouping import EXTERIOR_GROUP_ID
+from src.clustering import CLUSTER_METHODS
 from src.midas_parser import MidasMGBParser  # 절대 import로 변경
 import pyqtgraph.opengl as gl
 from OpenGL.GL import glMatrixMode, glLoadIdentity, glOrtho, GL_PROJECTION, GL_MODELVIEW
 # ✅ 여기에 추가!
 import numpy as np  # 이미 있을 수도 있음
-from sklearn.cluster import DBSCAN
 from sklearn.linear_model import LinearRegression
 from scipy.spatial.distance import cdist
 
+# 그룹 메뉴에 하나씩 보여 줄 최대 그룹 수 (나머지는 한 항목으로 묶음)
+MAX_GROUP_MENU_ITEMS = 30
+
 # ✅ PanelMapping 클래스 정의 (파일 상단, 전역 레벨)
 class PanelMapping:
     """패널 맵핑 정보를 저장하는 클래스"""
@@ -121,7 +129,73 @@ def test_basic_functionality():
     print(f"   씬 경계: {bounds_min} ~ {bounds_max}")
     print(f"   씬 중심: {center}")
     print(f"   총 노드 수: {len(editor.scene.nodes)}")
-    print(f"   총 라인 수: {len(editor.scene.lines)}")
+    print(f"   총 라인 수: {len(editor.scene.lines)}\n")
+    
+    # 8. 히스토리 메모리 예산 (clear 로 버린 씬도 예산 안에서만 보관)
+    print("8. 히스토리 메모리 예산 테스트")
+    budget_editor = NodeEditor3D()
+    history = budget_editor.scene.history
+    history.max_bytes = 1_000_000
+    for i in range(10):
+        budget_editor.scene.add_nodes_bulk(np.arange(i * 1000, (i + 1) * 1000),
+                                           np.random.rand(1000, 3))
+        budget_editor.scene.clear()
+    info = history.get_info()
+    assert info['ram_bytes'] <= history.max_bytes, info
+    print(f"   메모리: {info['ram_bytes']:,} / {history.max_bytes:,} 바이트, "
+          f"실행 취소 단계: {info['undo_steps']}개")
+    
+    # 9. 저널 복구 (압축 기준에서 clear 를 되돌린 직후 비정상 종료)
+    print("9. 저널 복구 테스트")
+    journal_root = tempfile.mkdtemp()
+    try:
+        crashed = NodeEditor3D()
+        crashed.enable_journal(journal_root)
+        crashed.scene.add_nodes_bulk(np.arange(1, 1001), np.random.rand(1000, 3))
+        crashed.scene.clear()
+        journal = crashed.scene.journal
+        journal.wait_compaction()
+        journal.compact_bytes = 1  # 실행 취소 중 첫 기록부터 압축 기준을 넘음
+        crashed.scene.undo()
+        journal.close()  # 세션 파일을 남긴 채 종료
+        
+        recovered = NodeEditor3D()
+        assert recovered.enable_journal(journal_root)
+        numbers = [n.number for n in recovered.scene.nodes]
+        assert len(numbers) == 1000 and len(set(numbers)) == 1000, len(numbers)
+        recovered.scene.journal.close(discard=True)
+        print(f"   복구된 노드: {len(numbers)}개 (중복 없음)")
+    finally:
+        shutil.rmtree(journal_root, ignore_errors=True)
+    
+    # 10. 히스토리 임시 파일 크기 (실행 취소 → 다시 실행 → 다시 내보내기 반복)
+    print("10. 히스토리 임시 파일 크기 테스트")
+    spill_editor = NodeEditor3D()
+    scene = spill_editor.scene
+    scene.add_nodes_bulk(np.arange(1, 1001), np.random.rand(1000, 3))
+    history = scene.history
+    history.max_bytes = 200_000
+    for _ in range(10):
+        scene.set_node_positions(scene.nodes, np.random.rand(1000, 3))
+    file_bytes = history.get_info()['spill_file_bytes']
+    for _ in range(10):
+        for _ in range(5):
+            scene.undo()
+        for _ in range(5):
+            scene.redo()
+    info = history.get_info()
+    assert info['spill_file_bytes'] <= max(2 * info['disk_bytes'], file_bytes), info
+    print(f"   임시 파일: {info['spill_file_bytes']:,} 바이트 "
+          f"(내보낸 데이터 {info['disk_bytes']:,} 바이트)")
+
+
+def _split_pivot(parts):
+    """명령 인자 끝의 기준점 지정 분리 (centroid | origin | node <번호>)"""
+    if len(parts) >= 2 and parts[-2] == "node":
+        return parts[:-2], int(parts[-1])
+    if parts and parts[-1] in ("centroid", "origin"):
+        return parts[:-1], parts[-1]
+    return parts, "centroid"
 
 
 def interactive_mode():
@@ -131,14 +205,30 @@ def interactive_mode():
     print("\n=== 3D 노드 에디터 대화형 모드 ===")
     print("명령어:")
     print("  load <파일경로> - CSV 파일 로드")
+    print("  view <파일경로> - 바이너리 모델(.ne3d) 읽기 전용 열기")
     print("  save <파일경로> - CSV 파일 저장")
     print("  add <x> <y> <z> - 노드 추가")
     print("  select all - 모든 노드 선택")
     print("  select box <x1> <y1> <z1> <x2> <y2> <z2> - 박스 영역 선택")
-    print("  connect material|paner - 선택된 노드 연결")
+    print("  connect material|paner [number|nearest|mst|path|loop] - 선택된 노드 연결")
+    print("  autoconnect material|paner <최대거리> [최소거리] [축 x|y|z|xy...] - 거리 범위 안의 노드 쌍 모두 연결")
+    print("  group components [최소크기] - 라인 연결 성분으로 그룹 나누기")
+    print("  group voxel|dbscan <거리> [최소점수] [selected] - 공간 군집으로 그룹 나누기")
+    print("  weld <허용오차> [selected] - 겹친 노드 합치기 (라인은 남는 노드로 옮김)")
+    print("  intersect [허용오차] [select] [selected] - 교차하는 라인을 교차점에서 나누기 (select: 선택만)")
     print("  delete - 선택된 노드 삭제")
+    print("  move <dx> <dy> <dz> - 선택된 노드 이동")
+    print("  rotate x|y|z <각도> [기준점] - 선택된 노드 회전")
+    print("  scale <배율> | <sx> <sy> <sz> [기준점] - 선택된 노드 크기 변경")
+    print("  mirror x|y|z [기준점] - 선택된 노드 대칭 (x: YZ 평면 기준)")
+    print("    기준점: centroid(기본) | origin | node <번호>")
+    print("  array linear <dx> <dy> <dz> <개수> [weld <허용오차>] - 선형 배열 복사")
+    print("  array grid <ux> <uy> <uz> <nu> <vx> <vy> <vz> <nv> [weld <허용오차>] - 격자 배열 복사")
+    print("  array polar x|y|z <각도> <개수> [기준점] [weld <허용오차>] - 원형 배열 복사")
     print("  undo - 실행 취소")
+    print("  redo - 다시 실행")
     print("  info - 씬 정보 표시")
+    print("  validate [허용오차] [select] - 모델 검사 (select: 문제 노드/라인 선택)")
     print("  quit - 종료")
     print()
     
@@ -153,6 +243,10 @@ def interactive_mode():
                 filepath = command[5:].strip()
                 editor.load_csv(filepath)
                 
+            elif command.startswith("view "):
+                filepath = command[5:].strip()
+                editor.open_read_only(filepath)
+                
             elif command.startswith("save "):
                 filepath = command[5:].strip()
                 editor.save_csv(filepath, include_lines=True)
@@ -183,29 +277,150 @@ def interactive_mode():
                     print("사용법: select box <x1> <y1> <z1> <x2> <y2> <z2>")
                     
             elif command.startswith("connect "):
-                line_type_str = command[8:].strip()
-                if line_type_str == "material":
-                    editor.scene.connect_selected_nodes(LineType.MATERIAL)
+                parts = command[8:].split()
+                line_type_str = parts[0] if parts else ""
+                order = parts[1] if len(parts) > 1 else "number"
+                if order not in CONNECTION_ORDERS:
+                    print(f"연결 순서는 {'|'.join(CONNECTION_ORDERS)} 중 하나입니다.")
+                elif line_type_str == "material":
+                    editor.scene.connect_selected_nodes(LineType.MATERIAL, order)
                 elif line_type_str == "paner":
-                    editor.scene.connect_selected_nodes(LineType.PANER)
+                    editor.scene.connect_selected_nodes(LineType.PANER, order)
+                else:
+                    print("사용법: connect material|paner [number|nearest|mst|path|loop]")
+                    
+            elif command.startswith("autoconnect "):
+                parts = command[12:].split()
+                line_types = {"material": LineType.MATERIAL, "paner": LineType.PANER}
+                axes = parts.pop() if len(parts) > 2 and parts[-1].isalpha() else None
+                if 2 <= len(parts) <= 3 and parts[0] in line_types:
+                    min_distance = float(parts[2]) if len(parts) == 3 else 0.0
+                    editor.auto_connect_selected(line_types[parts[0]], float(parts[1]),
+                                                 min_distance, axes)
+                else:
+                    print("사용법: autoconnect material|paner <최대거리> [최소거리] [x|y|z|xy...]")
+                    
+            elif command.startswith("group "):
+                parts = command[6:].split()
+                selected_only = bool(parts) and parts[-1] == "selected"
+                if selected_only:
+                    parts = parts[:-1]
+                if parts and parts[0] == "components" and len(parts) <= 2:
+                    editor.group_by_connectivity(int(parts[1]) if len(parts) == 2 else 2)
+                elif parts and parts[0] in CLUSTER_METHODS and 2 <= len(parts) <= 3:
+                    default_min = 5 if parts[0] == "dbscan" else 1
+                    editor.cluster_groups(parts[0], float(parts[1]),
+                                          int(parts[2]) if len(parts) == 3 else default_min,
+                                          selected_only)
+                else:
+                    print("사용법: group components [최소크기] | group voxel|dbscan <거리> [최소점수] [selected]")
+                    
+            elif command.startswith("weld "):
+                parts = command[5:].split()
+                selected_only = bool(parts) and parts[-1] == "selected"
+                if selected_only:
+                    parts = parts[:-1]
+                if len(parts) == 1:
+                    editor.weld_nodes(float(parts[0]), selected_only)
+                else:
+                    print("사용법: weld <허용오차> [selected]")
+                    
+            elif command == "intersect" or command.startswith("intersect "):
+                parts = command[9:].split()
+                selected_only = "selected" in parts
+                select = "select" in parts
+                parts = [p for p in parts if p not in ("select", "selected")]
+                if len(parts) <= 1:
+                    editor.split_intersections(float(parts[0]) if parts else 1e-3,
+                                               not select, selected_only)
                 else:
-                    print("사용법: connect material|paner")
+                    print("사용법: intersect [허용오차] [select] [selected]")
                     
             elif command == "delete":
                 count = len(editor.scene.selected_nodes)
                 editor.scene.remove_selected_nodes()
                 print(f"{count}개 노드 삭제됨")
                 
+            elif command.startswith("move "):
+                parts = command[5:].split()
+                if len(parts) == 3:
+                    editor.move_selected_nodes(*map(float, parts))
+                else:
+                    print("사용법: move <dx> <dy> <dz>")
+                    
+            elif command.startswith("rotate "):
+                parts, pivot = _split_pivot(command[7:].split())
+                if len(parts) == 2:
+                    editor.rotate_selected(parts[0], float(parts[1]), pivot)
+                else:
+                    print("사용법: rotate x|y|z <각도> [centroid|origin|node <번호>]")
+                    
+            elif command.startswith("scale "):
+                parts, pivot = _split_pivot(command[6:].split())
+                if len(parts) in (1, 3):
+                    factors = [float(p) for p in parts]
+                    editor.scale_selected(factors[0] if len(factors) == 1 else factors, pivot)
+                else:
+                    print("사용법: scale <배율> | <sx> <sy> <sz> [centroid|origin|node <번호>]")
+                    
+            elif command.startswith("mirror "):
+                parts, pivot = _split_pivot(command[7:].split())
+                if len(parts) == 1:
+                    editor.mirror_selected(parts[0], pivot)
+                else:
+                    print("사용법: mirror x|y|z [centroid|origin|node <번호>]")
+                    
+            elif command.startswith("array "):
+                parts = command[6:].split()
+                weld = None
+                if len(parts) >= 2 and parts[-2] == "weld":
+                    weld = float(parts[-1])
+                    parts = parts[:-2]
+                mode, args = (parts[0], parts[1:]) if parts else ("", [])
+                if mode == "linear" and len(args) == 4:
+                    editor.array_copy_linear(list(map(float, args[:3])), int(args[3]), weld)
+                elif mode == "grid" and len(args) == 8:
+                    editor.array_copy_grid(list(map(float, args[0:3])), int(args[3]),
+                                           list(map(float, args[4:7])), int(args[7]), weld)
+                elif mode == "polar":
+                    args, pivot = _split_pivot(args)
+                    if len(args) == 3:
+                        editor.array_copy_polar(args[0], int(args[2]), float(args[1]), pivot, weld)
+                    else:
+                        print("사용법: array polar x|y|z <각도> <개수> [기준점] [weld <허용오차>]")
+                else:
+                    print("사용법: array linear|grid|polar ... (help 참고)")
+                    
             elif command == "undo":
                 editor.scene.undo()
                 
+            elif command == "redo":
+                editor.scene.redo()
+                
             elif command == "info":
-                print(f"노드: {len(editor.scene.nodes)}개")
-                print(f"라인: {len(editor.scene.lines)}개")
+                print(f"노드: {editor.scene.node_count}개")
+                print(f"라인: {editor.scene.line_count}개")
                 print(f"선택: {len(editor.scene.selected_nodes)}개")
+                history = editor.scene.history.get_info()
+                print(f"히스토리: {history['undo_steps']}단계 "
+                      f"(메모리 {history['ram_bytes'] / 1024 ** 2:.1f}MB, "
+                      f"디스크 {history['disk_bytes'] / 1024 ** 2:.1f}MB)")
                 bounds_min, bounds_max = editor.scene.get_bounds()
                 print(f"경계: {bounds_min} ~ {bounds_max}")
                 
+            elif command == "validate" or command.startswith("validate "):
+                parts = command[8:].split()
+                select = bool(parts) and parts[-1] == "select"
+                if select:
+                    parts = parts[:-1]
+                report = editor.scene.validate(float(parts[0]) if parts else 1e-6)
+                print("🔍 모델 검사 결과:" if not report.is_clean else "✅ 모델 검사: 문제 없음")
+                for line in report.summary():
+                    print(f"   {line}")
+                if select:
+                    editor.scene.select_issues(report)
+                    print(f"선택됨: {editor.scene.selected_count}개 노드")
+                
             else:
                 print("알 수 없는 명령어입니다.")
                 
@@ -617,9 +832,13 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             
             # 시각화 요소들
             self.scatter_plot = None
+            self.scatter_nodes = []   # 스캐터 플롯에 그려진 노드 (색상만 갱신할 때 사용)
             self.line_plots = []
             self.text_items = []
             
+            # 씬 변경 추적 - 선택만 바뀌었으면 다시 만들지 않고 색상만 갱신
+            self.scene_dirty = DirtyTracker(self.editor.scene.events)
+            
             # 선택 관련
             self.selection_mode = False
             self.is_dragging = False
@@ -655,10 +874,24 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             
             self.midpoint_mode = False
             
+            # 작업 저널 (비정상 종료 시 다음 실행에서 복구)
+            if self.editor.enable_journal():
+                self.update_scene()
+                self.update_status()
+                self.status_bar.showMessage("🩹 이전 세션의 작업을 복구했습니다", 5000)
+            self.journal_timer = QtCore.QTimer(self)
+            self.journal_timer.timeout.connect(self.editor.sync_journal)
+            self.journal_timer.start(1000)
+            
             # ✅ 키보드 포커스 설정 (맨 끝에 추가)
             self.setFocusPolicy(QtCore.Qt.StrongFocus)
             self.setFocus()
         
+        def closeEvent(self, event):
+            """정상 종료 - 저널 정리"""
+            self.editor.close_journal(discard=True)
+            super().closeEvent(event)
+        
         def create_menubar(self):
             """메뉴바 생성"""
             menubar = self.menuBar()
@@ -667,8 +900,13 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             file_menu = menubar.addMenu('파일')
             file_menu.addAction('CSV 불러오기', self.load_csv)
             file_menu.addAction('Elements 불러오기', self.load_elements_csv)
+            file_menu.addAction('MIDAS 모델 불러오기 (MGT)', self.load_mgb)
+            file_menu.addAction('🔒 바이너리 모델 보기 (읽기 전용)', self.open_read_only)
             file_menu.addSeparator()
             file_menu.addAction('CSV 저장', self.save_csv)
+            file_menu.addAction('바이너리 모델 저장', self.save_binary)
+            file_menu.addAction('MIDAS MGT 내보내기', self.save_mgt)
+            file_menu.addAction('🧹 가져오기 캐시 비우기', self.clear_import_cache)
             file_menu.addSeparator()
             file_menu.addAction('종료', self.close)
             # ✅ 런처 열기 추가
@@ -682,8 +920,15 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             edit_menu.addAction('모두 선택', self.select_all)
             edit_menu.addAction('선택 해제', self.clear_selection)
             edit_menu.addSeparator()
-            edit_menu.addAction('선택 삭제', self.delete_selected)
-            edit_menu.addAction('실행 취소', self.undo)
+            # 씬을 바꾸는 액션 - 읽기 전용 모드에서는 비활성 (update_edit_actions)
+            self.edit_actions = [
+                edit_menu.addAction('선택 삭제', self.delete_selected),
+                edit_menu.addAction('배열 복사...', self.array_copy_dialog),
+                edit_menu.addAction('거리 기준 자동 연결...', self.auto_connect_dialog),
+                edit_menu.addAction('겹친 노드 합치기...', self.weld_nodes_dialog),
+                edit_menu.addAction('실행 취소', self.undo),
+                edit_menu.addAction('다시 실행', self.redo),
+            ]
             
             # 보기 메뉴
             view_menu = menubar.addMenu('보기')
@@ -731,29 +976,53 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             self.truss_action.triggered.connect(lambda checked: self.toggle_truss_layer(
                 QtCore.Qt.Checked if checked else QtCore.Qt.Unchecked))
             
-            # 그룹 메뉴
-            group_menu = menubar.addMenu('그룹')
-            
+            # 그룹 메뉴 (씬에 있는 그룹으로 다시 만듦 - rebuild_group_menu)
+            self.group_menu = menubar.addMenu('그룹')
             self.group_actions = []
-            for i in range(5):  # Group 1-5
-                action = group_menu.addAction(f'Group {i+1}')
-                action.setCheckable(True)
-                action.setChecked(True)
-                action.triggered.connect(lambda checked, group=i: self.toggle_group(group, checked))
-                self.group_actions.append(action)
-            
-            group_menu.addSeparator()
-            group_menu.addAction('모든 그룹 표시', self.all_groups_on)
-            group_menu.addAction('모든 그룹 숨김', self.all_groups_off)
+            self.rebuild_group_menu()
             
             # 도구 메뉴
             tools_menu = menubar.addMenu('도구')
             tools_menu.addAction('거리 측정', self.toggle_distance_mode) if hasattr(self, 'toggle_distance_mode') else None
             tools_menu.addAction('중점 노드 생성', self.toggle_midpoint_mode) if hasattr(self, 'toggle_midpoint_mode') else None
             tools_menu.addAction('🏗️ 패널 편집기 열기', self.open_panel_editor)
+            tools_menu.addAction('🔍 모델 검사', self.validate_model)
+            self.edit_actions.append(
+                tools_menu.addAction('✂️ 교차 라인 나누기...', self.split_intersections_dialog))
             tools_menu.addSeparator()
             tools_menu.addAction('패턴 학습', self.learn_pattern) if hasattr(self, 'learn_pattern') else None
             
+        def validate_model(self):
+            """모델 검사 - 결과를 보여 주고 원하면 문제 노드/라인 선택"""
+            report = self.editor.scene.validate()
+            if report.is_clean:
+                QtWidgets.QMessageBox.information(self, '모델 검사', '✅ 문제가 없습니다.')
+                return
+            text = '\n'.join(report.summary()) + '\n\n문제가 된 노드/라인을 선택할까요?'
+            answer = QtWidgets.QMessageBox.question(self, '모델 검사', text)
+            if answer == QtWidgets.QMessageBox.Yes:
+                self.editor.scene.select_issues(report)
+                self.update_scene()
+                self.update_status()
+            
+        def split_intersections_dialog(self):
+            """노드 없이 교차하는 라인 찾기 / 교차점에서 나누기 (선택 라인이 있으면 그 안에서만)"""
+            selected_only = bool(self.editor.scene.selected_lines)
+            target = '선택 라인' if selected_only else '전체 라인'
+            tolerance, ok = QtWidgets.QInputDialog.getDouble(
+                self, '교차 라인 나누기', f'허용오차 ({target}):', 0.001, 0.0, 1000.0, 4)
+            if not ok:
+                return
+            modes = ['교차점에서 나누기', '교차 라인 선택만']
+            mode, ok = QtWidgets.QInputDialog.getItem(
+                self, '교차 라인 나누기', '작업:', modes, 0, False)
+            if not ok:
+                return
+            count = self.editor.split_intersections(tolerance, mode == modes[0], selected_only)
+            self.update_scene()
+            self.update_status()
+            self.status_bar.showMessage(f"✂️ 교차 {count}곳", 3000)
+            
         def open_launcher(self):
             """런처를 별도 창으로 열기 (현재 프로그램 유지)"""
             import subprocess
@@ -794,11 +1063,24 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             self.line_type_combo.setMaximumWidth(80)
             toolbar.addWidget(self.line_type_combo)
             
+            # 연결 순서
+            self.connect_order_combo = QtWidgets.QComboBox()
+            self.connect_order_combo.addItem("번호순", 'number')
+            self.connect_order_combo.addItem("최근접", 'nearest')
+            self.connect_order_combo.addItem("MST", 'mst')
+            self.connect_order_combo.addItem("최단경로", 'path')
+            self.connect_order_combo.addItem("최단폐곡선", 'loop')
+            self.connect_order_combo.setToolTip('연결 순서')
+            self.connect_order_combo.setMaximumWidth(100)
+            toolbar.addWidget(self.connect_order_combo)
+            
             connect_action = toolbar.addAction('🔗')
             connect_action.setToolTip('선택한 노드 연결')
             connect_action.triggered.connect(
-                lambda: self.connect_nodes(self.line_type_combo.currentData())
+                lambda: self.connect_nodes(self.line_type_combo.currentData(),
+                                           self.connect_order_combo.currentData())
             )
+            self.edit_actions.append(connect_action)
             
             toolbar.addSeparator()
             
@@ -806,6 +1088,7 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             exterior_group_action = toolbar.addAction('🏢 외장 그룹')
             exterior_group_action.setToolTip('선택한 노드/라인을 외장 그룹(Group 5)으로 설정')
             exterior_group_action.triggered.connect(self.set_selected_as_exterior_group)
+            self.edit_actions.append(exterior_group_action)
             
             toolbar.addSeparator()
             
@@ -862,7 +1145,9 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             toolbar.addSeparator()
             
             # 실행 취소
-            toolbar.addAction('↩️', self.undo).setToolTip('실행 취소')
+            undo_action = toolbar.addAction('↩️', self.undo)
+            undo_action.setToolTip('실행 취소')
+            self.edit_actions.append(undo_action)
             
             # ✅ 줌 모드 토글 추가
             self.zoom_mode_action = toolbar.addAction('🔍 Zoom Mode')
@@ -888,35 +1173,119 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 self.setCursor(QtCore.Qt.ArrowCursor)
                 self.status_bar.showMessage("줌 모드 해제", 2000)    
             
+        def rebuild_group_menu(self):
+            """그룹 메뉴를 씬에 있는 그룹 ID 로 다시 만듦 (많으면 앞쪽만, 나머지는 한 항목)"""
+            self.group_menu.clear()
+            self.group_actions = []
+            scene = self.editor.scene
+            group_ids = sorted(set(getattr(n, 'group_id', 0) for n in scene.nodes)
+                               | {EXTERIOR_GROUP_ID}) if not scene.read_only else []
+            
+            for group_id in group_ids[:MAX_GROUP_MENU_ITEMS]:
+                label = f'Group {group_id + 1}'
+                if group_id == EXTERIOR_GROUP_ID:
+                    label += ' (외장)'
+                self._add_group_action(label, [group_id])
+            rest = group_ids[MAX_GROUP_MENU_ITEMS:]
+            if rest:
+                self._add_group_action(f'나머지 그룹 {len(rest)}개', rest)
+            
+            self.group_menu.addSeparator()
+            self.group_edit_actions = [
+                self.group_menu.addAction('연결 성분으로 그룹 나누기', self.group_by_connectivity),
+                self.group_menu.addAction('공간 군집으로 그룹 나누기...', self.cluster_groups_dialog),
+            ]
+            for action in self.group_edit_actions:
+                action.setEnabled(not scene.read_only)
+            self.group_menu.addAction('모든 그룹 표시', self.all_groups_on)
+            self.group_menu.addAction('모든 그룹 숨김', self.all_groups_off)
+            
+        def _add_group_action(self, label, group_ids):
+            action = self.group_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(True)
+            action.setData(group_ids)
+            action.triggered.connect(lambda checked, ids=group_ids: self.toggle_group(ids, checked))
+            self.group_actions.append(action)
+            
+        def group_by_connectivity(self):
+            """라인 연결 성분 기준으로 그룹 재계산"""
+            count = self.editor.group_by_connectivity()
+            self.update_scene()
+            self.update_status()
+            self.status_bar.showMessage(f"🧩 연결 성분 그룹 {count}개", 3000)
+            
+        def cluster_groups_dialog(self):
+            """공간 군집(DBSCAN/복셀)으로 그룹 나누기 - 계산은 작업 스레드에서"""
+            if getattr(self, 'cluster_job', None) is not None:
+                self.status_bar.showMessage("⏳ 군집 계산이 이미 진행 중입니다", 3000)
+                return
+            method, ok = QtWidgets.QInputDialog.getItem(
+                self, '공간 군집', '방식 (voxel: 대용량, dbscan: 밀도 기반):',
+                list(CLUSTER_METHODS[::-1]), 0, False)
+            if not ok:
+                return
+            distance_label = '복셀 크기:' if method == 'voxel' else '이웃 반경 (eps):'
+            distance, ok = QtWidgets.QInputDialog.getDouble(
+                self, '공간 군집', distance_label, 1.0, 0.0001, 1e6, 4)
+            if not ok:
+                return
+            min_points, ok = QtWidgets.QInputDialog.getInt(
+                self, '공간 군집',
+                '최소 군집 크기:' if method == 'voxel' else '핵심점 최소 이웃 수:',
+                1 if method == 'voxel' else 5, 1, 100000)
+            if not ok:
+                return
+            
+            selected_only = bool(self.editor.scene.selected_nodes)
+            self.cluster_job = self.editor.start_cluster_groups(
+                method, distance, min_points, selected_only)
+            if self.cluster_job is None:
+                return
+            target = '선택 노드' if selected_only else '전체 노드'
+            self.status_bar.showMessage(f"⏳ {method} 군집 계산 중... ({target})")
+            self.cluster_timer = QtCore.QTimer(self)
+            self.cluster_timer.timeout.connect(self.poll_cluster_job)
+            self.cluster_timer.start(100)
+            
+        def poll_cluster_job(self):
+            """군집 계산이 끝났으면 결과 적용 (GUI 스레드에서)"""
+            if not self.cluster_job.done:
+                return
+            self.cluster_timer.stop()
+            job, self.cluster_job = self.cluster_job, None
+            count = self.editor.apply_cluster_job(job)
+            self.update_scene()
+            self.update_status()
+            self.status_bar.showMessage(f"🧩 {job.method} 군집 그룹 {count}개", 3000)
+            
         def toggle_group(self, group_id, visible):
-            """특정 그룹 표시/숨김"""
-            print(f"🔄 Group {group_id + 1}: {'ON' if visible else 'OFF'}")
+            """
+            그룹 표시/숨김
+            
+            Args:
+                group_id: 그룹 ID 하나 또는 그룹 ID 리스트
+                visible: 표시 여부
+            """
+            group_ids = {int(group_id)} if np.isscalar(group_id) else set(group_id)
+            names = ', '.join(f'Group {g + 1}' for g in sorted(group_ids)[:5])
+            if len(group_ids) > 5:
+                names += f' 외 {len(group_ids) - 5}개'
+            print(f"🔄 {names}: {'ON' if visible else 'OFF'}")
             
-            # 디버깅: 실제로 변경되는 노드 수 확인
             changed_nodes = 0
             changed_lines = 0
             
             # 노드 표시/숨김
             if hasattr(self.editor.scene, 'nodes'):
-                # Group 5일 때 디버깅 추가
-                if group_id == 4:  # Group 5
-                    print(f"🔍 Group 5 토글 - 전체 노드 검사 중...")
-                    
-                for node in self.editor.scene.nodes:
-                    if hasattr(node, 'group_id') and node.group_id == group_id:
-                        # 디버깅: 처음 몇 개 노드만 출력
-                        if group_id == 4 and changed_nodes < 5:
-                            print(f"   노드 {node.number}: group_id={node.group_id}, is_visible {getattr(node, 'is_visible', True)} → {visible}")
-                        
-                        node.is_visible = visible
-                        changed_nodes += 1
-            
-            # 라인 표시/숨김
-            if hasattr(self.editor.scene, 'lines'):
-                for line in self.editor.scene.lines:
-                    if hasattr(line, 'group_ids') and group_id in line.group_ids:
-                        line.is_visible = visible
-                        changed_lines += 1
+                group_nodes = [node for node in self.editor.scene.nodes
+                               if getattr(node, 'group_id', None) in group_ids]
+                group_lines = [line for line in self.editor.scene.lines
+                               if not group_ids.isdisjoint(getattr(line, 'group_ids', ()))]
+                
+                # 노드/라인 표시/숨김 (변경 알림 포함)
+                changed_nodes, changed_lines = self.editor.scene.set_visibility(
+                    visible, group_nodes, group_lines)
             
             print(f"   → 변경된 노드: {changed_nodes}개, 라인: {changed_lines}개")
             
@@ -927,29 +1296,17 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             """모든 그룹 표시"""
             print("🔛 모든 그룹 ON")
             
-            # ✅ group_buttons 대신 group_actions 사용
-            if hasattr(self, 'group_actions'):
-                for i, action in enumerate(self.group_actions):
-                    action.setChecked(True)
-                    self.toggle_group(i, True)
-            else:
-                # group_actions가 없으면 직접 처리
-                for i in range(5):  # Group 1-5
-                    self.toggle_group(i, True)
+            for action in self.group_actions:
+                action.setChecked(True)
+            self.toggle_group([g for a in self.group_actions for g in a.data()], True)
 
         def all_groups_off(self):
             """모든 그룹 숨김"""
             print("⬜ 모든 그룹 OFF")
             
-            # ✅ group_buttons 대신 group_actions 사용
-            if hasattr(self, 'group_actions'):
-                for i, action in enumerate(self.group_actions):
-                    action.setChecked(False)
-                    self.toggle_group(i, False)
-            else:
-                # group_actions가 없으면 직접 처리
-                for i in range(5):  # Group 1-5
-                    self.toggle_group(i, False)
+            for action in self.group_actions:
+                action.setChecked(False)
+            self.toggle_group([g for a in self.group_actions for g in a.data()], False)
                     
         def toggle_beam_layer(self, state):
             """BEAM 레이어 토글"""
@@ -958,9 +1315,9 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             
             # BEAM 타입 라인들 표시/숨김
             if hasattr(self.editor.scene, 'lines'):
-                for line in self.editor.scene.lines:
-                    if hasattr(line, 'line_type') and line.line_type == LineType.MATERIAL:
-                        line.is_visible = visible
+                layer = [line for line in self.editor.scene.lines
+                         if getattr(line, 'line_type', None) == LineType.MATERIAL]
+                self.editor.scene.set_visibility(visible, lines=layer)
             
             self.update_scene()
 
@@ -971,9 +1328,9 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             
             # TRUSS 타입 라인들 표시/숨김
             if hasattr(self.editor.scene, 'lines'):
-                for line in self.editor.scene.lines:
-                    if hasattr(line, 'line_type') and line.line_type == LineType.TRUSS:
-                        line.is_visible = visible
+                layer = [line for line in self.editor.scene.lines
+                         if getattr(line, 'line_type', None) == LineType.TRUSS]
+                self.editor.scene.set_visibility(visible, lines=layer)
             
             self.update_scene()
  
@@ -1048,7 +1405,7 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
 
         def fit_to_view(self):
             """모든 노드가 보이도록 카메라 조정"""
-            if not self.editor.scene.nodes:
+            if not self.editor.scene.node_count:
                 return
                 
             bounds_min, bounds_max = self.editor.scene.get_bounds()
@@ -1069,12 +1426,12 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     
          # ✨ 여기에 load_mgb 메서드 추가 ✨
         def load_mgb(self):
-            """MGB 파일 로드"""
+            """MIDAS MGT 파일 로드"""
             print("🔍 load_mgb 메서드 호출됨")  # 디버그 메시지 추가
             
             filepath, _ = QtWidgets.QFileDialog.getOpenFileName(
-                self, "Load MIDAS MGB", "data/", 
-                "All Files (*);;MIDAS Files (*.mgb *.mgt);;MGB Files (*.mgb);;MGT Files (*.mgt)"
+                self, "Load MIDAS MGT", "data/", 
+                "MGT Files (*.mgt);;All Files (*)"
             )
             
             print(f"📁 선택된 파일: {filepath}")  # 디버그 메시지 추가
@@ -1112,6 +1469,47 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 if self.editor.save_csv(filepath, include_lines=True):
                     self.update_status()
                     
+        def open_read_only(self):
+            """바이너리 모델을 읽기 전용으로 열기"""
+            filepath, _ = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Open Binary Model", "data/", "NE3D Files (*.ne3d);;All Files (*)"
+            )
+            
+            if filepath:
+                if self.editor.open_read_only(filepath):
+                    self.update_scene()
+                    self.update_status()
+                    self.fit_to_view()
+                    self.status_bar.showMessage(f"🔒 읽기 전용 모드: {filepath}", 3000)
+                else:
+                    self.status_bar.showMessage("바이너리 모델 열기 실패", 3000)
+                    
+        def save_binary(self):
+            """바이너리 모델 저장"""
+            filepath, _ = QtWidgets.QFileDialog.getSaveFileName(
+                self, "Save Binary Model", "output/", "NE3D Files (*.ne3d)"
+            )
+            
+            if filepath:
+                self.editor.save_binary(filepath)
+        
+        def save_mgt(self):
+            """MIDAS MGT 파일로 내보내기"""
+            filepath, _ = QtWidgets.QFileDialog.getSaveFileName(
+                self, "Export MIDAS MGT", "output/", "MGT Files (*.mgt)"
+            )
+            
+            if filepath:
+                if self.editor.save_mgt(filepath):
+                    self.status_bar.showMessage(f"MGT 내보내기 완료: {filepath}", 3000)
+                else:
+                    self.status_bar.showMessage("MGT 내보내기 실패", 3000)
+        
+        def clear_import_cache(self):
+            """가져오기 캐시 비우기"""
+            removed = self.editor.clear_import_cache()
+            self.status_bar.showMessage(f"가져오기 캐시 {removed}개 항목을 삭제했습니다", 3000)
+                    
         def load_elements_csv(self):
             """Elements CSV 파일 로드"""
             print("🔍 load_elements_csv 메서드 호출됨")
@@ -1158,9 +1556,9 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             self.update_scene()
             self.update_status()
             
-        def connect_nodes(self, line_type):
+        def connect_nodes(self, line_type, order='number'):
             """선택된 노드 연결"""
-            if self.editor.scene.connect_selected_nodes(line_type):
+            if self.editor.scene.connect_selected_nodes(line_type, order):
                 self.update_scene()
                 self.update_status()
                 
@@ -1170,11 +1568,97 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             self.update_scene()
             self.update_status()
             
+        def array_copy_dialog(self):
+            """선택 영역 배열 복사 (선형/격자/원형)"""
+            if not self.editor.scene.selected_nodes:
+                self.status_bar.showMessage("❌ 복사할 노드를 선택하세요", 3000)
+                return
+            modes = ['선형', '격자', '원형']
+            mode, ok = QtWidgets.QInputDialog.getItem(self, '배열 복사', '방식:', modes, 0, False)
+            if not ok:
+                return
+            hints = {
+                '선형': 'dx dy dz 개수',
+                '격자': 'ux uy uz nu vx vy vz nv',
+                '원형': '축(x|y|z) 각도 개수 (선택 중심 기준)',
+            }
+            text, ok = QtWidgets.QInputDialog.getText(self, '배열 복사', hints[mode])
+            if not ok or not text.strip():
+                return
+            weld, ok = QtWidgets.QInputDialog.getDouble(
+                self, '배열 복사', '겹치는 노드 합치기 허용오차 (0: 안 함)', 0.001, 0.0, 1000.0, 4)
+            if not ok:
+                return
+            weld = weld or None
+            
+            args = text.split()
+            try:
+                if mode == '선형':
+                    new_nodes = self.editor.array_copy_linear(
+                        list(map(float, args[:3])), int(args[3]), weld)
+                elif mode == '격자':
+                    new_nodes = self.editor.array_copy_grid(
+                        list(map(float, args[0:3])), int(args[3]),
+                        list(map(float, args[4:7])), int(args[7]), weld)
+                else:
+                    new_nodes = self.editor.array_copy_polar(
+                        args[0], int(args[2]), float(args[1]), 'centroid', weld)
+            except (ValueError, IndexError) as e:
+                QtWidgets.QMessageBox.warning(self, '배열 복사', f'입력 형식이 올바르지 않습니다: {e}')
+                return
+            
+            self.update_scene()
+            self.update_status()
+            self.status_bar.showMessage(f"✅ 배열 복사: 새 노드 {len(new_nodes)}개", 3000)
+        
+        def weld_nodes_dialog(self):
+            """겹친 노드 합치기 (선택이 있으면 선택 노드끼리만)"""
+            selected_only = bool(self.editor.scene.selected_nodes)
+            target = '선택 노드' if selected_only else '전체 노드'
+            tolerance, ok = QtWidgets.QInputDialog.getDouble(
+                self, '겹친 노드 합치기', f'허용오차 ({target}):', 0.001, 0.0, 1000.0, 4)
+            if not ok:
+                return
+            merged = self.editor.weld_nodes(tolerance, selected_only)
+            self.update_scene()
+            self.update_status()
+            self.status_bar.showMessage(f"🧲 노드 {merged}개 합침", 3000)
+        
+        def auto_connect_dialog(self):
+            """선택 노드 중 거리 범위 안의 쌍을 모두 연결"""
+            if len(self.editor.scene.selected_nodes) < 2:
+                self.status_bar.showMessage("❌ 연결할 노드를 2개 이상 선택하세요", 3000)
+                return
+            text, ok = QtWidgets.QInputDialog.getText(
+                self, '자동 연결', '최대거리 [최소거리] [축 x|y|z|xy...]')
+            if not ok or not text.strip():
+                return
+            args = text.split()
+            axes = args.pop() if len(args) > 1 and args[-1].isalpha() else None
+            try:
+                max_distance = float(args[0])
+                min_distance = float(args[1]) if len(args) > 1 else 0.0
+            except (ValueError, IndexError) as e:
+                QtWidgets.QMessageBox.warning(self, '자동 연결', f'입력 형식이 올바르지 않습니다: {e}')
+                return
+            
+            lines = self.editor.auto_connect_selected(
+                self.line_type_combo.currentData(), max_distance, min_distance, axes)
+            self.update_scene()
+            self.update_status()
+            self.status_bar.showMessage(f"✅ 자동 연결: 라인 {len(lines)}개 생성", 3000)
+        
         def undo(self):
             """실행 취소"""
             if self.editor.scene.undo():
                 self.update_scene()
                 self.update_status()
+        
+        def redo(self):
+            """다시 실행"""
+            if self.editor.scene.redo():
+                self.update_scene()
+                self.update_status()
                 
         def reset_view(self):
             """뷰 리셋"""
@@ -1183,7 +1667,19 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             self.gl_widget.update()
             
         def update_scene(self):
-            """씬 업데이트"""
+            """씬 업데이트 (트랜잭션 중이면 끝난 뒤 한 번만)"""
+            if self.editor.scene.in_transaction:
+                self.editor.scene.call_after_commit(self.update_scene)
+                return
+            
+            dirty = self.scene_dirty.take()
+            if dirty.structure_changed or SceneEventType.NODES_REGROUPED in dirty.kinds:
+                self.rebuild_group_menu()
+            if (dirty.only(SceneEventType.SELECTION_CHANGED) and self.scatter_plot is not None
+                    and not self.editor.scene.read_only):
+                self.update_selection_colors()
+                return
+            
             # 기존 아이템 제거 (안전하게)
             if self.scatter_plot is not None:
                 try:
@@ -1210,16 +1706,23 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     pass
             self.text_items.clear()
             
+            # 🔒 읽기 전용 모드: memmap 배열에서 화면 영역만 준비
+            if self.editor.scene.read_only:
+                self.update_scene_read_only()
+                return
+            
             if self.editor.scene.nodes:
                 # 노드 포지션과 색상
                 positions = []
                 colors = []
+                self.scatter_nodes = []
                 
                 for node in self.editor.scene.nodes:
                     # ✅ 보이지 않는 노드는 스킵
                     if not getattr(node, 'is_visible', True):
                         continue
                         
+                    self.scatter_nodes.append(node)
                     positions.append(node.position)
                     if node.is_selected:
                         colors.append([1, 1, 0, 1])  # 노란색
@@ -1286,13 +1789,71 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 self.gl_widget.addItem(line_item)
                 self.line_plots.append(line_item)  
                 
+        def update_selection_colors(self):
+            """선택 상태만 바뀐 경우 - 스캐터 플롯 색상만 갱신"""
+            if not self.scatter_nodes:
+                return
+            colors = np.ones((len(self.scatter_nodes), 4))
+            selected = np.fromiter((n.is_selected for n in self.scatter_nodes), dtype=bool,
+                                   count=len(self.scatter_nodes))
+            colors[selected, 2] = 0.0  # 노란색
+            self.scatter_plot.setData(color=colors)
+            
+        def update_scene_read_only(self):
+            """읽기 전용 모드 렌더링 (현재 뷰 영역 + 포인트 예산)"""
+            center = self.gl_widget.opts['center']
+            distance = max(self.gl_widget.opts.get('distance', 1000), 1.0)
+            w, h = self.gl_widget.width(), self.gl_widget.height()
+            half = distance * max(w / h if h else 1, 1)
+            c = np.array([center.x(), center.y(), center.z()])
+            
+            arrays = self.editor.scene.get_render_arrays(
+                region=(c - half, c + half),
+                max_points=2_000_000,
+                max_segments=2_000_000
+            )
+            
+            if len(arrays['positions']):
+                self.scatter_plot = gl.GLScatterPlotItem(
+                    pos=arrays['positions'],
+                    color=arrays['colors'],
+                    size=3,
+                    pxMode=True
+                )
+                self.gl_widget.addItem(self.scatter_plot)
+            
+            if len(arrays['segments']):
+                # 라인은 하나의 아이템으로 묶어서 그림
+                line_item = gl.GLLinePlotItem(
+                    pos=arrays['segments'],
+                    color=(1, 0, 0, 1),
+                    width=1,
+                    mode='lines'
+                )
+                self.gl_widget.addItem(line_item)
+                self.line_plots.append(line_item)
+                
         def update_status(self):
-            """상태바 업데이트"""
-            info = self.editor.scene.get_selected_info()
-            status = f"Nodes: {len(self.editor.scene.nodes)} | "
-            status += f"Selected: {info['count']} | "
-            status += f"Lines: {len(self.editor.scene.lines)}"
+            """상태바 업데이트 (트랜잭션 중이면 끝난 뒤 한 번만)"""
+            if self.editor.scene.in_transaction:
+                self.editor.scene.call_after_commit(self.update_status)
+                return
+            status = f"Nodes: {self.editor.scene.node_count} | "
+            status += f"Selected: {self.editor.scene.selected_count} | "
+            status += f"Lines: {self.editor.scene.line_count}"
+            if self.editor.scene.read_only:
+                status += " | 🔒 읽기 전용"
             self.status_bar.showMessage(status)
+            self.update_edit_actions()
+            
+        def update_edit_actions(self):
+            """읽기 전용 모드에서는 씬을 바꾸는 액션/버튼 비활성화"""
+            writable = not self.editor.scene.read_only
+            for action in self.edit_actions + self.group_edit_actions:
+                action.setEnabled(writable)
+            for button in (self.midpoint_btn, self.insert_node_btn,
+                           self.create_panel_btn, self.cross_connect_btn):
+                button.setEnabled(writable)
             
         def mouse_press_event(self, event):
             """마우스 클릭 이벤트"""
@@ -1403,12 +1964,10 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 if min_x <= screen_x <= max_x and min_y <= screen_y <= max_y:
                     # ✅ Ctrl 모드에서 이미 선택된 노드는 선택 해제 (토글)
                     if (modifiers & QtCore.Qt.ControlModifier) and node.is_selected:
-                        node.set_selected(False)
-                        self.editor.scene.selected_nodes.discard(node)
+                        self.editor.scene.set_nodes_selected([node], False)
                         print(f"➖ 노드 {node.number} 선택 해제")
                     else:
-                        node.set_selected(True)
-                        self.editor.scene.selected_nodes.add(node)
+                        self.editor.scene.set_nodes_selected([node], True)
                         selected_count += 1
 
             # ✅ 라인 선택 추가
@@ -1455,6 +2014,13 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 
         def keyPressEvent(self, event):
             """키보드 이벤트"""
+            # 🔒 읽기 전용 모드에서는 편집 단축키 무시 (_check_writable 예외 방지)
+            if self.editor.scene.read_only and event.key() in (
+                    QtCore.Qt.Key_A, QtCore.Qt.Key_Delete, QtCore.Qt.Key_P,
+                    QtCore.Qt.Key_Z, QtCore.Qt.Key_Y):
+                self.status_bar.showMessage("🔒 읽기 전용 모드에서는 편집할 수 없습니다", 2000)
+                return
+            
             # ✅ 스페이스바 처리 (반복 입력 방지)
             if event.key() == QtCore.Qt.Key_Space and not event.isAutoRepeat():
                 # 스페이스바로 이동 모드 활성화
@@ -1497,18 +2063,15 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     self.status_bar.showMessage("4개의 노드를 선택하세요", 2000)
                     
             # ✅ Cmd+Z (Mac) / Ctrl+Z (Windows/Linux) 추가
+            # ✅ Cmd+Shift+Z (Mac) / Ctrl+Y (Windows/Linux) - Redo
             elif event.key() == QtCore.Qt.Key_Z:
                 if sys.platform == "darwin":  # macOS
                     if event.modifiers() == QtCore.Qt.MetaModifier:  # Cmd 키
                         self.undo()
-                        
-            # ✅ Cmd+Shift+Z (Mac) / Ctrl+Y (Windows/Linux) - Redo
-            elif event.key() == QtCore.Qt.Key_Z and event.modifiers() == (QtCore.Qt.MetaModifier | QtCore.Qt.ShiftModifier):
-                if hasattr(self, 'redo'):
-                    self.redo()
+                    elif event.modifiers() == (QtCore.Qt.MetaModifier | QtCore.Qt.ShiftModifier):
+                        self.redo()
             elif event.key() == QtCore.Qt.Key_Y and event.modifiers() == QtCore.Qt.ControlModifier:
-                if hasattr(self, 'redo'):
-                    self.redo()
+                self.redo()
                     
         # ✅ 여기에 새로운 메서드 추가!
         def keyReleaseEvent(self, event):
@@ -1536,7 +2099,7 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             # ← 수정: setCameraPosition(center=…) 대신 opts로 center 지정
 
             # 3) ✅ 구조물 전체가 보이도록 거리 자동 계산
-            if self.editor.scene.nodes:
+            if self.editor.scene.node_count:
                 bounds_min, bounds_max = self.editor.scene.get_bounds()
                 
                 # 경계 상자의 대각선 길이 계산
@@ -1765,10 +2328,9 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 # 새 노드 생성
                 from src.data_structures import DataPoint, Node3D
                 new_datapoint = DataPoint(new_number, mid_x, mid_y, mid_z)
-                new_node = Node3D(new_datapoint)
                 
                 # 씬에 추가
-                self.editor.scene.nodes.append(new_node)
+                new_node = self.editor.scene.add_node(new_datapoint)
                 
                 print(f"✅ 중점 노드 생성 완료: 노드 {new_number}")
                 
@@ -2015,16 +2577,14 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     new_position[1], 
                     new_position[2]
                 )
-                new_node = Node3D(new_datapoint)
                 
                 # 씬에 추가
-                self.editor.scene.nodes.append(new_node)
+                new_node = self.editor.scene.add_node(new_datapoint)
                 
                 print(f"✅ 새 노드 생성: {new_number} at ({new_position[0]:.2f}, {new_position[1]:.2f}, {new_position[2]:.2f})")
                 
                 # 시각적 표시
-                new_node.set_selected(True)
-                self.editor.scene.selected_nodes.add(new_node)
+                self.editor.scene.set_nodes_selected([new_node], True)
                 
                 # 결과 표시
                 self.distance_result_label.setText(
@@ -2315,6 +2875,16 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
 
         def apply_pattern(self):
             """학습된 패턴을 적용하여 새 노드 생성"""
+            # 생성한 노드/라인 전체가 실행 취소 한 단계, 오류 시 모두 되돌림
+            try:
+                with self.editor.scene.transaction("패턴 적용"):
+                    self._apply_pattern()
+            except Exception as e:
+                print(f"❌ 패턴 적용 실패: {e}")
+                self.update_scene()
+                self.update_status()
+        
+        def _apply_pattern(self):
             if not hasattr(self, 'learned_pattern'):
                 self.pattern_info_label.setText("❌ 먼저 패턴을 학습하세요")
                 return
@@ -2395,9 +2965,7 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 
                 # 새 노드들 선택
                 self.editor.scene.clear_selection()
-                for node in new_nodes:
-                    node.set_selected(True)
-                    self.editor.scene.selected_nodes.add(node)
+                self.editor.scene.set_nodes_selected(new_nodes, True)
                 
                 self.update_scene()
                 self.update_status()
@@ -2416,10 +2984,9 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     position[1],
                     position[2]
                 )
-                new_node = Node3D(datapoint)
                 
                 # 씬에 추가
-                self.editor.scene.nodes.append(new_node)
+                new_node = self.editor.scene.add_node(datapoint)
                 
                 print(f"✅ 노드 {new_number} 생성: ({position[0]:.2f}, {position[1]:.2f}, {position[2]:.2f})")
                 return new_node
@@ -2451,15 +3018,14 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     position[1],
                     position[2]
                 )
-                new_node = Node3D(datapoint)
+                
+                # 씬에 추가
+                new_node = self.editor.scene.add_node(datapoint)
                 
                 # 3. 생성된 노드는 원본이 아님
                 new_node.is_original = False
                 new_node.is_protected = False
                 
-                # 씬에 추가
-                self.editor.scene.nodes.append(new_node)
-                
                 print(f"✅ 새 노드 {new_number} 생성: ({position[0]:.2f}, {position[1]:.2f}, {position[2]:.2f})")
                 return new_node
                 
@@ -2521,14 +3087,23 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     return None
             
             # 새 라인 생성
-            line = Line3D(start_node, end_node, LineType.PANER)
-            self.editor.scene.lines.append(line)
+            line = self.editor.scene.add_line(start_node, end_node, LineType.PANER)
             print(f"✅ PANER 라인 생성: {start_node.number} - {end_node.number}")
             
             return line
             
         def create_cross_connection(self):
             """선택된 4개 노드를 십자 형태로 PANER 연결"""
+            # 생성한 노드/라인 전체가 실행 취소 한 단계, 오류 시 모두 되돌림
+            try:
+                with self.editor.scene.transaction("십자 연결"):
+                    self._create_cross_connection()
+            except Exception as e:
+                print(f"❌ 십자 연결 실패: {e}")
+                self.update_scene()
+                self.update_status()
+        
+        def _create_cross_connection(self):
             selected = list(self.editor.scene.selected_nodes)
             
             if len(selected) != 4:
@@ -2566,8 +3141,7 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             """PANER 타입 라인 생성"""
             from src.data_structures import Line3D, LineType
             
-            line = Line3D(start_node, end_node, LineType.PANER)
-            self.editor.scene.lines.append(line)
+            line = self.editor.scene.add_line(start_node, end_node, LineType.PANER)
             
             return line
         
@@ -2581,17 +3155,14 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                 self.status_bar.showMessage("❌ 노드를 선택하세요", 2000)
                 return
             
-            # 외장 그룹 ID (Group 5 = index 4)
-            EXTERIOR_GROUP_ID = 4
-            
             # 선택된 노드들을 외장 그룹으로 설정
             changed_nodes = 0  # 카운터 추가
             for node in selected_nodes:
                 # 기존 그룹 확인
                 old_group = getattr(node, 'group_id', None)
-                node.group_id = EXTERIOR_GROUP_ID
                 changed_nodes += 1
                 print(f"🏢 노드 {node.number}: {old_group} → 외장 그룹")
+            self.editor.scene.set_node_groups(selected_nodes, EXTERIOR_GROUP_ID)
             
             print(f"✅ 총 {changed_nodes}개 노드가 Group 5로 변경됨")
             
@@ -2674,8 +3245,7 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
                     match = False
                 
                 if match:
-                    node.set_selected(True)
-                    self.editor.scene.selected_nodes.add(node)
+                    self.editor.scene.set_nodes_selected([node], True)
                     selected_count += 1
             
             # 라인 선택 (양 끝점이 모두 조건에 맞는 경우)
@@ -2894,6 +3464,16 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
             
         def create_rectangular_panel(self):
             """선택된 4개 노드로 사각형 패널 생성 (중복 체크 포함)"""
+            # 생성한 노드/라인 전체가 실행 취소 한 단계, 오류 시 모두 되돌림
+            try:
+                with self.editor.scene.transaction("패널 생성"):
+                    self._create_rectangular_panel()
+            except Exception as e:
+                print(f"❌ 패널 생성 실패: {e}")
+                self.update_scene()
+                self.update_status()
+        
+        def _create_rectangular_panel(self):
             selected = list(self.editor.scene.selected_nodes)
             
             if len(selected) != 4:
@@ -3437,6 +4017,10 @@ def gui_mode_pyqtgraph(mode="full"):  # ✅ mode 매개변수 추가
 
 
 if __name__ == "__main__":
+    # PyInstaller 실행 파일에서 MGT 병렬 파싱 작업 프로세스가 GUI 를 다시 띄우지 않도록
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     import argparse
     
     parser = argparse.ArgumentParser(description="3D 노드 에디터")
@@ -0,0 +1,80 @@
+"""
+노드/라인 묶음 배열 복사 (선형, 사각 격자, 원형)
+
+복사본마다 4x4 변환 행렬 하나를 만들고, 좌표·라인을 복사본 전체에 대해
+numpy 블록으로 한 번에 생성합니다.
+"""
+import numpy as np
+from typing import List, Sequence, Tuple
+
+from .transforms import translation_matrix, rotation_matrix, about_pivot
+
+
+def linear_transforms(offset: Sequence[float], count: int) -> np.ndarray:
+    """offset 간격으로 count 개 복사 (원본 제외) - (count, 4, 4)"""
+    offset = np.asarray(offset, dtype=np.float64).reshape(3)
+    return np.array([translation_matrix(offset * i)
+                     for i in range(1, count + 1)]).reshape(-1, 4, 4)
+
+
+def grid_transforms(offset_u: Sequence[float], count_u: int,
+                    offset_v: Sequence[float], count_v: int) -> np.ndarray:
+    """
+    두 방향 격자로 복사 (원본 위치 (0, 0) 제외)
+
+    Args:
+        offset_u, count_u: 첫 방향 간격과 개수 (원본 포함)
+        offset_v, count_v: 둘째 방향 간격과 개수 (원본 포함)
+    """
+    offset_u = np.asarray(offset_u, dtype=np.float64).reshape(3)
+    offset_v = np.asarray(offset_v, dtype=np.float64).reshape(3)
+    return np.array([translation_matrix(offset_u * i + offset_v * j)
+                     for j in range(count_v) for i in range(count_u) if i or j]).reshape(-1, 4, 4)
+
+
+def polar_transforms(axis, center: Sequence[float], count: int,
+                     step_deg: float) -> np.ndarray:
+    """center 를 지나는 축 기준으로 step_deg 씩 회전하며 count 개 복사"""
+    return np.array([about_pivot(rotation_matrix(axis, step_deg * i), center)
+                     for i in range(1, count + 1)]).reshape(-1, 4, 4)
+
+
+def internal_edges(node_index: dict, lines: list) -> Tuple[np.ndarray, List[object]]:
+    """
+    양 끝이 모두 node_index 에 있는 라인의 (로컬 인덱스 쌍, 라인 타입 리스트)
+
+    Args:
+        node_index: id(node) → 로컬 인덱스
+        lines: 검사할 라인 리스트
+    """
+    pairs, types = [], []
+    for line in lines:
+        a = node_index.get(id(line.start_node))
+        b = node_index.get(id(line.end_node))
+        if a is not None and b is not None:
+            pairs.append((a, b))
+            types.append(line.line_type)
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2), types
+
+
+def copy_blocks(positions: np.ndarray, edges: np.ndarray,
+                transforms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    복사본 좌표/라인 블록 생성
+
+    Args:
+        positions: 원본 좌표 (k, 3)
+        edges: 원본 내부 라인 로컬 인덱스 (e, 2)
+        transforms: 복사본별 변환 행렬 (m, 4, 4)
+
+    Returns:
+        (좌표 (m*k, 3), 라인 (m*e, 2)) - 라인 인덱스는 새 좌표 블록 기준
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    k = len(positions)
+    m = len(transforms)
+    # (m, k, 3) = R_i @ p + t_i
+    blocks = np.einsum('mij,kj->mki', transforms[:, :3, :3], positions) + transforms[:, None, :3, 3]
+    base = (np.arange(m, dtype=np.int64) * k)[:, None, None]
+    new_edges = (np.asarray(edges, dtype=np.int64)[None, :, :] + base).reshape(-1, 2)
+    return blocks.reshape(-1, 3), new_edges
@@ -0,0 +1,178 @@
+"""
+노드/라인 바이너리 모델 파일 (.ne3d) 입출력
+
+파일은 고정 크기 헤더 뒤에 열(column) 단위 배열이 이어지는 구조이며,
+읽기 전용 모드에서는 np.memmap 으로 필요한 페이지만 읽습니다.
+"""
+import struct
+import numpy as np
+from typing import Optional, Tuple
+
+from .data_structures import LineType
+
+
+MAGIC = b'NE3DBIN1'
+FORMAT_VERSION = 2   # 2: 라인별 원본 요소 번호(element_ids) 섹션 추가
+
+# magic, version, node_count, edge_count, bounds_min(3), bounds_max(3), center(3)
+_HEADER = struct.Struct('<8sIQQ9d')
+_ALIGN = 64
+
+# 라인 타입 코드 (파일에 uint8 로 저장, 순서 변경 금지)
+LINE_TYPE_ORDER = list(LineType)
+
+
+def line_type_to_code(line_type: LineType) -> int:
+    """LineType → 파일 저장용 정수 코드"""
+    return LINE_TYPE_ORDER.index(line_type)
+
+
+def code_to_line_type(code: int) -> LineType:
+    """파일 저장용 정수 코드 → LineType"""
+    return LINE_TYPE_ORDER[int(code)]
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _section_layout(node_count: int, edge_count: int,
+                    version: int = FORMAT_VERSION) -> dict:
+    """각 배열 섹션의 (오프셋, dtype, shape)"""
+    sections = [
+        ('numbers', np.int64, (node_count,)),
+        ('positions', np.float64, (node_count, 3)),
+        ('group_ids', np.int32, (node_count,)),
+        ('edges', np.int64, (edge_count, 2)),
+        ('edge_types', np.uint8, (edge_count,)),
+    ]
+    if version >= 2:
+        sections.append(('element_ids', np.int64, (edge_count,)))
+    layout = {}
+    offset = _aligned(_HEADER.size)
+    for name, dtype, shape in sections:
+        layout[name] = (offset, np.dtype(dtype), shape)
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        offset = _aligned(offset + nbytes)
+    return layout
+
+
+def write_binary_model(filepath: str, numbers: np.ndarray, positions: np.ndarray,
+                       edges: Optional[np.ndarray] = None,
+                       edge_types: Optional[np.ndarray] = None,
+                       group_ids: Optional[np.ndarray] = None,
+                       element_ids: Optional[np.ndarray] = None) -> None:
+    """
+    열 배열을 .ne3d 파일로 저장
+
+    Args:
+        filepath: 저장할 파일 경로
+        numbers: 노드 번호 (N,)
+        positions: 노드 좌표 (N, 3)
+        edges: 라인 양 끝 노드 인덱스 (M, 2) - 노드 번호가 아닌 배열 인덱스
+        edge_types: 라인 타입 코드 (M,)
+        group_ids: 노드 그룹 ID (N,)
+        element_ids: 라인별 원본 요소 번호 (M,) - 0 은 번호 없음
+    """
+    numbers = np.ascontiguousarray(numbers, dtype=np.int64)
+    positions = np.ascontiguousarray(positions, dtype=np.float64).reshape(-1, 3)
+    node_count = len(numbers)
+    if edges is None:
+        edges = np.empty((0, 2), dtype=np.int64)
+    edges = np.ascontiguousarray(edges, dtype=np.int64).reshape(-1, 2)
+    edge_count = len(edges)
+    if edge_types is None:
+        edge_types = np.zeros(edge_count, dtype=np.uint8)
+    if group_ids is None:
+        group_ids = np.zeros(node_count, dtype=np.int32)
+    if element_ids is None:
+        element_ids = np.zeros(edge_count, dtype=np.int64)
+
+    if node_count:
+        bounds_min = positions.min(axis=0)
+        bounds_max = positions.max(axis=0)
+        center = positions.mean(axis=0)
+    else:
+        bounds_min = bounds_max = center = np.zeros(3)
+
+    arrays = {
+        'numbers': numbers,
+        'positions': positions,
+        'group_ids': np.ascontiguousarray(group_ids, dtype=np.int32),
+        'edges': edges,
+        'edge_types': np.ascontiguousarray(edge_types, dtype=np.uint8),
+        'element_ids': np.ascontiguousarray(element_ids, dtype=np.int64),
+    }
+    layout = _section_layout(node_count, edge_count)
+
+    with open(filepath, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, node_count, edge_count,
+                             *bounds_min, *bounds_max, *center))
+        for name, (offset, dtype, shape) in layout.items():
+            f.write(b'\0' * (offset - f.tell()))
+            arrays[name].astype(dtype, copy=False).tofile(f)
+
+
+class MappedModel:
+    """
+    .ne3d 파일을 np.memmap 으로 연 읽기 전용 모델
+
+    배열은 파일 페이지에 직접 매핑되므로 열 때 데이터를 읽지 않고,
+    실제로 접근한 영역만 메모리에 올라옵니다.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        with open(filepath, 'rb') as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"바이너리 모델 헤더가 손상되었습니다: {filepath}")
+
+        fields = _HEADER.unpack(header)
+        magic, version, node_count, edge_count = fields[:4]
+        if magic != MAGIC:
+            raise ValueError(f"NE3D 바이너리 모델 파일이 아닙니다: {filepath}")
+        if version not in (1, FORMAT_VERSION):
+            raise ValueError(f"지원하지 않는 바이너리 모델 버전입니다: {version}")
+
+        self.node_count = int(node_count)
+        self.edge_count = int(edge_count)
+        self.bounds_min = np.array(fields[4:7])
+        self.bounds_max = np.array(fields[7:10])
+        self.center = np.array(fields[10:13])
+
+        # 버전 1 파일에는 element_ids 섹션이 없음 (모두 0 으로 취급)
+        self.element_ids = np.zeros(self.edge_count, dtype=np.int64)
+        for name, (offset, dtype, shape) in _section_layout(
+                self.node_count, self.edge_count, version).items():
+            if int(np.prod(shape)) == 0:
+                array = np.empty(shape, dtype=dtype)
+            else:
+                array = np.memmap(filepath, dtype=dtype, mode='r',
+                                  offset=offset, shape=shape)
+            setattr(self, name, array)
+
+    def iter_chunks(self, chunk_size: int = 1_000_000):
+        """노드 인덱스 범위를 청크 단위로 순회 (start, stop)"""
+        for start in range(0, self.node_count, chunk_size):
+            yield start, min(start + chunk_size, self.node_count)
+
+    def select_in_region(self, min_coords: Tuple[float, float, float],
+                         max_coords: Tuple[float, float, float],
+                         chunk_size: int = 1_000_000) -> np.ndarray:
+        """영역 안에 있는 노드 인덱스 배열 (청크 단위 스캔)"""
+        lo = np.asarray(min_coords, dtype=np.float64)
+        hi = np.asarray(max_coords, dtype=np.float64)
+        hits = []
+        for start, stop in self.iter_chunks(chunk_size):
+            block = self.positions[start:stop]
+            inside = np.all((block >= lo) & (block <= hi), axis=1)
+            hits.append(np.flatnonzero(inside) + start)
+        if not hits:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(hits)
+
+    def close(self):
+        """매핑 참조 해제 (남은 뷰가 없으면 파일 매핑이 닫힘)"""
+        for name in ('numbers', 'positions', 'group_ids', 'edges', 'edge_types', 'element_ids'):
+            setattr(self, name, None)
@@ -0,0 +1,166 @@
+"""
+노드 좌표 공간 군집 (라인이 없는 점 데이터 자동 그룹용)
+
+    dbscan - 밀도 기반 군집 (eps 반경 안 이웃이 min_points 이상인 핵심점끼리 연결)
+    voxel  - 복셀 연결 군집 (같은/이웃 26칸 복셀에 있는 점끼리 연결, 대용량용)
+
+라벨은 0 부터이며 잡음(어느 군집에도 속하지 않음)은 -1 입니다.
+sklearn 이 있으면 DBSCAN(kd_tree) 을 쓰고, 없으면 scipy cKDTree 로 같은 결과를 계산합니다.
+"""
+import threading
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Optional
+
+from .grouping import component_labels
+
+try:
+    from sklearn.cluster import DBSCAN
+except ImportError:
+    DBSCAN = None
+
+
+CLUSTER_METHODS = ('dbscan', 'voxel')
+
+# 복셀 이웃 중 절반 (대칭이므로 13방향만 검사)
+_HALF_NEIGHBORS = np.array([(dx, dy, dz)
+                            for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                            if (dx, dy, dz) > (0, 0, 0)], dtype=np.int64)
+
+
+def dbscan_labels(points: np.ndarray, eps: float, min_points: int = 5) -> np.ndarray:
+    """
+    DBSCAN 군집 라벨
+
+    Args:
+        points: (N, 3) 좌표
+        eps: 이웃 반경
+        min_points: 핵심점이 되기 위한 반경 안 점 수 (자기 자신 포함)
+
+    Returns:
+        (N,) int64 라벨 (잡음 -1)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    if DBSCAN is not None:
+        model = DBSCAN(eps=eps, min_samples=min_points, algorithm='kd_tree')
+        return model.fit_predict(points).astype(np.int64)
+
+    tree = cKDTree(points)
+    counts = tree.query_ball_point(points, eps, return_length=True)
+    core = np.flatnonzero(counts >= min_points)
+    labels = np.full(n, -1, dtype=np.int64)
+    if not len(core):
+        return labels
+
+    # 핵심점끼리 eps 이내면 같은 군집
+    core_tree = cKDTree(points[core])
+    pairs = core_tree.query_pairs(eps, output_type='ndarray')
+    _, core_labels = component_labels(len(core), pairs)
+    labels[core] = core_labels
+
+    # 경계점: eps 이내에서 가장 가까운 핵심점의 군집
+    border = np.flatnonzero(counts < min_points)
+    if len(border):
+        distance, nearest = core_tree.query(points[border], k=1, distance_upper_bound=eps)
+        hit = np.isfinite(distance)
+        labels[border[hit]] = core_labels[nearest[hit]]
+    return labels
+
+
+def voxel_labels(points: np.ndarray, voxel_size: float, min_points: int = 1) -> np.ndarray:
+    """
+    복셀 연결 군집 라벨
+
+    Args:
+        points: (N, 3) 좌표
+        voxel_size: 복셀 한 변 길이
+        min_points: 이보다 점이 적은 군집은 잡음(-1) 처리
+
+    Returns:
+        (N,) int64 라벨 (잡음 -1)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int64)
+    if voxel_size <= 0:
+        raise ValueError("복셀 크기는 0보다 커야 합니다.")
+
+    # 이웃 오프셋이 음수가 되지 않도록 한 칸씩 여유를 두고 int64 키로 묶음
+    cells = np.floor((points - points.min(axis=0)) / voxel_size).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    if float(np.prod(dims.astype(np.float64))) >= 2.0 ** 62:
+        raise ValueError("복셀 크기가 좌표 범위에 비해 너무 작습니다.")
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    voxels, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    pairs = []
+    for dx, dy, dz in _HALF_NEIGHBORS.tolist():
+        neighbor = voxels + (dx * dims[1] + dy) * dims[2] + dz
+        pos = np.minimum(np.searchsorted(voxels, neighbor), len(voxels) - 1)
+        hit = np.flatnonzero(voxels[pos] == neighbor)
+        pairs.append(np.column_stack([hit, pos[hit]]))
+    _, labels = component_labels(len(voxels), np.vstack(pairs))
+    labels = labels[inverse]
+
+    if min_points > 1:
+        sizes = np.bincount(labels)
+        labels = np.where(sizes[labels] >= min_points, labels, -1)
+    return labels
+
+
+def cluster_labels(points: np.ndarray, method: str, distance: float,
+                   min_points: int) -> np.ndarray:
+    """
+    방식별 군집 라벨
+
+    Args:
+        method: 'dbscan' | 'voxel'
+        distance: dbscan 이면 eps, voxel 이면 복셀 크기
+        min_points: dbscan 핵심점 기준 / voxel 최소 군집 크기
+    """
+    if method == 'dbscan':
+        return dbscan_labels(points, distance, min_points)
+    if method == 'voxel':
+        return voxel_labels(points, distance, min_points)
+    raise ValueError(f"알 수 없는 군집 방식입니다: {method}")
+
+
+class ClusterJob:
+    """
+    백그라운드 군집 계산
+
+    계산만 작업 스레드에서 하고, 결과 적용(씬 수정)은 done 을 확인한 쪽
+    (GUI 타이머 등)에서 NodeEditor3D.apply_cluster_job 으로 합니다.
+    """
+
+    def __init__(self, nodes: list, points: np.ndarray, method: str, distance: float,
+                 min_points: int, versions: Optional[tuple] = None):
+        self.nodes = nodes
+        self.method = method
+        self.versions = versions      # 시작 시점 씬 버전 (결과가 낡았는지 확인용)
+        self.labels: Optional[np.ndarray] = None
+        self.error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, args=(points, distance, min_points),
+                                        daemon=True)
+
+    def _run(self, points, distance, min_points):
+        try:
+            self.labels = cluster_labels(points, self.method, distance, min_points)
+        except Exception as e:
+            self.error = e
+
+    def start(self) -> 'ClusterJob':
+        self._thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def wait(self):
+        """계산이 끝날 때까지 대기"""
+        self._thread.join()
@@ -0,0 +1,188 @@
+"""
+선택 노드 연결 순서 (KD-트리 기반)
+
+노드 번호 순서 대신 위치를 보고 연결 순서를 정합니다.
+    nearest - 최근접 이웃 체인 (열린 경로)
+    mst     - 최소 신장 트리 (분기 허용)
+    path    - 근사 최단 열린 경로 (최근접 체인 + 2-opt)
+    loop    - 근사 최단 닫힌 경로 (최근접 체인 + 2-opt)
+"""
+import math
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree, connected_components
+from scipy.spatial import cKDTree
+
+
+CONNECTION_ORDERS = ('number', 'nearest', 'mst', 'path', 'loop')
+
+# 2-opt 에서 검사하는 후보 이웃 수
+_TWO_OPT_NEIGHBORS = 8
+
+
+def nearest_neighbor_chain(points: np.ndarray, start: int = 0) -> np.ndarray:
+    """
+    최근접 이웃 체인 순서 (start 에서 출발, 아직 방문하지 않은 가장 가까운 점으로 이동)
+
+    Returns:
+        점 인덱스 순열 (N,)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    tree = cKDTree(points)
+    visited = np.zeros(n, dtype=bool)
+    order = np.empty(n, dtype=np.int64)
+    current = start
+    for step in range(n):
+        order[step] = current
+        visited[current] = True
+        if step == n - 1:
+            break
+        # 이웃 수를 늘려 가며 미방문 점 탐색, 후보가 부족하면 남은 점 전체에서 선택
+        k = 8
+        nxt = -1
+        while k < n:
+            _, idx = tree.query(points[current], k=k)
+            fresh = idx[(idx < n) & ~visited[np.minimum(idx, n - 1)]]
+            if len(fresh):
+                nxt = int(fresh[0])
+                break
+            k *= 4
+        if nxt < 0:
+            remaining = np.flatnonzero(~visited)
+            dist = np.einsum('ij,ij->i', points[remaining] - points[current],
+                             points[remaining] - points[current])
+            nxt = int(remaining[np.argmin(dist)])
+        current = nxt
+    return order
+
+
+def minimum_spanning_edges(points: np.ndarray) -> np.ndarray:
+    """
+    유클리드 최소 신장 트리 간선
+
+    k-최근접 그래프에서 MST 를 구하고, 그래프가 끊겨 있으면 k 를 늘려 다시 시도합니다.
+
+    Returns:
+        (N-1, 2) 점 인덱스 쌍
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    tree = cKDTree(points)
+    k = min(n, 9)
+    while True:
+        dist, idx = tree.query(points, k=k)
+        rows = np.repeat(np.arange(n), k - 1)
+        cols = idx[:, 1:].ravel()
+        # 겹친 점(거리 0)도 간선으로 남도록 아주 작은 값으로 대체
+        weights = np.maximum(dist[:, 1:].ravel(), 1e-300)
+        graph = coo_matrix((weights, (rows, cols)), shape=(n, n)).tocsr()
+        count, _ = connected_components(graph, directed=False)
+        if count == 1 or k >= n:
+            break
+        k = min(n, k * 4)
+    mst = minimum_spanning_tree(graph).tocoo()
+    return np.column_stack([mst.row, mst.col]).astype(np.int64)
+
+
+def edge_length(points: np.ndarray, edges: np.ndarray) -> float:
+    """간선 길이 합"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    diffs = points[edges[:, 0]] - points[edges[:, 1]]
+    return float(np.sqrt(np.einsum('ij,ij->i', diffs, diffs)).sum())
+
+
+def two_opt(points: np.ndarray, order: np.ndarray, closed: bool = False,
+            max_passes: int = 10) -> np.ndarray:
+    """
+    2-opt 개선 (후보 이웃 목록 사용)
+
+    경로 위 간선 (a, b) 와 a 의 가까운 이웃 c 에서 시작하는 간선 (c, d) 를
+    (a, c), (b, d) 로 바꿔 더 짧아지면 그 사이 구간을 뒤집습니다.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    order = np.array(order, dtype=np.int64)
+    n = len(order)
+    if n < 4:
+        return order
+    k = min(_TWO_OPT_NEIGHBORS + 1, n)
+    _, neighbors = cKDTree(points).query(points, k=k)
+    # 내부 반복은 스칼라 연산이므로 파이썬 리스트/튜플로 처리 (numpy 스칼라보다 빠름)
+    neighbors = neighbors[:, 1:].tolist()
+    coords = [tuple(p) for p in points.tolist()]
+    dist = math.dist
+
+    order = order.tolist()
+    position = [0] * n
+    for index, node in enumerate(order):
+        position[node] = index
+    last = n if closed else n - 1
+    for _ in range(max_passes):
+        improved = False
+        for i in range(last):
+            for c in neighbors[order[i]]:
+                j = position[c]
+                if abs(j - i) < 2:
+                    continue
+                lo, hi = (i, j) if i < j else (j, i)
+                a, b, c2 = coords[order[lo]], coords[order[lo + 1]], coords[order[hi]]
+                if hi + 1 < n or closed:
+                    d = coords[order[(hi + 1) % n]]
+                    gain = dist(a, b) + dist(c2, d) - dist(a, c2) - dist(b, d)
+                else:
+                    gain = dist(a, b) - dist(a, c2)
+                if gain > 1e-12:
+                    order[lo + 1:hi + 1] = order[lo + 1:hi + 1][::-1]
+                    for index in range(lo + 1, hi + 1):
+                        position[order[index]] = index
+                    improved = True
+        if not improved:
+            break
+    return np.array(order, dtype=np.int64)
+
+
+def shortest_path_order(points: np.ndarray, closed: bool = False,
+                        max_passes: int = 10) -> np.ndarray:
+    """
+    근사 최단 경로 순서 (최근접 체인 + 2-opt)
+
+    열린 경로는 한쪽 끝(첫 주축 방향으로 가장 바깥 점)에서 시작합니다.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) < 3:
+        return np.arange(len(points), dtype=np.int64)
+    centered = points - points.mean(axis=0)
+    axis = np.linalg.svd(centered, full_matrices=False)[2][0]
+    start = int(np.argmin(centered @ axis))
+    order = nearest_neighbor_chain(points, start)
+    return two_opt(points, order, closed, max_passes)
+
+
+def connection_edges(points: np.ndarray, order: str = 'nearest') -> np.ndarray:
+    """
+    연결 방식별 간선 (점 인덱스 쌍)
+
+    Args:
+        points: (N, 3) 좌표
+        order: 'nearest' | 'mst' | 'path' | 'loop'
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if order == 'mst':
+        return minimum_spanning_edges(points)
+    if order == 'nearest':
+        sequence = nearest_neighbor_chain(points)
+        closed = False
+    elif order in ('path', 'loop'):
+        closed = order == 'loop'
+        sequence = shortest_path_order(points, closed)
+    else:
+        raise ValueError(f"알 수 없는 연결 방식입니다: {order}")
+    edges = np.column_stack([sequence[:-1], sequence[1:]])
+    if closed and len(sequence) > 2:
+        edges = np.vstack([edges, [[sequence[-1], sequence[0]]]])
+    return edges.astype(np.int64).reshape(-1, 2)
@@ -2,16 +2,93 @@
 CSV 파일 입출력 처리
 """
 import pandas as pd
+import numpy as np
 import json
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence
 from pathlib import Path
 
 from .data_structures import DataPoint, Node3D, Line3D, LineType
 
 
+# 스트리밍 저장 시 한 번에 포맷팅하는 행 수
+WRITE_CHUNK_SIZE = 100_000
+
+
+def _format_rows(row_format: str, columns: Sequence[np.ndarray],
+                 chunk_size: int = WRITE_CHUNK_SIZE) -> Iterator[str]:
+    """
+    열 배열을 청크 단위로 포맷팅한 문자열 생성
+    
+    Args:
+        row_format: 한 행의 % 포맷 문자열 (구분자/줄바꿈 포함)
+        columns: 같은 길이의 1차원 배열들
+        chunk_size: 청크당 행 수
+    """
+    count = len(columns[0]) if columns else 0
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        values = [np.asarray(col[start:stop]).tolist() for col in columns]
+        yield ''.join(map(row_format.__mod__, zip(*values)))
+
+
+def _join_records(row_format: str, columns: Sequence[np.ndarray],
+                  chunk_size: int = WRITE_CHUNK_SIZE, separator: str = ', ') -> Iterator[str]:
+    """JSON 배열 원소용: 원소 사이에만 구분자를 넣어 청크 단위로 생성"""
+    first = True
+    for chunk in _format_rows(row_format + separator, columns, chunk_size):
+        if not first:
+            yield separator
+        yield chunk[:-len(separator)]
+        first = False
+
+
+def _write_json_array(f, key: str, column: np.ndarray, value_format: str,
+                      chunk_size: int = WRITE_CHUNK_SIZE, last: bool = False):
+    """'"key": [v1, v2, ...]' 를 청크 단위로 이어 쓰기"""
+    f.write(f'"{key}": [')
+    for chunk in _join_records(value_format, (column,), chunk_size):
+        f.write(chunk)
+    f.write(']' if last else '],\n')
+
+
+# JSON 스키마 버전 (v1: 레코드 객체 배열, v2: 열 배열)
+JSON_SCHEMA_VERSION = 2
+
+
 class CSVHandler:
     """CSV 파일 입출력 처리 클래스"""
     
+    @staticmethod
+    def nodes_to_arrays(nodes: List[Node3D]) -> tuple:
+        """
+        노드 리스트를 열 배열로 변환
+        
+        Returns:
+            (numbers, positions, is_selected) 튜플
+        """
+        count = len(nodes)
+        numbers = np.fromiter((n.data_point.number for n in nodes), dtype=np.int64, count=count)
+        positions = np.array(
+            [(n.data_point.x, n.data_point.y, n.data_point.z) for n in nodes],
+            dtype=np.float64
+        ).reshape(-1, 3)
+        is_selected = np.fromiter((n.is_selected for n in nodes), dtype=bool, count=count)
+        return numbers, positions, is_selected
+    
+    @staticmethod
+    def lines_to_arrays(lines: List[Line3D]) -> tuple:
+        """
+        라인 리스트를 열 배열로 변환
+        
+        Returns:
+            (start_numbers, end_numbers, line_type_values) 튜플
+        """
+        count = len(lines)
+        starts = np.fromiter((l.start_node.data_point.number for l in lines), dtype=np.int64, count=count)
+        ends = np.fromiter((l.end_node.data_point.number for l in lines), dtype=np.int64, count=count)
+        types = np.array([l.line_type.value for l in lines], dtype=object)
+        return starts, ends, types
+    
     @staticmethod
     def load_csv(filepath: str) -> List[DataPoint]:
         """
@@ -61,23 +138,37 @@ class CSVHandler:
             filepath: 저장할 파일 경로
             nodes: 저장할 노드 리스트
             
+        Returns:
+            성공 여부
+        """
+        numbers, positions, _ = CSVHandler.nodes_to_arrays(nodes)
+        return CSVHandler.save_csv_arrays(filepath, numbers, positions)
+    
+    @staticmethod
+    def save_csv_arrays(filepath: str, numbers: np.ndarray, positions: np.ndarray,
+                        chunk_size: int = WRITE_CHUNK_SIZE) -> bool:
+        """
+        열 배열을 CSV로 스트리밍 저장 (좌표는 %.6f)
+        
+        Args:
+            filepath: 저장할 파일 경로
+            numbers: 노드 번호 (N,)
+            positions: 노드 좌표 (N, 3)
+            chunk_size: 청크당 행 수
+            
         Returns:
             성공 여부
         """
         try:
-            data = []
-            for node in nodes:
-                data.append({
-                    'number': node.data_point.number,
-                    'x': node.data_point.x,
-                    'y': node.data_point.y,
-                    'z': node.data_point.z
-                })
-            
-            df = pd.DataFrame(data)
-            df.to_csv(filepath, index=False, float_format='%.6f')
-            
-            print(f"{len(nodes)}개의 노드를 CSV로 저장했습니다: {filepath}")
+            positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+            columns = (numbers, positions[:, 0], positions[:, 1], positions[:, 2])
+            
+            with open(filepath, 'w', encoding='utf-8', newline='') as f:
+                f.write('number,x,y,z\n')
+                for chunk in _format_rows('%d,%.6f,%.6f,%.6f\n', columns, chunk_size):
+                    f.write(chunk)
+            
+            print(f"{len(numbers)}개의 노드를 CSV로 저장했습니다: {filepath}")
             return True
             
         except Exception as e:
@@ -94,48 +185,83 @@ class CSVHandler:
             nodes: 저장할 노드 리스트
             lines: 저장할 라인 리스트
             
+        Returns:
+            성공 여부
+        """
+        numbers, positions, is_selected = CSVHandler.nodes_to_arrays(nodes)
+        starts, ends, types = CSVHandler.lines_to_arrays(lines)
+        return CSVHandler.save_with_lines_arrays(
+            filepath, numbers, positions, is_selected, starts, ends, types
+        )
+    
+    @staticmethod
+    def save_with_lines_arrays(filepath: str, numbers: np.ndarray, positions: np.ndarray,
+                               is_selected: np.ndarray, line_starts: np.ndarray,
+                               line_ends: np.ndarray, line_types: np.ndarray,
+                               chunk_size: int = WRITE_CHUNK_SIZE) -> bool:
+        """
+        열 배열에서 CSV(노드) + JSON(노드/라인)을 스트리밍 저장
+        
+        JSON 문서는 메모리에 전체를 만들지 않고 청크 단위로 이어 씁니다.
+        JSON은 v2 스키마(열 배열)로 저장됩니다::
+        
+            {"version": 2,
+             "nodes": {"number": [...], "x": [...], "y": [...], "z": [...], "is_selected": [...]},
+             "lines": {"start": [...], "end": [...], "type": [...], "type_names": [...]},
+             "metadata": {...}}
+        
+        lines.type 은 type_names 의 인덱스입니다.
+        
+        Args:
+            filepath: 저장할 파일 경로 (CSV)
+            numbers: 노드 번호 (N,)
+            positions: 노드 좌표 (N, 3)
+            is_selected: 노드 선택 여부 (N,)
+            line_starts: 라인 시작 노드 번호 (M,)
+            line_ends: 라인 끝 노드 번호 (M,)
+            line_types: 라인 타입 값 문자열 (M,) - LineType.value
+            chunk_size: 청크당 행 수
+            
         Returns:
             성공 여부
         """
         try:
+            # JSON 에는 NaN/inf 를 쓸 수 없으므로 먼저 확인
+            positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+            bad = np.flatnonzero(~np.isfinite(positions).all(axis=1))
+            if len(bad):
+                print(f"❌ 좌표가 유한하지 않은 노드가 {len(bad)}개 있어 저장할 수 없습니다 "
+                      f"(예: 노드 {int(np.asarray(numbers)[bad[0]])})")
+                return False
+            
             # CSV로 노드만 저장
-            CSVHandler.save_csv(filepath, nodes)
+            if not CSVHandler.save_csv_arrays(filepath, numbers, positions, chunk_size):
+                return False
             
             # JSON으로 전체 데이터 저장
             json_filepath = Path(filepath).with_suffix('.json')
-            
-            # 노드 데이터
-            node_data = []
-            for node in nodes:
-                node_data.append({
-                    'number': node.data_point.number,
-                    'x': node.data_point.x,
-                    'y': node.data_point.y,
-                    'z': node.data_point.z,
-                    'is_selected': node.is_selected
-                })
-            
-            # 라인 데이터
-            line_data = []
-            for line in lines:
-                line_data.append({
-                    'start_node': line.start_node.data_point.number,
-                    'end_node': line.end_node.data_point.number,
-                    'line_type': line.line_type.value
-                })
-            
-            # 전체 데이터
-            full_data = {
-                'nodes': node_data,
-                'lines': line_data,
-                'metadata': {
-                    'node_count': len(nodes),
-                    'line_count': len(lines)
-                }
-            }
+            if len(line_types):
+                type_names, type_codes = np.unique(
+                    np.asarray(line_types).astype(str), return_inverse=True
+                )
+            else:
+                type_names, type_codes = np.empty(0, dtype=str), np.empty(0, dtype=np.int64)
             
             with open(json_filepath, 'w', encoding='utf-8') as f:
-                json.dump(full_data, f, indent=2, ensure_ascii=False)
+                f.write('{\n"version": %d,\n"nodes": {\n' % JSON_SCHEMA_VERSION)
+                _write_json_array(f, 'number', numbers, '%d', chunk_size)
+                _write_json_array(f, 'x', positions[:, 0], '%r', chunk_size)
+                _write_json_array(f, 'y', positions[:, 1], '%r', chunk_size)
+                _write_json_array(f, 'z', positions[:, 2], '%r', chunk_size)
+                _write_json_array(f, 'is_selected', np.asarray(is_selected, dtype=np.int8),
+                                  '%d', chunk_size, last=True)
+                f.write('\n},\n"lines": {\n')
+                _write_json_array(f, 'start', line_starts, '%d', chunk_size)
+                _write_json_array(f, 'end', line_ends, '%d', chunk_size)
+                _write_json_array(f, 'type', type_codes, '%d', chunk_size)
+                f.write('"type_names": %s' % json.dumps(type_names.tolist(), ensure_ascii=False))
+                f.write('\n},\n"metadata": {"node_count": %d, "line_count": %d}\n}\n'
+                        % (len(numbers), len(line_starts)))
             
             print(f"전체 데이터를 JSON으로 저장했습니다: {json_filepath}")
             return True
@@ -145,42 +271,91 @@ class CSVHandler:
             return False
     
     @staticmethod
-    def load_json(filepath: str) -> tuple:
+    def load_json_arrays(filepath: str) -> dict:
         """
-        JSON 파일에서 노드와 라인 정보 로드
+        JSON 파일(v1/v2)에서 노드와 라인 정보를 열 배열로 로드
         
         Args:
             filepath: JSON 파일 경로
             
         Returns:
-            (data_points, line_connections) 튜플
+            {'numbers', 'positions', 'is_selected', 'line_starts', 'line_ends', 'line_types'}
+            딕셔너리. line_types 는 LineType.value 문자열 배열
         """
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            # 노드 데이터 변환
-            data_points = []
-            for node in data['nodes']:
-                dp = DataPoint(
-                    number=node['number'],
-                    x=node['x'],
-                    y=node['y'],
-                    z=node['z']
-                )
-                data_points.append(dp)
+            version = data.get('version', 1)
             
-            # 라인 연결 정보
-            line_connections = []
-            for line in data.get('lines', []):
-                line_connections.append({
-                    'start': line['start_node'],
-                    'end': line['end_node'],
-                    'type': line['line_type']
-                })
+            if version == 2:
+                # v2: 열 배열을 그대로 numpy로
+                nodes = data['nodes']
+                positions = np.column_stack([
+                    np.asarray(nodes['x'], dtype=np.float64),
+                    np.asarray(nodes['y'], dtype=np.float64),
+                    np.asarray(nodes['z'], dtype=np.float64),
+                ]).reshape(-1, 3)
+                lines = data.get('lines') or {}
+                type_names = np.asarray(lines.get('type_names', []), dtype=object)
+                type_codes = np.asarray(lines.get('type', []), dtype=np.int64)
+                return {
+                    'numbers': np.asarray(nodes['number'], dtype=np.int64),
+                    'positions': positions,
+                    'is_selected': np.asarray(nodes.get('is_selected', np.zeros(len(positions))),
+                                              dtype=bool),
+                    'line_starts': np.asarray(lines.get('start', []), dtype=np.int64),
+                    'line_ends': np.asarray(lines.get('end', []), dtype=np.int64),
+                    'line_types': type_names[type_codes],
+                }
+            
+            if version != 1:
+                raise ValueError(f"지원하지 않는 JSON 버전입니다: {version}")
             
-            return data_points, line_connections
+            # v1: 레코드 객체 배열
+            nodes = data['nodes']
+            lines = data.get('lines', [])
+            return {
+                'numbers': np.array([n['number'] for n in nodes], dtype=np.int64),
+                'positions': np.array([(n['x'], n['y'], n['z']) for n in nodes],
+                                      dtype=np.float64).reshape(-1, 3),
+                'is_selected': np.array([n.get('is_selected', False) for n in nodes], dtype=bool),
+                'line_starts': np.array([l['start_node'] for l in lines], dtype=np.int64),
+                'line_ends': np.array([l['end_node'] for l in lines], dtype=np.int64),
+                'line_types': np.array([l['line_type'] for l in lines], dtype=object),
+            }
             
         except Exception as e:
             print(f"JSON 로드 중 오류 발생: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    @staticmethod
+    def load_json(filepath: str) -> tuple:
+        """
+        JSON 파일에서 노드와 라인 정보 로드 (v1/v2 자동 판별)
+        
+        Args:
+            filepath: JSON 파일 경로
+            
+        Returns:
+            (data_points, line_connections) 튜플
+        """
+        arrays = CSVHandler.load_json_arrays(filepath)
+        positions = arrays['positions']
+        
+        # 노드 데이터 변환
+        data_points = [
+            DataPoint(number=number, x=x, y=y, z=z)
+            for number, x, y, z in zip(arrays['numbers'].tolist(), positions[:, 0].tolist(),
+                                       positions[:, 1].tolist(), positions[:, 2].tolist())
+        ]
+        
+        # 라인 연결 정보
+        line_connections = [
+            {'start': start, 'end': end, 'type': line_type}
+            for start, end, line_type in zip(arrays['line_starts'].tolist(),
+                                             arrays['line_ends'].tolist(),
+                                             arrays['line_types'].tolist())
+        ]
+        
+        return data_points, line_connections
\ No newline at end of file
@@ -40,6 +40,7 @@ class LineType(Enum):
     """라인 타입"""
     MATERIAL = "material"
     PANER = "paner"
+    TRUSS = "truss"
 
 
 class Node3D:
@@ -85,6 +86,7 @@ class Line3D:
         self.is_selected = False
         self.is_visible = True           # ✨ 추가 (그룹 토글용)
         self.group_ids = set()           # ✨ 추가 (연결된 노드들의 그룹 ID)
+        self.element_id = None           # 원본 MIDAS 요소 번호 (선 요소로 불러온 경우)
         self._update_color()
         
     @property
@@ -0,0 +1,97 @@
+"""
+노드 그룹 자동 분할
+
+노드/라인 그래프의 연결 성분(scipy.sparse.csgraph, 거의 선형 시간)이나
+공간 군집(clustering 모듈) 라벨로 그룹 ID 를 정합니다. 큰 묶음부터 0, 1, 2, ... 를
+주고, 외톨이 노드(min_size 보다 작은 묶음, 군집 잡음)는 마지막 그룹 하나로 모읍니다.
+"""
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from typing import Iterable, Tuple
+
+
+# 사용자가 직접 지정하는 외장 그룹 (Group 5) - 자동 분할에서 쓰지 않음
+EXTERIOR_GROUP_ID = 4
+
+
+def component_labels(count: int, edges: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    연결 성분 라벨
+
+    Args:
+        count: 노드 수
+        edges: (E, 2) 노드 인덱스 쌍
+
+    Returns:
+        (성분 수, (count,) int64 라벨) 튜플
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if count == 0:
+        return 0, np.empty(0, dtype=np.int64)
+    graph = coo_matrix((np.ones(len(edges), dtype=np.int8), (edges[:, 0], edges[:, 1])),
+                       shape=(count, count)).tocsr()
+    components, labels = connected_components(graph, directed=False)
+    return components, labels.astype(np.int64)
+
+
+def skip_reserved(ids: np.ndarray, reserved: Iterable[int] = (EXTERIOR_GROUP_ID,)) -> np.ndarray:
+    """0 부터 매긴 번호를 예약된 그룹 ID 를 건너뛰도록 밀어냄 (0, 1, 2, 3, 5, 6, ...)"""
+    ids = np.asarray(ids, dtype=np.int64)
+    reserved = np.unique(np.asarray(list(reserved), dtype=np.int64))
+    reserved = reserved[reserved >= 0]
+    # k 번째 빈 번호 = k + (그 앞에 있는 예약 번호 수)
+    return ids + np.searchsorted(reserved - np.arange(len(reserved)), ids, side='right')
+
+
+def ranked_group_ids(labels: np.ndarray, min_size: int = 2,
+                     reserved: Iterable[int] = (EXTERIOR_GROUP_ID,)) -> Tuple[np.ndarray, int]:
+    """
+    묶음 라벨을 그룹 ID 로 변환 (큰 묶음부터 0, 1, 2, ...)
+
+    Args:
+        labels: (N,) 묶음 라벨 - 음수는 어느 묶음에도 속하지 않음 (외톨이)
+        min_size: 이보다 작은 묶음은 외톨이와 함께 마지막 그룹 하나로 모음
+        reserved: 건너뛸 그룹 ID
+
+    Returns:
+        ((N,) int32 그룹 ID, 그룹 수) 튜플
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    if len(labels) == 0:
+        return np.empty(0, dtype=np.int32), 0
+    member = labels >= 0
+    _, first, inverse, sizes = np.unique(labels[member], return_index=True,
+                                         return_inverse=True, return_counts=True)
+    components = len(sizes)
+    # 큰 묶음부터, 크기가 같으면 먼저 나온(번호가 작은) 노드가 있는 묶음부터
+    order = np.lexsort((first, -sizes))
+    rank = np.empty(components, dtype=np.int64)
+    rank[order] = np.arange(components)
+
+    large = sizes[order] >= min_size
+    group_count = int(large.sum())
+    if not large.all() or not member.all():
+        rank[order[~large]] = group_count
+        group_count += 1
+    ids = np.full(len(labels), group_count - 1, dtype=np.int64)
+    ids[member] = rank[inverse.reshape(-1)]
+    return skip_reserved(ids, reserved).astype(np.int32), group_count
+
+
+def component_group_ids(count: int, edges: np.ndarray, min_size: int = 2,
+                        reserved: Iterable[int] = (EXTERIOR_GROUP_ID,)) -> Tuple[np.ndarray, int]:
+    """
+    연결 성분 기준 그룹 ID
+
+    Args:
+        count: 노드 수
+        edges: (E, 2) 노드 인덱스 쌍
+        min_size: 이보다 작은 성분은 외톨이 그룹 하나로 모음
+        reserved: 자동 분할에서 건너뛸 그룹 ID
+
+    Returns:
+        ((count,) int32 그룹 ID, 그룹 수) 튜플
+    """
+    _, labels = component_labels(count, edges)
+    return ranked_group_ids(labels, min_size, reserved)
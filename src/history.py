@@ -0,0 +1,351 @@
+"""
+실행 취소/다시 실행 히스토리 (변경분 기반)
+
+각 편집은 영향받은 노드/라인과 바뀌기 전후 값만 기록하므로
+undo/redo 비용은 씬 크기가 아니라 변경된 항목 수에 비례합니다.
+메모리 예산을 넘으면 오래된 단계의 배열 데이터를 압축해 임시 파일로 내보내고,
+실행 취소가 그 단계에 도달할 때 다시 읽습니다.
+"""
+import pickle
+import tempfile
+import zlib
+import numpy as np
+from typing import List, Optional
+
+
+# 히스토리만 붙잡고 있는 삭제된 Node3D/Line3D 한 개의 대략적인 메모리 (바이트)
+OBJECT_BYTES = 400
+REFERENCE_BYTES = 8
+
+
+class Delta:
+    """
+    변경분 하나 - scene 의 내부 연산으로 되돌리거나 다시 적용
+
+    PAYLOAD_FIELDS 의 numpy 배열은 디스크로 내보낼 수 있고,
+    노드/라인 객체 참조는 항상 메모리에 남습니다.
+    """
+
+    PAYLOAD_FIELDS = ()
+
+    def undo(self, scene):
+        raise NotImplementedError
+
+    def redo(self, scene):
+        raise NotImplementedError
+
+    def payload(self) -> dict:
+        return {name: getattr(self, name) for name in self.PAYLOAD_FIELDS}
+
+    def set_payload(self, payload: Optional[dict]):
+        for name in self.PAYLOAD_FIELDS:
+            setattr(self, name, None if payload is None else payload[name])
+
+    def payload_bytes(self) -> int:
+        return sum(np.asarray(v).nbytes for v in self.payload().values() if v is not None)
+
+    def object_bytes(self) -> int:
+        """배열 외에 메모리에 남는 객체 참조 크기 추정"""
+        return 0
+
+
+class NodesDelta(Delta):
+    """노드 추가/삭제 (indices: 리스트에서의 위치, 오름차순)"""
+
+    PAYLOAD_FIELDS = ('indices',)
+
+    def __init__(self, indices: np.ndarray, nodes: list, added: bool):
+        self.indices = indices
+        self.nodes = nodes
+        self.added = added
+
+    def object_bytes(self) -> int:
+        # 삭제된 노드는 히스토리만 붙잡고 있음
+        return len(self.nodes) * (REFERENCE_BYTES if self.added else OBJECT_BYTES)
+
+    def undo(self, scene):
+        if self.added:
+            scene._delete_nodes(self.nodes)
+        else:
+            scene._insert_nodes(self.indices, self.nodes)
+
+    def redo(self, scene):
+        if self.added:
+            scene._insert_nodes(self.indices, self.nodes)
+        else:
+            scene._delete_nodes(self.nodes)
+
+
+class LinesDelta(Delta):
+    """라인 추가/삭제 (indices: 리스트에서의 위치, 오름차순)"""
+
+    PAYLOAD_FIELDS = ('indices',)
+
+    def __init__(self, indices: np.ndarray, lines: list, added: bool):
+        self.indices = indices
+        self.lines = lines
+        self.added = added
+
+    def object_bytes(self) -> int:
+        return len(self.lines) * (REFERENCE_BYTES if self.added else OBJECT_BYTES)
+
+    def undo(self, scene):
+        if self.added:
+            scene._delete_lines(self.lines)
+        else:
+            scene._insert_lines(self.indices, self.lines)
+
+    def redo(self, scene):
+        if self.added:
+            scene._insert_lines(self.indices, self.lines)
+        else:
+            scene._delete_lines(self.lines)
+
+
+class PositionsDelta(Delta):
+    """노드 좌표 변경 (old/new: (k, 3) 배열)"""
+
+    PAYLOAD_FIELDS = ('old', 'new')
+
+    def __init__(self, nodes: list, old: np.ndarray, new: np.ndarray):
+        self.nodes = nodes
+        self.old = old
+        self.new = new
+
+    def object_bytes(self) -> int:
+        return len(self.nodes) * REFERENCE_BYTES
+
+    def undo(self, scene):
+        scene._set_positions(self.nodes, self.old)
+
+    def redo(self, scene):
+        scene._set_positions(self.nodes, self.new)
+
+
+class GroupsDelta(Delta):
+    """노드 그룹 ID 변경 (old/new: (k,) 배열)"""
+
+    PAYLOAD_FIELDS = ('old', 'new')
+
+    def __init__(self, nodes: list, old: np.ndarray, new: np.ndarray):
+        self.nodes = nodes
+        self.old = old
+        self.new = new
+
+    def object_bytes(self) -> int:
+        return len(self.nodes) * REFERENCE_BYTES
+
+    def undo(self, scene):
+        scene._set_groups(self.nodes, self.old)
+
+    def redo(self, scene):
+        scene._set_groups(self.nodes, self.new)
+
+
+class SwapDelta(Delta):
+    """씬 전체 교체 (clear) - 이전/이후 노드·라인 리스트를 통째로 보관"""
+
+    def __init__(self, before: tuple, after: tuple):
+        self.before = before
+        self.after = after
+
+    def object_bytes(self) -> int:
+        # 교체 전 내용은 히스토리만 붙잡고 있음
+        return sum(len(items) for items in self.before) * OBJECT_BYTES
+
+    def undo(self, scene):
+        scene._swap_contents(*self.before)
+
+    def redo(self, scene):
+        scene._swap_contents(*self.after)
+
+
+class HistoryEntry:
+    """실행 취소 한 단계 (여러 변경분 묶음)"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.deltas: List[Delta] = []
+        self.nbytes = 0          # 메모리에 있을 때의 추정 크기
+        self.spill_ref = None    # 내보낸 경우 (오프셋, 길이)
+
+    def undo(self, scene):
+        for delta in reversed(self.deltas):
+            delta.undo(scene)
+
+    def redo(self, scene):
+        for delta in self.deltas:
+            delta.redo(scene)
+
+    def estimate_bytes(self) -> int:
+        return sum(d.payload_bytes() + d.object_bytes() for d in self.deltas)
+
+    def resident_bytes(self) -> int:
+        """내보낸 뒤에도 메모리에 남는 크기 (객체 참조)"""
+        return sum(d.object_bytes() for d in self.deltas)
+
+
+class EditHistory:
+    """
+    실행 취소/다시 실행 스택 (메모리 예산 기반)
+
+    새 편집이 기록되면 다시 실행 스택은 비워집니다. 메모리 사용량이 max_bytes 를
+    넘으면 가장 오래된 단계부터 배열 데이터를 압축해 임시 파일로 내보내고,
+    임시 파일이 max_disk_bytes 를 넘거나 단계 수가 max_entries 를 넘으면
+    가장 오래된 단계를 버립니다. 내보낸 뒤에도 노드/라인 객체 참조만으로
+    (다시 실행 스택 제외) max_bytes 를 넘으면 가장 최근 단계 하나만 남을 때까지
+    오래된 단계를 버립니다.
+    임시 파일에서 다시 읽었거나 버린 단계의 자리가 파일의 절반을 넘으면
+    살아 있는 단계만 새 파일로 옮겨 실제 파일 크기도 disk_bytes 의 두 배 안에 둡니다.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2,
+                 max_disk_bytes: int = 2 * 1024 ** 3, max_entries: int = 100_000):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_entries = max_entries
+        self.undo_stack: List[HistoryEntry] = []
+        self.redo_stack: List[HistoryEntry] = []
+        self.ram_bytes = 0
+        self.disk_bytes = 0
+        self._spilled = 0          # undo_stack 앞쪽에서 내보낸 단계 수
+        self._spill_file = None
+
+    def __len__(self) -> int:
+        return len(self.undo_stack)
+
+    def push(self, entry: HistoryEntry):
+        """새 편집 단계 추가"""
+        if not entry.deltas:
+            return
+        for old in self.redo_stack:
+            self.ram_bytes -= old.nbytes
+        self.redo_stack.clear()
+        entry.nbytes = entry.estimate_bytes()
+        self.ram_bytes += entry.nbytes
+        self.undo_stack.append(entry)
+        self._enforce_budget()
+
+    def pop_undo(self) -> Optional[HistoryEntry]:
+        """되돌릴 단계 꺼내기 (다시 실행 스택으로 이동)"""
+        if not self.undo_stack:
+            return None
+        entry = self.undo_stack.pop()
+        if entry.spill_ref is not None:
+            self._spilled -= 1
+            self._load(entry)
+        self.redo_stack.append(entry)
+        return entry
+
+    def pop_redo(self) -> Optional[HistoryEntry]:
+        """다시 실행할 단계 꺼내기 (실행 취소 스택으로 이동)"""
+        if not self.redo_stack:
+            return None
+        entry = self.redo_stack.pop()
+        self.undo_stack.append(entry)
+        self._enforce_budget()
+        return entry
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.ram_bytes = 0
+        self.disk_bytes = 0
+        self._spilled = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def get_info(self) -> dict:
+        """히스토리 사용량 (단계 수, 메모리/디스크 바이트)"""
+        return {
+            'undo_steps': len(self.undo_stack),
+            'redo_steps': len(self.redo_stack),
+            'spilled_steps': self._spilled,
+            'ram_bytes': self.ram_bytes,
+            'disk_bytes': self.disk_bytes,
+            'spill_file_bytes': self._spill_file.seek(0, 2) if self._spill_file is not None else 0,
+        }
+
+    # ----- 예산 관리 -----
+
+    def _enforce_budget(self):
+        # 가장 최근 단계는 항상 메모리에 둠
+        while self.ram_bytes > self.max_bytes and self._spilled < len(self.undo_stack) - 1:
+            self._spill(self.undo_stack[self._spilled])
+            self._spilled += 1
+        while self.undo_stack and (self.disk_bytes > self.max_disk_bytes or
+                                   len(self.undo_stack) > self.max_entries):
+            self._drop_oldest()
+        # 객체 참조(내보낼 수 없는 부분)만으로도 예산을 넘으면 오래된 단계를 버림
+        # (다시 실행 스택 몫은 다시 실행하면 실행 취소 스택으로 돌아오므로 제외)
+        redo_bytes = sum(entry.nbytes for entry in self.redo_stack)
+        while self.ram_bytes - redo_bytes > self.max_bytes and len(self.undo_stack) > 1:
+            self._drop_oldest()
+
+    def _spill(self, entry: HistoryEntry):
+        """단계의 배열 데이터를 압축해 임시 파일 끝에 기록"""
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix='ne3d_history_')
+        data = zlib.compress(pickle.dumps([d.payload() for d in entry.deltas],
+                                          protocol=pickle.HIGHEST_PROTOCOL), 1)
+        self._spill_file.seek(0, 2)
+        entry.spill_ref = (self._spill_file.tell(), len(data))
+        self._spill_file.write(data)
+        for delta in entry.deltas:
+            delta.set_payload(None)
+
+        resident = entry.resident_bytes()
+        self.ram_bytes -= entry.nbytes - resident
+        entry.nbytes = resident
+        self.disk_bytes += len(data)
+
+    def _load(self, entry: HistoryEntry):
+        """내보낸 단계를 임시 파일에서 다시 읽기"""
+        offset, length = entry.spill_ref
+        self._spill_file.seek(offset)
+        payloads = pickle.loads(zlib.decompress(self._spill_file.read(length)))
+        for delta, payload in zip(entry.deltas, payloads):
+            delta.set_payload(payload)
+        entry.spill_ref = None
+        self.disk_bytes -= length
+
+        self.ram_bytes -= entry.nbytes
+        entry.nbytes = entry.estimate_bytes()
+        self.ram_bytes += entry.nbytes
+        self._reclaim_spill_space()
+
+    def _drop_oldest(self):
+        entry = self.undo_stack.pop(0)
+        self.ram_bytes -= entry.nbytes
+        if entry.spill_ref is not None:
+            self.disk_bytes -= entry.spill_ref[1]
+            self._spilled -= 1
+            self._reclaim_spill_space()
+
+    def _reclaim_spill_space(self):
+        """임시 파일의 죽은 자리(다시 읽었거나 버린 단계)가 절반을 넘으면 공간 회수"""
+        if self._spill_file is None:
+            return
+        size = self._spill_file.seek(0, 2)
+        if size - self.disk_bytes <= size // 2:
+            return
+        if self._spilled == 0:
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            return
+        # 살아 있는 단계만 순서대로 새 파일에 옮겨 적고 위치 갱신
+        compacted = tempfile.TemporaryFile(prefix='ne3d_history_')
+        for entry in self.undo_stack[:self._spilled]:
+            offset, length = entry.spill_ref
+            self._spill_file.seek(offset)
+            entry.spill_ref = (compacted.tell(), length)
+            compacted.write(self._spill_file.read(length))
+        self._spill_file.close()
+        self._spill_file = compacted
@@ -0,0 +1,175 @@
+"""
+가져오기(import) 결과 디스크 캐시
+
+MIDAS/CSV 원본을 한 번 파싱한 결과(노드/라인 배열)를 .ne3d 바이너리 모델로 저장해 두고,
+같은 파일을 다시 열면 파싱 없이 memmap 으로 바로 읽습니다.
+"""
+import hashlib
+import os
+import tempfile
+from typing import List, Optional, Tuple
+
+from .binary_model import MappedModel, write_binary_model
+
+
+# 파서 결과 형식이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'node_editor3d')
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+_HASH_CHUNK_SIZE = 4 * 1024 * 1024
+_ENTRY_SUFFIX = '.ne3d'
+
+
+def file_content_hash(filepath: str) -> str:
+    """파일 내용 해시 (blake2b, 청크 단위 스트리밍)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImportCache:
+    """
+    파싱 결과 캐시 디렉터리
+
+    키는 (종류, 절대 경로, 크기, 수정 시각, 내용 해시)로 만들며,
+    총 크기가 max_bytes 를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다.
+    항목의 수정 시각을 마지막 사용 시각으로 씁니다.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    def cache_key(self, filepath: str, kind: str) -> str:
+        """
+        원본 파일의 캐시 키
+
+        Args:
+            filepath: 원본 파일 경로
+            kind: 파서 종류 ('csv', 'midas' 등) - 같은 파일도 파서가 다르면 다른 항목
+        """
+        stat = os.stat(filepath)
+        source = '|'.join((
+            kind, os.path.abspath(filepath), str(stat.st_size), str(stat.st_mtime_ns),
+            file_content_hash(filepath), str(CACHE_VERSION)
+        ))
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=20).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def get(self, filepath: str, kind: str) -> Optional[MappedModel]:
+        """
+        캐시된 모델을 memmap 으로 열기
+
+        Returns:
+            MappedModel 또는 None (캐시 없음/비활성/손상)
+        """
+        if not self.enabled:
+            return None
+        path = self._entry_path(self.cache_key(filepath, kind))
+        if not os.path.exists(path):
+            return None
+        try:
+            model = MappedModel(path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 손상된 캐시 항목을 삭제합니다: {e}")
+            self._remove(path)
+            return None
+        os.utime(path)  # LRU 사용 시각 갱신
+        return model
+
+    def put(self, filepath: str, kind: str, numbers, positions, edges=None,
+            edge_types=None, group_ids=None, element_ids=None) -> Optional[str]:
+        """
+        파싱 결과 배열을 캐시에 저장
+
+        Args:
+            filepath: 원본 파일 경로
+            kind: 파서 종류
+            numbers, positions, edges, edge_types, group_ids, element_ids: write_binary_model 인자
+
+        Returns:
+            저장된 캐시 파일 경로 (비활성이면 None)
+        """
+        if not self.enabled:
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(self.cache_key(filepath, kind))
+
+        # 임시 파일에 쓴 뒤 교체 - 쓰는 중에 다른 프로세스가 읽어도 안전
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            write_binary_model(tmp_path, numbers, positions, edges=edges,
+                               edge_types=edge_types, group_ids=group_ids,
+                               element_ids=element_ids)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self.evict()
+        return path
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """캐시 항목 (경로, 크기, 마지막 사용 시각) - 오래된 순"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def total_bytes(self) -> int:
+        """캐시 항목 총 크기"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> int:
+        """
+        총 크기가 max_bytes 이하가 될 때까지 오래된 항목 삭제
+
+        Returns:
+            삭제한 항목 수
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """
+        캐시 전체 삭제
+
+        Returns:
+            삭제한 항목 수
+        """
+        return sum(1 for path, _, _ in self.entries() if self._remove(path))
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,385 @@
+"""
+씬 변경 작업 저널 (충돌 복구용)
+
+씬 변경(노드/라인 추가·삭제, 이동, 그룹 변경)을 추가 전용(append-only) 바이너리
+로그로 남깁니다. 시작 시 마지막 체크포인트(.ne3d) 위에 저널을 재생해 복구하고,
+저널이 커지면 백그라운드에서 새 체크포인트로 압축합니다.
+
+실행 중인 편집기마다 저널 루트 아래에 자기 세션 디렉터리를 만들고 그 안의 lock 파일을
+배타 잠금합니다. 잠금이 풀린(소유 프로세스가 끝난) 세션만 비정상 종료로 보고 복구합니다.
+
+디렉터리 구성:
+    session-<pid>-<시각>/lock   - 세션 소유 프로세스가 잠그는 파일
+    session-<pid>-<시각>/checkpoint-<세대>.ne3d  - 세대 시작 시점의 씬
+    session-<pid>-<시각>/journal-<세대>.log      - 그 뒤의 변경 기록
+"""
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import zlib
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+
+from .binary_model import MappedModel, write_binary_model
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'node_editor3d', 'journal')
+
+MAGIC = b'NE3DJRN1'
+
+# 레코드 헤더: 작업 코드, 페이로드 길이, 페이로드 crc32
+_RECORD = struct.Struct('<BII')
+_COUNT = struct.Struct('<Q')
+
+# 작업 코드 (파일에 저장, 값 변경 금지)
+OP_CLEAR = 0
+OP_ADD_NODES = 1
+OP_REMOVE_NODES = 2
+OP_MOVE_NODES = 3
+OP_SET_GROUPS = 4
+OP_ADD_LINES = 5
+OP_REMOVE_LINES = 6
+
+# 작업별 페이로드 배열 (dtype, 행당 값 수) - 노드/라인은 노드 번호로 식별
+OP_LAYOUTS = {
+    OP_CLEAR: (),
+    OP_ADD_NODES: ((np.int64, 1), (np.float64, 3), (np.int32, 1)),   # numbers, positions, group_ids
+    OP_REMOVE_NODES: ((np.int64, 1),),                               # numbers
+    OP_MOVE_NODES: ((np.int64, 1), (np.float64, 3)),                 # numbers, positions
+    OP_SET_GROUPS: ((np.int64, 1), (np.int32, 1)),                   # numbers, group_ids
+    OP_ADD_LINES: ((np.int64, 1), (np.int64, 1), (np.uint8, 1)),     # starts, ends, type codes
+    OP_REMOVE_LINES: ((np.int64, 1), (np.int64, 1), (np.uint8, 1)),  # starts, ends, type codes
+}
+
+_CHECKPOINT_RE = re.compile(r'^checkpoint-(\d+)\.ne3d$')
+_JOURNAL_RE = re.compile(r'^journal-(\d+)\.log$')
+_SESSION_RE = re.compile(r'^session-\d+-\d+$')
+_LOCK_NAME = 'lock'
+
+
+def _try_lock(path: str):
+    """파일을 배타 잠금 (이미 다른 곳에서 잠갔으면 None)"""
+    try:
+        f = open(path, 'a+b')
+    except OSError:
+        return None
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+
+def _unlock(f):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    f.close()
+
+
+def encode_record(op: int, *arrays) -> bytes:
+    """작업 하나를 레코드 바이트로 인코딩"""
+    layout = OP_LAYOUTS[op]
+    count = len(arrays[0]) if arrays else 0
+    parts = [_COUNT.pack(count)]
+    for (dtype, width), values in zip(layout, arrays):
+        values = np.ascontiguousarray(values, dtype=dtype)
+        if values.size != count * width:
+            raise ValueError(f"저널 레코드 배열 크기가 맞지 않습니다 (작업 {op})")
+        parts.append(values.tobytes())
+    payload = b''.join(parts)
+    return _RECORD.pack(op, len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_payload(op: int, payload: bytes) -> Tuple[np.ndarray, ...]:
+    """레코드 페이로드 → 배열 튜플"""
+    (count,) = _COUNT.unpack_from(payload)
+    offset = _COUNT.size
+    arrays = []
+    for dtype, width in OP_LAYOUTS[op]:
+        values = np.frombuffer(payload, dtype=dtype, count=count * width, offset=offset)
+        offset += values.nbytes
+        arrays.append(values.reshape(-1, width) if width > 1 else values)
+    return tuple(arrays)
+
+
+def read_journal_file(filepath: str) -> Iterator[Tuple[int, Tuple[np.ndarray, ...]]]:
+    """
+    저널 파일의 레코드 순회 (작업 코드, 배열 튜플)
+
+    충돌로 잘리거나 손상된 꼬리 레코드를 만나면 거기서 멈춥니다.
+    """
+    with open(filepath, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            op, length, crc = _RECORD.unpack(header)
+            payload = f.read(length)
+            if op not in OP_LAYOUTS or len(payload) < length or zlib.crc32(payload) != crc:
+                print(f"⚠️ 저널 끝부분이 손상되어 이후 기록을 무시합니다: {filepath}")
+                return
+            yield op, decode_payload(op, payload)
+
+
+class SceneJournal:
+    """
+    추가 전용 씬 작업 저널
+
+    기록은 버퍼에 모았다가 sync_interval 초 또는 sync_bytes 바이트마다
+    flush + fsync 합니다. 현재 세대 저널이 compact_bytes 를 넘으면
+    needs_compaction() 이 True 가 됩니다.
+    """
+
+    def __init__(self, directory: str = DEFAULT_JOURNAL_DIR, sync_interval: float = 1.0,
+                 sync_bytes: int = 1024 * 1024, compact_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.sync_bytes = sync_bytes
+        self.compact_bytes = compact_bytes
+
+        self.generation = 0
+        self._file = None
+        self._unsynced = 0
+        self._segment_bytes = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+        self._session_lock = None   # 세션 lock 파일 (잠금을 쥐고 있는 동안 열어 둠)
+
+    @classmethod
+    def new_session(cls, root: str = DEFAULT_JOURNAL_DIR, **kwargs) -> 'SceneJournal':
+        """저널 루트 아래에 이 프로세스의 새 세션 디렉터리를 만들고 잠근 저널"""
+        directory = os.path.join(root, f'session-{os.getpid()}-{time.time_ns()}')
+        os.makedirs(directory, exist_ok=True)
+        journal = cls(directory, **kwargs)
+        if not journal.try_lock():
+            raise RuntimeError(f"저널 세션을 잠글 수 없습니다: {directory}")
+        return journal
+
+    @classmethod
+    def find_orphaned(cls, root: str = DEFAULT_JOURNAL_DIR, **kwargs) -> Optional['SceneJournal']:
+        """
+        잠금이 풀린(비정상 종료된) 세션 중 가장 최근 것을 잠가서 반환 (없으면 None)
+
+        기록이 없는 세션은 지우고, 다른 실행 중인 편집기가 잠근 세션은 건드리지 않습니다.
+        나머지 고아 세션은 다음 실행에서 하나씩 복구하도록 잠금만 풀어 둡니다.
+        """
+        if not os.path.isdir(root):
+            return None
+        sessions = sorted((os.path.join(root, name) for name in os.listdir(root)
+                           if _SESSION_RE.match(name)),
+                          key=lambda path: os.path.getmtime(path), reverse=True)
+        found = None
+        for directory in sessions:
+            journal = cls(directory, **kwargs)
+            if not journal.try_lock():
+                continue
+            if not journal.has_data():
+                journal.close(discard=True)
+            elif found is None:
+                found = journal
+            else:
+                journal.unlock()
+        return found
+
+    def try_lock(self) -> bool:
+        """세션 lock 파일 배타 잠금 (다른 프로세스가 쥐고 있으면 False)"""
+        if self._session_lock is None:
+            self._session_lock = _try_lock(os.path.join(self.directory, _LOCK_NAME))
+        return self._session_lock is not None
+
+    def unlock(self):
+        """세션 잠금 해제"""
+        if self._session_lock is not None:
+            _unlock(self._session_lock)
+            self._session_lock = None
+
+    # ----- 파일 목록 -----
+
+    def _generations(self, pattern) -> List[int]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(int(m.group(1)) for m in map(pattern.match, os.listdir(self.directory)) if m)
+
+    def _checkpoint_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f'checkpoint-{generation}.ne3d')
+
+    def _journal_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f'journal-{generation}.log')
+
+    def has_data(self) -> bool:
+        """복구할 체크포인트/저널이 있는지"""
+        return bool(self._generations(_CHECKPOINT_RE) or self._generations(_JOURNAL_RE))
+
+    # ----- 복구 -----
+
+    def load_checkpoint(self) -> Tuple[int, Optional[dict]]:
+        """
+        가장 최근의 읽을 수 있는 체크포인트
+
+        Returns:
+            (세대, to_arrays 형식 딕셔너리 또는 None) 튜플
+        """
+        for generation in reversed(self._generations(_CHECKPOINT_RE)):
+            try:
+                model = MappedModel(self._checkpoint_path(generation))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 체크포인트를 읽을 수 없습니다: {e}")
+                continue
+            arrays = {name: np.array(getattr(model, name))
+                      for name in ('numbers', 'positions', 'group_ids', 'edges', 'edge_types',
+                                   'element_ids')}
+            model.close()
+            return generation, arrays
+        return 0, None
+
+    def iter_records(self, from_generation: int = 0) -> Iterator[Tuple[int, Tuple[np.ndarray, ...]]]:
+        """from_generation 이후 세대의 저널 레코드를 순서대로 순회"""
+        for generation in self._generations(_JOURNAL_RE):
+            if generation >= from_generation:
+                yield from read_journal_file(self._journal_path(generation))
+
+    # ----- 기록 -----
+
+    def open(self):
+        """가장 최근 세대 저널 끝에 이어서 기록 시작"""
+        os.makedirs(self.directory, exist_ok=True)
+        generations = self._generations(_JOURNAL_RE) + self._generations(_CHECKPOINT_RE)
+        self.generation = max(generations) if generations else 0
+        self._open_segment()
+
+    def _open_segment(self):
+        path = self._journal_path(self.generation)
+        self._file = open(path, 'ab', buffering=1024 * 1024)
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self._segment_bytes = self._file.tell()
+
+    def append(self, op: int, *arrays):
+        """작업 레코드 추가 (주기적으로 fsync)"""
+        if self._file is None:
+            return
+        record = encode_record(op, *arrays)
+        with self._lock:
+            self._file.write(record)
+            self._unsynced += len(record)
+            self._segment_bytes += len(record)
+        if (self._unsynced >= self.sync_bytes or
+                time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+    def sync(self):
+        """버퍼를 디스크에 기록 (flush + fsync)"""
+        with self._lock:
+            if self._file is None or not self._unsynced:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    # ----- 압축 -----
+
+    def needs_compaction(self) -> bool:
+        """현재 세대 저널이 압축 기준 크기를 넘었는지 (압축 진행 중이면 False)"""
+        running = self._compaction is not None and self._compaction.is_alive()
+        return not running and self._segment_bytes >= self.compact_bytes
+
+    def start_compaction(self, arrays: dict) -> threading.Thread:
+        """
+        현재 씬 배열로 새 세대를 시작하고 체크포인트를 백그라운드에서 저장
+
+        저널은 즉시 새 세대 파일로 넘어가므로 압축 중에도 기록이 계속되고,
+        체크포인트 저장이 끝나면 이전 세대 파일을 지웁니다.
+
+        Args:
+            arrays: Scene3D.to_arrays() 결과 (호출 시점의 스냅샷)
+        """
+        self.sync()
+        with self._lock:
+            self._file.close()
+            self.generation += 1
+            self._open_segment()
+            generation = self.generation
+
+        def write_checkpoint():
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+            os.close(fd)
+            try:
+                write_binary_model(tmp_path, **arrays)
+                with open(tmp_path, 'rb') as f:
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._checkpoint_path(generation))
+            except Exception as e:
+                print(f"⚠️ 저널 체크포인트 저장 실패: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            self._remove_before(generation)
+
+        self._compaction = threading.Thread(target=write_checkpoint, daemon=True)
+        self._compaction.start()
+        return self._compaction
+
+    def wait_compaction(self):
+        """진행 중인 압축이 끝날 때까지 대기"""
+        if self._compaction is not None:
+            self._compaction.join()
+
+    def _remove_before(self, generation: int):
+        for pattern, path_of in ((_CHECKPOINT_RE, self._checkpoint_path),
+                                 (_JOURNAL_RE, self._journal_path)):
+            for old in self._generations(pattern):
+                if old < generation:
+                    try:
+                        os.remove(path_of(old))
+                    except OSError:
+                        pass
+
+    def close(self, discard: bool = False):
+        """
+        저널 닫기
+
+        Args:
+            discard: True 면 정상 종료로 보고 저널/체크포인트 파일(과 세션 디렉터리) 삭제
+        """
+        self.wait_compaction()
+        self.sync()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if discard:
+            generations = self._generations(_JOURNAL_RE) + self._generations(_CHECKPOINT_RE)
+            self._remove_before(max(generations, default=self.generation) + 1)
+        locked = self._session_lock is not None
+        self.unlock()
+        if discard and locked:
+            # 세션 디렉터리 정리 (다른 파일이 남아 있으면 그대로 둠)
+            try:
+                os.remove(os.path.join(self.directory, _LOCK_NAME))
+                os.rmdir(self.directory)
+            except OSError:
+                pass
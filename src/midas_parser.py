@@ -1,154 +1,511 @@
 """
-MIDAS MGB 파일 파서 - 간단한 테스트 버전
+MIDAS MGB/MGT 파일 파서
 """
-import struct
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, Iterator, List, Dict, Tuple, Optional
 from .data_structures import DataPoint, Node3D, LineType
+from .csv_handler import _format_rows, WRITE_CHUNK_SIZE
 
 
-class MidasMGBParser:
-    """MIDAS MGB (MIDAS Gen Binary) 파일 파서"""
+# MIDAS 요소 타입 (코드 = 튜플 인덱스, uint8 로 저장)
+ELEMENT_TYPES = ('BEAM', 'TRUSS', 'TENSTR', 'COMPTR',
+                 'PLATE', 'PLSTRS', 'PLSTRN', 'AXISYM', 'WALL', 'SOLID')
+ELEMENT_TYPE_CODES = {name.encode(): code for code, name in enumerate(ELEMENT_TYPES)}
+
+# 요소 타입별 절점 수 (레코드의 iN1.. 개수, 0 은 빈 절점)
+ELEMENT_NODE_COUNTS = (2, 2, 2, 2, 4, 4, 4, 4, 4, 8)
+
+# 요소 타입 → LineType
+ELEMENT_LINE_TYPES = {
+    'BEAM': LineType.MATERIAL,
+    'TRUSS': LineType.TRUSS,
+    'TENSTR': LineType.TRUSS,
+    'COMPTR': LineType.TRUSS,
+}
+ELEMENT_LINE_TYPE_TABLE = tuple(ELEMENT_LINE_TYPES.get(name, LineType.PANER)
+                                for name in ELEMENT_TYPES)
+
+# LineType → 내보낼 MGT 요소 타입
+# PANER 라인은 면/솔리드 요소의 외곽 변일 뿐 요소가 아니므로 내보내지 않습니다.
+LINE_TYPE_ELEMENT_TYPES = {
+    LineType.MATERIAL: 'BEAM',
+    LineType.TRUSS: 'TRUSS',
+}
+
+# 절점 수별 요소 외곽 변 (절점 순서 기준 인덱스 쌍)
+_EDGE_TEMPLATES = {
+    2: ((0, 1),),
+    3: ((0, 1), (1, 2), (2, 0)),
+    4: ((0, 1), (1, 2), (2, 3), (3, 0)),
+    6: ((0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)),
+    8: ((0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4),
+        (0, 4), (1, 5), (2, 6), (3, 7)),
+}
+_TETRA_EDGES = ((0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3))
+_SOLID_CODE = ELEMENT_TYPES.index('SOLID')
+
+class MidasParserBase:
+    """
+    MIDAS 파서 공통 기능 - 결과를 열 배열로 보관
+    
+    node_numbers (N,), node_coords (N, 3),
+    element_ids (E,), element_types (E,) uint8 - ELEMENT_TYPES 코드,
+    element_offsets (E+1,), element_connectivity - CSR 형식 요소 절점 번호
+    """
     
     def __init__(self):
-        self.nodes_data: List[Dict] = []
-        self.elements_data: List[Dict] = []
-        
-    def parse_mgb(self, filepath: str) -> bool:
+        self._set_arrays(
+            np.empty(0, dtype=np.int64), np.empty((0, 3)),
+            np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8),
+            np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int64)
+        )
+    
+    def _set_arrays(self, node_numbers, node_coords, element_ids, element_types,
+                    element_offsets, element_connectivity):
+        self.node_numbers = node_numbers
+        self.node_coords = node_coords
+        self.element_ids = element_ids
+        self.element_types = element_types
+        self.element_offsets = element_offsets
+        self.element_connectivity = element_connectivity
+    
+    def get_arrays(self) -> dict:
+        """파싱 결과 배열 (빠른 API)"""
+        return {
+            'node_numbers': self.node_numbers,
+            'node_coords': self.node_coords,
+            'element_ids': self.element_ids,
+            'element_types': self.element_types,
+            'element_offsets': self.element_offsets,
+            'element_connectivity': self.element_connectivity,
+        }
+    
+    def get_edge_arrays(self) -> dict:
         """
-        MGB 파일 파싱 - 테스트용 간단 버전
+        요소를 라인(변) 배열로 변환
+        
+        선 요소는 그대로, 면/솔리드 요소는 외곽 변으로 펼치며
+        여러 요소가 공유하는 변은 한 번만 남깁니다.
+        
+        Returns:
+            {'element_ids', 'start', 'end', 'types'} 딕셔너리 (types = ELEMENT_TYPES 코드)
         """
-        try:
-            print(f"🔍 MGB 파일 파싱 시작: {filepath}")
-            
-            # 일단 테스트용으로 간단한 노드 몇 개 생성
-            self.nodes_data = [
-                {'number': 1, 'x': 0.0, 'y': 0.0, 'z': 0.0},
-                {'number': 2, 'x': 10.0, 'y': 0.0, 'z': 0.0},
-                {'number': 3, 'x': 10.0, 'y': 10.0, 'z': 0.0},
-                {'number': 4, 'x': 0.0, 'y': 10.0, 'z': 0.0},
-                {'number': 5, 'x': 5.0, 'y': 5.0, 'z': 5.0},
-            ]
-            
-            self.elements_data = [
-                {'id': 1, 'start_node': 1, 'end_node': 2, 'type': 1},
-                {'id': 2, 'start_node': 2, 'end_node': 3, 'type': 1},
-                {'id': 3, 'start_node': 3, 'end_node': 4, 'type': 1},
-                {'id': 4, 'start_node': 4, 'end_node': 1, 'type': 1},
-                {'id': 5, 'start_node': 1, 'end_node': 5, 'type': 2},
-                {'id': 6, 'start_node': 2, 'end_node': 5, 'type': 2},
-                {'id': 7, 'start_node': 3, 'end_node': 5, 'type': 2},
-                {'id': 8, 'start_node': 4, 'end_node': 5, 'type': 2},
-            ]
-            
-            print(f"✅ 테스트 노드 {len(self.nodes_data)}개 생성")
-            print(f"✅ 테스트 요소 {len(self.elements_data)}개 생성")
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ MGB 파일 파싱 오류: {e}")
-            return False
+        offsets = self.element_offsets
+        conn = self.element_connectivity
+        counts = np.diff(offsets)
+        # 빈 절점(0)은 개수에서 제외 (삼각형 PLATE, 사면체 SOLID 등)
+        if len(conn):
+            nonzero = np.add.reduceat((conn != 0).astype(np.int64), offsets[:-1]) \
+                if len(counts) else np.empty(0, dtype=np.int64)
+            nonzero[counts == 0] = 0
+        else:
+            nonzero = np.zeros(len(counts), dtype=np.int64)
+        
+        ids, starts, ends, types = [], [], [], []
+        is_line = self.element_types <= ELEMENT_TYPES.index('COMPTR')
+        is_solid = self.element_types == _SOLID_CODE
+        # 요소 종류별로 변 템플릿 선택 (4절점 PLATE 는 사각형, 4절점 SOLID 는 사면체)
+        kinds = (('line', is_line), ('plate', ~is_line & ~is_solid), ('solid', is_solid))
+        for n_nodes in np.unique(nonzero):
+            if n_nodes < 2:
+                continue
+            for kind, kind_mask in kinds:
+                mask = (nonzero == n_nodes) & kind_mask
+                if not mask.any():
+                    continue
+                if kind == 'line':
+                    template = _EDGE_TEMPLATES[2]
+                elif kind == 'solid' and n_nodes == 4:
+                    template = _TETRA_EDGES
+                else:
+                    template = _EDGE_TEMPLATES.get(int(n_nodes))
+                    if template is None:
+                        continue
+                block = conn[offsets[:-1][mask][:, None] + np.arange(n_nodes)]
+                pairs = np.array(template)
+                ids.append(np.repeat(self.element_ids[mask], len(pairs)))
+                starts.append(block[:, pairs[:, 0]].ravel())
+                ends.append(block[:, pairs[:, 1]].ravel())
+                types.append(np.repeat(self.element_types[mask], len(pairs)))
+        
+        if not ids:
+            empty = np.empty(0, dtype=np.int64)
+            return {'element_ids': empty, 'start': empty, 'end': empty,
+                    'types': np.empty(0, dtype=np.uint8)}
+        
+        ids = np.concatenate(ids)
+        starts = np.concatenate(starts)
+        ends = np.concatenate(ends)
+        types = np.concatenate(types)
+        
+        # 면/솔리드에서 나온 공유 변 제거 (선 요소는 그대로 유지)
+        derived = types > ELEMENT_TYPES.index('COMPTR')
+        if derived.any():
+            key = np.stack([np.minimum(starts, ends), np.maximum(starts, ends)], axis=1)
+            _, first = np.unique(key[derived], axis=0, return_index=True)
+            keep = ~derived
+            keep[np.flatnonzero(derived)[first]] = True
+            order = np.flatnonzero(keep)
+            ids, starts, ends, types = ids[order], starts[order], ends[order], types[order]
+        
+        return {'element_ids': ids, 'start': starts, 'end': ends, 'types': types}
     
     def get_nodes_as_datapoints(self) -> List[DataPoint]:
         """절점 데이터를 DataPoint 리스트로 변환"""
-        datapoints = []
-        
-        for node_data in self.nodes_data:
-            datapoint = DataPoint(
-                number=node_data['number'],
-                x=node_data['x'],
-                y=node_data['y'],
-                z=node_data['z']
-            )
-            datapoints.append(datapoint)
-            
-        return datapoints
+        coords = self.node_coords
+        return [
+            DataPoint(number=number, x=x, y=y, z=z)
+            for number, x, y, z in zip(self.node_numbers.tolist(), coords[:, 0].tolist(),
+                                       coords[:, 1].tolist(), coords[:, 2].tolist())
+        ]
     
     def get_nodes_as_node3d(self) -> List[Node3D]:
         """절점 데이터를 Node3D 리스트로 변환"""
-        nodes = []
-        
-        for datapoint in self.get_nodes_as_datapoints():
-            node = Node3D(datapoint)
-            nodes.append(node)
-            
-        return nodes
+        return [Node3D(datapoint) for datapoint in self.get_nodes_as_datapoints()]
     
     def get_elements_info(self) -> List[Dict]:
-        """요소 정보 반환"""
-        return self.elements_data
+        """요소 정보 반환 (라인 단위 - 면 요소는 외곽 변으로 펼침)"""
+        edges = self.get_edge_arrays()
+        return [
+            {'id': element_id, 'start_node': start, 'end_node': end, 'type': ELEMENT_TYPES[code]}
+            for element_id, start, end, code in zip(edges['element_ids'].tolist(),
+                                                    edges['start'].tolist(),
+                                                    edges['end'].tolist(),
+                                                    edges['types'].tolist())
+        ]
     
     def get_element_line_type(self, element: Dict) -> LineType:
         """요소 타입에 따른 LineType 결정"""
-        elem_type = element.get('type', 1)
+        return ELEMENT_LINE_TYPES.get(element.get('type', 'BEAM'), LineType.PANER)
+
+
+class MidasMGBParser(MidasParserBase):
+    """
+    MIDAS MGB (MIDAS Gen Binary) 파일 파서
+    
+    MGB 는 공개 명세가 없는 MIDAS 내부 바이너리 형식이라 해석하지 않습니다.
+    MIDAS 에서 MGT(텍스트)로 내보낸 파일을 MidasTextParser 로 읽으세요.
+    """
+    
+    def parse_mgb(self, filepath: str) -> bool:
+        """
+        MGB 파일 파싱 (지원하지 않음 - 안내 메시지 후 실패)
         
-        if elem_type == 1:
-            return LineType.MATERIAL  # 빨간색
-        else:
-            return LineType.PANER     # 초록색
+        Args:
+            filepath: MGB 파일 경로
+            
+        Returns:
+            bool: 항상 False
+        """
+        print(f"❌ MIDAS 바이너리(MGB) 형식은 지원하지 않습니다: {filepath}")
+        print("   MIDAS 에서 MGT(텍스트)로 내보낸 파일을 불러오세요.")
+        return False
 
 
-class MidasTextParser:
-    """MIDAS 텍스트 형식 파서 (MGT 등) - 테스트용"""
+def _parse_node_lines(lines: Iterable[bytes], numbers: array, coords: array) -> Optional[bytes]:
+    """
+    *NODE 데이터 행 파싱 (iNO, X, Y, Z)
     
-    def __init__(self):
-        self.nodes_data: List[Dict] = []
-        self.elements_data: List[Dict] = []
+    다음 섹션 헤더('*')를 만나면 그 행을 반환하고, 입력이 끝나면 None 을 반환합니다.
+    """
+    for line in lines:
+        if line[:1] == b'*':
+            return line
+        if b';' in line:
+            line = line[:line.index(b';')]
+        parts = line.split(b',')
+        if len(parts) < 4:
+            continue
+        try:
+            number = int(parts[0])
+            x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
+        except ValueError:
+            continue
+        numbers.append(number)
+        coords.append(x)
+        coords.append(y)
+        coords.append(z)
+    return None
+
+
+def _parse_element_lines(lines: Iterable[bytes], ids: array, types: array,
+                         counts: array, connectivity: array) -> Optional[bytes]:
+    """
+    *ELEMENT 데이터 행 파싱 (iEL, TYPE, iMAT, iPRO, iN1, iN2, ...)
+    
+    알 수 없는 요소 타입은 건너뜁니다.
+    다음 섹션 헤더('*')를 만나면 그 행을 반환하고, 입력이 끝나면 None 을 반환합니다.
+    """
+    type_codes = ELEMENT_TYPE_CODES
+    node_counts = ELEMENT_NODE_COUNTS
+    for line in lines:
+        if line[:1] == b'*':
+            return line
+        if b';' in line:
+            line = line[:line.index(b';')]
+        parts = line.split(b',')
+        if len(parts) < 6:
+            continue
+        code = type_codes.get(parts[1].strip().upper())
+        if code is None:
+            continue
+        n_nodes = min(node_counts[code], len(parts) - 4)
+        try:
+            element_id = int(parts[0])
+            element_nodes = [int(p) for p in parts[4:4 + n_nodes]]
+        except ValueError:
+            continue
+        ids.append(element_id)
+        types.append(code)
+        counts.append(n_nodes)
+        connectivity.extend(element_nodes)
+    return None
+
+
+def _skip_section(lines: Iterator[bytes]) -> Optional[bytes]:
+    """관심 없는 섹션을 건너뛰고 다음 헤더 행 반환"""
+    for line in lines:
+        if line[:1] == b'*':
+            return line
+    return None
+
+
+def _section_keyword(header: bytes) -> bytes:
+    """'*NODE    ; Nodes' → b'*NODE'"""
+    return header.split(b';', 1)[0].split()[0].upper() if header.strip() else b''
+
+
+def _element_arrays(ids: array, types: array, counts: array, connectivity: array) -> tuple:
+    """요소 누산 버퍼 → (ids, types, offsets, connectivity) numpy 배열"""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(np.frombuffer(counts, dtype=np.uint8), out=offsets[1:])
+    return (np.frombuffer(ids, dtype=np.int64).copy(),
+            np.frombuffer(types, dtype=np.uint8).copy(),
+            offsets,
+            np.frombuffer(connectivity, dtype=np.int64).copy())
+
+
+# 병렬 파싱 설정
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024   # 이보다 작은 파일은 단일 스트리밍 파싱
+PARALLEL_CHUNK_BYTES = 16 * 1024 * 1024  # 섹션을 나누는 작업 단위 크기
+_PARSED_SECTIONS = (b'*NODE', b'*ELEMENT')
+
+
+def index_mgt_sections(filepath: str) -> List[Tuple[bytes, int, int]]:
+    """
+    MGT 섹션 위치 색인 (헤더 행만 찾는 빠른 1차 패스)
     
-    def parse_text_file(self, filepath: str) -> bool:
-        """텍스트 형식 MIDAS 파일 파싱"""
+    Returns:
+        (키워드, 데이터 시작 오프셋, 데이터 끝 오프셋) 리스트 - 파일 순서
+    """
+    sections = []
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return sections
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos = 0 if mm[:1] == b'*' else mm.find(b'\n*')
+            while pos >= 0:
+                header_start = pos if mm[pos:pos + 1] == b'*' else pos + 1
+                header_end = mm.find(b'\n', header_start)
+                data_start = size if header_end < 0 else header_end + 1
+                next_pos = mm.find(b'\n*', data_start - 1) if data_start < size else -1
+                data_end = size if next_pos < 0 else next_pos + 1
+                keyword = _section_keyword(mm[header_start:data_start])
+                sections.append((keyword, data_start, data_end))
+                pos = next_pos
+    return sections
+
+
+def split_mgt_ranges(filepath: str, start: int, end: int,
+                     chunk_bytes: int = PARALLEL_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """바이트 범위를 행 경계에서 chunk_bytes 내외 크기로 분할"""
+    if end - start <= chunk_bytes:
+        return [(start, end)]
+    ranges = []
+    with open(filepath, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while start < end:
+                cut = start + chunk_bytes
+                if cut >= end:
+                    cut = end
+                else:
+                    newline = mm.find(b'\n', cut, end)
+                    cut = end if newline < 0 else newline + 1
+                ranges.append((start, cut))
+                start = cut
+    return ranges
+
+
+def _parse_mgt_range(filepath: str, keyword: bytes, start: int, end: int) -> tuple:
+    """
+    섹션 데이터 범위 하나를 파싱 (프로세스 풀 작업 단위)
+    
+    Returns:
+        *NODE: (numbers, coords), *ELEMENT: (ids, types, counts, connectivity) numpy 배열
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        lines = f.read(end - start).split(b'\n')
+    if keyword == b'*NODE':
+        numbers, coords = array('q'), array('d')
+        _parse_node_lines(lines, numbers, coords)
+        return (np.frombuffer(numbers, dtype=np.int64).copy(),
+                np.frombuffer(coords, dtype=np.float64).reshape(-1, 3).copy())
+    ids, types, counts, connectivity = array('q'), array('B'), array('B'), array('q')
+    _parse_element_lines(lines, ids, types, counts, connectivity)
+    return (np.frombuffer(ids, dtype=np.int64).copy(),
+            np.frombuffer(types, dtype=np.uint8).copy(),
+            np.frombuffer(counts, dtype=np.uint8).copy(),
+            np.frombuffer(connectivity, dtype=np.int64).copy())
+
+
+class MidasTextParser(MidasParserBase):
+    """MIDAS 텍스트 형식 파서 (MGT)"""
+    
+    def parse_text_file(self, filepath: str, workers: Optional[int] = None) -> bool:
+        """
+        MGT 파일 스트리밍 파싱 (*NODE, *ELEMENT)
+        
+        파일을 한 줄씩 읽어 숫자만 compact 버퍼(array)에 누적하므로
+        메모리 사용량은 결과 배열 크기에 비례합니다. 그 외 섹션은 헤더만 확인하고 건너뜁니다.
+        
+        Args:
+            filepath: MGT 파일 경로
+            workers: 병렬 파싱 프로세스 수 (None = 큰 파일이면 CPU 수, 1 = 단일 스트리밍)
+        """
         try:
-            print(f"🔍 텍스트 파일 파싱 시작: {filepath}")
+            print(f"🔍 MGT 파일 파싱 시작: {filepath}")
             
-            # 테스트용 데이터
-            self.nodes_data = [
-                {'number': 1, 'x': 0.0, 'y': 0.0, 'z': 0.0},
-                {'number': 2, 'x': 5.0, 'y': 0.0, 'z': 0.0},
-                {'number': 3, 'x': 5.0, 'y': 5.0, 'z': 0.0},
-            ]
+            if workers is None:
+                large = os.path.getsize(filepath) >= PARALLEL_MIN_BYTES
+                workers = (os.cpu_count() or 1) if large else 1
+            if workers > 1:
+                self._parse_parallel(filepath, workers)
+                print(f"✅ MGT 병렬 파싱 완료 ({workers} 프로세스): "
+                      f"절점 {len(self.node_numbers)}개, 요소 {len(self.element_ids)}개")
+                return True
             
-            self.elements_data = [
-                {'id': 1, 'start_node': 1, 'end_node': 2, 'type': 1},
-                {'id': 2, 'start_node': 2, 'end_node': 3, 'type': 1},
-            ]
+            numbers, coords = array('q'), array('d')
+            ids, types, counts, connectivity = array('q'), array('B'), array('B'), array('q')
             
-            print(f"✅ 텍스트 파일 파싱 완료")
+            with open(filepath, 'rb') as f:
+                lines = iter(f)
+                header = _skip_section(lines)
+                while header is not None:
+                    keyword = _section_keyword(header)
+                    if keyword == b'*NODE':
+                        header = _parse_node_lines(lines, numbers, coords)
+                    elif keyword == b'*ELEMENT':
+                        header = _parse_element_lines(lines, ids, types, counts, connectivity)
+                    else:
+                        header = _skip_section(lines)
+            
+            self._set_arrays(
+                np.frombuffer(numbers, dtype=np.int64).copy(),
+                np.frombuffer(coords, dtype=np.float64).reshape(-1, 3).copy(),
+                *_element_arrays(ids, types, counts, connectivity)
+            )
+            
+            print(f"✅ MGT 파싱 완료: 절점 {len(self.node_numbers)}개, 요소 {len(self.element_ids)}개")
             return True
             
         except Exception as e:
             print(f"❌ 텍스트 파일 파싱 오류: {e}")
             return False
     
-    def get_nodes_as_datapoints(self) -> List[DataPoint]:
-        """절점 데이터를 DataPoint 리스트로 변환"""
-        datapoints = []
-        
-        for node_data in self.nodes_data:
-            datapoint = DataPoint(
-                number=node_data['number'],
-                x=node_data['x'],
-                y=node_data['y'],
-                z=node_data['z']
-            )
-            datapoints.append(datapoint)
-            
-        return datapoints
-    
-    def get_nodes_as_node3d(self) -> List[Node3D]:
-        """절점 데이터를 Node3D 리스트로 변환"""
-        nodes = []
+    def _parse_parallel(self, filepath: str, workers: int,
+                        chunk_bytes: int = PARALLEL_CHUNK_BYTES):
+        """
+        섹션 색인 후 *NODE/*ELEMENT 데이터를 행 경계 청크로 나눠 프로세스 풀에서 파싱
         
-        for datapoint in self.get_nodes_as_datapoints():
-            node = Node3D(datapoint)
-            nodes.append(node)
-            
-        return nodes
+        결과는 파일 순서대로 이어 붙이므로 단일 스트리밍 파싱과 같은 배열이 나옵니다.
+        """
+        tasks = []
+        for keyword, start, end in index_mgt_sections(filepath):
+            if keyword in _PARSED_SECTIONS:
+                for chunk_start, chunk_end in split_mgt_ranges(filepath, start, end, chunk_bytes):
+                    tasks.append((keyword, chunk_start, chunk_end))
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_parse_mgt_range, filepath, keyword, start, end)
+                       for keyword, start, end in tasks]
+            results = [(keyword, future.result()) for (keyword, _, _), future in zip(tasks, futures)]
+        
+        node_parts = [r for keyword, r in results if keyword == b'*NODE']
+        element_parts = [r for keyword, r in results if keyword == b'*ELEMENT']
+        
+        if node_parts:
+            numbers = np.concatenate([p[0] for p in node_parts])
+            coords = np.concatenate([p[1] for p in node_parts])
+        else:
+            numbers, coords = np.empty(0, dtype=np.int64), np.empty((0, 3))
+        
+        if element_parts:
+            ids, types, counts, connectivity = (np.concatenate([p[i] for p in element_parts])
+                                                for i in range(4))
+        else:
+            ids, connectivity = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+            types = counts = np.empty(0, dtype=np.uint8)
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        
+        self._set_arrays(numbers, coords, ids, types, offsets, connectivity)
+
+
+# write_mgt 요소가 참조하는 재질 1 / 단면 1 (사용자 정의 강재, 0.5 x 0.5 실단면)
+_MGT_PLACEHOLDER_PROPERTIES = (
+    '\n*MATERIAL    ; Material\n'
+    '; iMAT, TYPE, MNAME, SPHEAT, HEATCO, PLAST, TUNIT, bMASS, DAMPRATIO, 2, ELAST, POISN, THERMAL, DEN, MASS\n'
+    '    1, USER , MAT1, 0, 0, , C, NO, 0.02, 2, 2.05e+008, 0.3, 1.2e-005, 77, 0\n'
+    '\n*SECTION    ; Section\n'
+    '; iSEC, TYPE, SNAME, OFFSET, iCENT, iREF, iHORZ, HUSER, iVERT, VUSER, bSD, bWE, SHAPE, 2, D1, D2, ...\n'
+    '    1, DBUSER, SEC1, CC, 0, 0, 0, 0, 0, 0, YES, NO, SB, 2, 0.5, 0.5, 0, 0, 0, 0, 0, 0, 0, 0\n'
+)
+
+
+def write_mgt(filepath: str, numbers: np.ndarray, positions: np.ndarray,
+              element_starts: np.ndarray, element_ends: np.ndarray,
+              element_types: np.ndarray, element_ids: Optional[np.ndarray] = None,
+              chunk_size: int = WRITE_CHUNK_SIZE):
+    """
+    *NODE / *ELEMENT 섹션을 MGT 파일로 스트리밍 저장
     
-    def get_elements_info(self) -> List[Dict]:
-        """요소 정보 반환"""
-        return self.elements_data
+    모든 요소는 재질 1, 단면 1 을 참조하므로 그 자리표시 *MATERIAL / *SECTION 도 함께 씁니다
+    (MIDAS 에서 불러온 뒤 실제 재질/단면으로 바꾸면 됩니다).
     
-    def get_element_line_type(self, element: Dict) -> LineType:
-        """요소 타입에 따른 LineType 결정"""
-        return LineType.MATERIAL
\ No newline at end of file
+    Args:
+        filepath: 저장할 파일 경로
+        numbers: 절점 번호 (N,) - 그대로 유지
+        positions: 절점 좌표 (N, 3)
+        element_starts: 요소 시작 절점 번호 (M,)
+        element_ends: 요소 끝 절점 번호 (M,)
+        element_types: ELEMENT_TYPES 코드 (M,) - 선 요소 (BEAM/TRUSS 등)
+        element_ids: 요소 번호 (M,) - None 이면 1부터 순서대로
+        chunk_size: 청크당 행 수
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    if element_ids is None:
+        element_ids = np.arange(1, len(element_starts) + 1, dtype=np.int64)
+    type_names = np.array(ELEMENT_TYPES, dtype=object)[np.asarray(element_types, dtype=np.intp)]
+    
+    with open(filepath, 'w', encoding='utf-8', newline='\r\n') as f:
+        f.write('*NODE    ; Nodes\n; iNO, X, Y, Z\n')
+        for chunk in _format_rows('%7d, %.12g, %.12g, %.12g\n',
+                                  (numbers, positions[:, 0], positions[:, 1], positions[:, 2]),
+                                  chunk_size):
+            f.write(chunk)
+        
+        f.write(_MGT_PLACEHOLDER_PROPERTIES)
+        
+        f.write('\n*ELEMENT    ; Elements\n; iEL, TYPE, iMAT, iPRO, iN1, iN2, ANGLE, iSUB\n')
+        for chunk in _format_rows('%7d, %-6s, 1, 1, %7d, %7d, 0, 0\n',
+                                  (element_ids, type_names, element_starts, element_ends),
+                                  chunk_size):
+            f.write(chunk)
+        
+        f.write('\n*ENDDATA\n')
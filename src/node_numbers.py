@@ -0,0 +1,118 @@
+"""
+노드 번호 할당기
+
+다음 번호를 O(1)로 내주고, 대량 생성용 연속 번호 블록을 예약합니다.
+씬 이벤트를 구독해 다른 경로로 추가/삭제된 노드 번호도 따라가며,
+씬이 통째로 바뀌면(불러오기 등) 번호 인덱스에서 다시 만듭니다.
+"""
+import heapq
+import numpy as np
+from typing import List, Optional
+
+from .scene_events import SceneEventType
+
+
+class NodeNumberAllocator:
+    """
+    노드 번호 할당기
+
+    reuse_freed 가 True 면 삭제된 노드 번호를 작은 것부터 다시 씁니다
+    (기본은 재사용하지 않고 항상 최대 번호 다음 번호).
+    최대 번호 노드가 지워지면(롤백·실행 취소 포함) 남은 노드의 최대 번호로 내려가므로
+    되돌린 추가 때문에 번호가 비지 않습니다.
+    """
+
+    def __init__(self, reuse_freed: bool = False, first_number: int = 1):
+        self.reuse_freed = reuse_freed
+        self.first_number = first_number
+        self.max_number = first_number - 1
+        self._free_heap: List[int] = []
+        self._free = set()
+        self._scene = None
+
+    def attach(self, scene):
+        """씬 이벤트 구독 - 노드 추가/삭제/씬 교체를 따라감"""
+        self._scene = scene
+        scene.events.subscribe(self._on_events, kinds=(
+            SceneEventType.NODES_ADDED, SceneEventType.NODES_REMOVED, SceneEventType.RESET))
+        self.rebuild()
+
+    def rebuild(self, numbers: Optional[np.ndarray] = None):
+        """
+        사용 중인 번호로 다시 초기화 (빈 번호는 해제 목록에 넣지 않음)
+
+        Args:
+            numbers: 사용 중인 번호 - None 이면 연결된 씬의 번호 인덱스 사용
+        """
+        if numbers is None:
+            numbers = self._scene.get_number_index()[0] if self._scene is not None else []
+        numbers = np.asarray(numbers, dtype=np.int64)
+        self.max_number = max(int(numbers.max()) if len(numbers) else 0,
+                              self.first_number - 1)
+        self._free_heap = []
+        self._free = set()
+
+    def observe(self, numbers):
+        """다른 경로로 사용된 번호 반영"""
+        numbers = np.asarray(numbers, dtype=np.int64)
+        if not len(numbers):
+            return
+        self.max_number = max(self.max_number, int(numbers.max()))
+        if self._free:
+            self._free.difference_update(numbers.tolist())
+
+    def release(self, numbers):
+        """삭제된 노드 번호 반납 (reuse_freed 일 때만 재사용 목록에 추가)"""
+        numbers = np.asarray(numbers, dtype=np.int64)
+        if not len(numbers):
+            return
+        if int(numbers.max()) >= self.max_number:
+            self._lower_max()
+        if not self.reuse_freed:
+            return
+        for number in numbers.tolist():
+            if number not in self._free and number <= self.max_number:
+                self._free.add(number)
+                heapq.heappush(self._free_heap, number)
+
+    def next_number(self) -> int:
+        """다음 노드 번호 하나 할당"""
+        while self._free_heap:
+            number = heapq.heappop(self._free_heap)
+            if number in self._free:
+                self._free.discard(number)
+                return number
+        self.max_number += 1
+        return self.max_number
+
+    # 기존 GUI 코드 호환 이름
+    get_next_number = next_number
+
+    def reserve(self, count: int) -> np.ndarray:
+        """
+        연속 번호 블록 예약 (대량 생성용, 재사용 목록은 쓰지 않음)
+
+        Returns:
+            (count,) int64 번호 배열
+        """
+        start = self.max_number + 1
+        self.max_number += count
+        return np.arange(start, start + count, dtype=np.int64)
+
+    def _lower_max(self):
+        """최대 번호를 씬에 남은 최대 번호로 내림 (그보다 큰 재사용 번호는 버림)"""
+        if self._scene is None:
+            return
+        numbers = self._scene.get_number_index()[0]
+        self.max_number = max(int(numbers[-1]) if len(numbers) else 0, self.first_number - 1)
+        if self._free:
+            self._free = {number for number in self._free if number <= self.max_number}
+
+    def _on_events(self, events):
+        for event in events:
+            if event.kind is SceneEventType.RESET:
+                self.rebuild()
+            elif event.kind is SceneEventType.NODES_ADDED:
+                self.observe([n.number for n in event.items])
+            else:
+                self.release([n.number for n in event.items])
@@ -0,0 +1,196 @@
+"""
+씬 변경 알림 (이벤트 버스)
+
+Scene3D 의 모든 변경은 SceneEvent 로 발행됩니다. 렌더러/인덱스/캐시/상태바는
+이벤트에 담긴 인덱스 범위와 대상 항목만 보고 바뀐 부분만 갱신할 수 있습니다.
+트랜잭션 안에서 발생한 이벤트는 모아 두었다가 커밋할 때 한 번에 전달합니다.
+"""
+from enum import Enum
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+class SceneEventType(Enum):
+    """씬 변경 종류"""
+    NODES_ADDED = "nodes_added"
+    NODES_REMOVED = "nodes_removed"
+    NODES_MOVED = "nodes_moved"
+    NODES_REGROUPED = "nodes_regrouped"
+    EDGES_ADDED = "edges_added"
+    EDGES_REMOVED = "edges_removed"
+    SELECTION_CHANGED = "selection_changed"
+    VISIBILITY_CHANGED = "visibility_changed"
+    RESET = "reset"              # 씬 전체 교체 (clear, 불러오기, 읽기 전용 전환)
+
+
+# 노드/라인 리스트 구조(순서, 개수)가 바뀌는 이벤트
+STRUCTURE_EVENTS = frozenset({
+    SceneEventType.NODES_ADDED, SceneEventType.NODES_REMOVED,
+    SceneEventType.EDGES_ADDED, SceneEventType.EDGES_REMOVED, SceneEventType.RESET,
+})
+
+
+class SceneEvent:
+    """
+    씬 변경 이벤트 하나
+
+    Attributes:
+        kind: SceneEventType
+        indices: 리스트에서의 위치 (오름차순 int64 배열)
+            - 추가: 추가된 뒤의 위치, 삭제: 삭제되기 전의 위치
+            - 이동/그룹/선택/표시: 이벤트 발생 시점의 위치 (구독자가 있을 때만 계산)
+        items: 대상 Node3D 또는 Line3D 리스트 (indices 와 같은 순서)
+        lines: True 면 items 가 라인 (선택/표시 이벤트에서 노드와 구분)
+
+    트랜잭션으로 묶여 전달될 때 각 이벤트의 indices 는 그 이벤트가 발생한 시점의
+    리스트 기준이므로, 순서대로 적용하면 일관된 결과가 됩니다.
+    """
+
+    __slots__ = ('kind', 'indices', 'items', 'lines')
+
+    def __init__(self, kind: SceneEventType, indices: Optional[np.ndarray] = None,
+                 items: Optional[list] = None, lines: bool = False):
+        self.kind = kind
+        self.indices = indices
+        self.items = items if items is not None else []
+        self.lines = lines
+
+    @property
+    def count(self) -> int:
+        return len(self.items)
+
+    def index_range(self) -> Optional[range]:
+        """indices 가 연속 구간이면 range, 아니면 None"""
+        if self.indices is None or not len(self.indices):
+            return None
+        first, last = int(self.indices[0]), int(self.indices[-1])
+        if last - first + 1 == len(self.indices):
+            return range(first, last + 1)
+        return None
+
+    def mask(self, size: int) -> np.ndarray:
+        """길이 size 의 불리언 마스크 (대상 위치가 True)"""
+        mask = np.zeros(size, dtype=bool)
+        if self.indices is not None and len(self.indices):
+            mask[self.indices[self.indices < size]] = True
+        return mask
+
+    def __repr__(self):
+        return f"SceneEvent({self.kind.value}, count={self.count})"
+
+
+class SceneEventBus:
+    """
+    씬 이벤트 구독/발행
+
+    구독자는 이벤트 리스트를 받습니다 (트랜잭션 밖에서는 한 개짜리 리스트).
+    hold()/release() 사이의 이벤트는 모아 두었다가 release 때 한 번에 전달합니다.
+    """
+
+    def __init__(self):
+        self._subscribers: List[tuple] = []
+        self._pending: List[SceneEvent] = []
+        self._held = 0
+
+    @property
+    def active(self) -> bool:
+        """구독자가 있는지 (없으면 이벤트 생성 비용을 건너뜀)"""
+        return bool(self._subscribers)
+
+    def wants(self, kind: SceneEventType) -> bool:
+        """이 종류의 이벤트를 받을 구독자가 있는지"""
+        return any(kinds is None or kind in kinds for _, kinds in self._subscribers)
+
+    def subscribe(self, callback: Callable[[List[SceneEvent]], None],
+                  kinds: Optional[Iterable[SceneEventType]] = None):
+        """
+        구독 등록
+
+        Args:
+            callback: 이벤트 리스트를 받는 함수
+            kinds: 받을 이벤트 종류 (None 이면 전체)
+        """
+        self._subscribers.append((callback, frozenset(kinds) if kinds is not None else None))
+
+    def unsubscribe(self, callback):
+        """구독 해제"""
+        self._subscribers = [s for s in self._subscribers if s[0] != callback]
+
+    def hold(self):
+        """이벤트 전달 보류 시작 (중첩 가능)"""
+        self._held += 1
+
+    def release(self, discard: bool = False):
+        """
+        보류 종료 - 가장 바깥 release 에서 모인 이벤트 전달
+
+        Args:
+            discard: True 면 모인 이벤트를 버림
+        """
+        self._held -= 1
+        if self._held == 0:
+            events, self._pending = self._pending, []
+            if not discard:
+                self._deliver(events)
+
+    def emit(self, event: SceneEvent):
+        """이벤트 발행 (보류 중이면 모아 둠)"""
+        if not self.wants(event.kind):
+            return
+        if self._held:
+            self._pending.append(event)
+        else:
+            self._deliver([event])
+
+    def _deliver(self, events: List[SceneEvent]):
+        if not events:
+            return
+        for callback, kinds in list(self._subscribers):
+            selected = events if kinds is None else [e for e in events if e.kind in kinds]
+            if selected:
+                callback(selected)
+
+
+class DirtyTracker:
+    """
+    이벤트를 받아 '무엇이 바뀌었는지'를 누적하는 구독자
+
+    렌더러처럼 여러 변경을 모아 한 번에 갱신하는 쪽에서 씁니다.
+    take() 로 누적 상태를 꺼내면 초기화됩니다.
+    """
+
+    def __init__(self, bus: Optional[SceneEventBus] = None):
+        self.kinds: Set[SceneEventType] = set()
+        self.moved_nodes: Dict[int, object] = {}      # id(node) → node
+        self.selection_nodes: Dict[int, object] = {}
+        if bus is not None:
+            bus.subscribe(self)
+
+    def __call__(self, events: List[SceneEvent]):
+        for event in events:
+            self.kinds.add(event.kind)
+            if event.kind is SceneEventType.NODES_MOVED:
+                self.moved_nodes.update((id(n), n) for n in event.items)
+            elif event.kind is SceneEventType.SELECTION_CHANGED and not event.lines:
+                self.selection_nodes.update((id(n), n) for n in event.items)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.kinds)
+
+    @property
+    def structure_changed(self) -> bool:
+        """노드/라인 추가·삭제 또는 씬 교체가 있었는지"""
+        return bool(self.kinds & STRUCTURE_EVENTS)
+
+    def only(self, *kinds: SceneEventType) -> bool:
+        """누적된 변경이 모두 주어진 종류인지 (변경 없음이면 False)"""
+        return bool(self.kinds) and self.kinds <= set(kinds)
+
+    def take(self) -> 'DirtyTracker':
+        """현재 누적 상태를 복사해 반환하고 초기화"""
+        snapshot = DirtyTracker()
+        snapshot.kinds, self.kinds = self.kinds, set()
+        snapshot.moved_nodes, self.moved_nodes = self.moved_nodes, {}
+        snapshot.selection_nodes, self.selection_nodes = self.selection_nodes, {}
+        return snapshot
@@ -2,13 +2,93 @@
 3D 씬 관리 클래스
 """
 import numpy as np
+import pandas as pd
 from typing import List, Set, Optional, Tuple
 import json
-from copy import deepcopy
+from contextlib import contextmanager
 
 from .data_structures import DataPoint, Node3D, Line3D, LineType, CameraView
 from .csv_handler import CSVHandler
-from .midas_parser import MidasMGBParser, MidasTextParser
+from .midas_parser import (MidasMGBParser, MidasTextParser, ELEMENT_TYPES,
+                           ELEMENT_LINE_TYPE_TABLE, LINE_TYPE_ELEMENT_TYPES, write_mgt)
+from .import_cache import ImportCache
+from .journal import (SceneJournal, DEFAULT_JOURNAL_DIR, OP_CLEAR, OP_ADD_NODES,
+                      OP_REMOVE_NODES, OP_MOVE_NODES, OP_SET_GROUPS, OP_ADD_LINES,
+                      OP_REMOVE_LINES)
+from .history import (EditHistory, HistoryEntry, NodesDelta, LinesDelta, PositionsDelta,
+                      GroupsDelta, SwapDelta)
+from .scene_events import SceneEventBus, SceneEvent, SceneEventType
+from .scene_stats import SceneStats
+from .transforms import (apply_affine, about_pivot, translation_matrix, rotation_matrix,
+                         scale_matrix, mirror_matrix)
+from .spatial_index import build_kdtree, match_points, merge_coincident, radius_pairs
+from .node_numbers import NodeNumberAllocator
+from .connection_order import connection_edges
+from .grouping import component_group_ids, ranked_group_ids, EXTERIOR_GROUP_ID
+from .clustering import ClusterJob
+from .validation import ValidationReport, validate_arrays
+from .segment_intersect import find_intersections, split_pieces
+from .array_copy import (linear_transforms, grid_transforms, polar_transforms,
+                         internal_edges, copy_blocks)
+from .binary_model import (MappedModel, write_binary_model, line_type_to_code,
+                           code_to_line_type, LINE_TYPE_ORDER)
+
+
+def _insert_at(items: list, indices: np.ndarray, new_items: list):
+    """
+    new_items 를 삽입 후 위치 indices(오름차순)에 넣기 (제자리 수정)
+    
+    끝에 덧붙이는 경우는 extend 로 처리하고, 그 외에는 구간 슬라이스를 이어 붙입니다.
+    """
+    if not new_items:
+        return
+    if int(indices[0]) == len(items):
+        items.extend(new_items)
+        return
+    pieces = []
+    prev = 0
+    for offset, (index, item) in enumerate(zip(indices.tolist(), new_items)):
+        old_pos = index - offset
+        pieces.append(items[prev:old_pos])
+        pieces.append((item,))
+        prev = old_pos
+    pieces.append(items[prev:])
+    items[:] = [x for piece in pieces for x in piece]
+
+
+def _delete_from(items: list, targets) -> Tuple[np.ndarray, list]:
+    """
+    targets 를 리스트에서 삭제하고 (삭제 전 위치 오름차순, 그 순서의 항목) 반환
+    
+    리스트 끝부분 삭제(방금 추가한 항목 되돌리기)는 슬라이스 삭제로 처리합니다.
+    """
+    targets = list(targets)
+    count = len(targets)
+    if count and count <= len(items) and all(
+            a is b for a, b in zip(items[len(items) - count:], targets)):
+        start = len(items) - count
+        del items[start:]
+        return np.arange(start, start + count), targets
+    
+    target_ids = {id(t) for t in targets}
+    indices = [i for i, x in enumerate(items) if id(x) in target_ids]
+    removed = [items[i] for i in indices]
+    if removed:
+        items[:] = [x for x in items if id(x) not in target_ids]
+    return np.asarray(indices, dtype=np.int64), removed
+
+
+def _edge_keys(start_indices: np.ndarray, end_indices: np.ndarray,
+               codes: np.ndarray) -> np.ndarray:
+    """
+    방향 없는 라인 키 (작은 인덱스, 큰 인덱스, 타입 코드)를 int64 하나로 묶음
+    
+    노드 인덱스 2^30, 타입 코드 4개까지 표현합니다.
+    """
+    a = np.asarray(start_indices, dtype=np.int64)
+    b = np.asarray(end_indices, dtype=np.int64)
+    lo, hi = np.minimum(a, b), np.maximum(a, b)
+    return (lo << 32) | (hi << 2) | np.asarray(codes, dtype=np.int64)
 
 
 class Scene3D:
@@ -19,8 +99,31 @@ class Scene3D:
         self.lines: List[Line3D] = []
         self.selected_nodes: Set[Node3D] = set()
         self.selected_lines: Set[Line3D] = set()
-        self.history: List[dict] = []  # 실행 취소를 위한 히스토리
-        self.max_history_size = 10
+        self.history = EditHistory(max_bytes=256 * 1024 ** 2)  # 실행 취소/다시 실행 (메모리 예산)
+        self._edit: Optional[HistoryEntry] = None
+        self._edit_depth = 0
+        self._history_suspended = False
+        self._after_commit = []
+        
+        # 변경 알림 (렌더러/캐시/상태바 구독용)
+        self.events = SceneEventBus()
+        self._node_slots: Optional[dict] = None   # id(node) → 인덱스 (구독자가 있을 때만)
+        self._line_slots: Optional[dict] = None
+        
+        # 파생 값 캐시 (경계, 중심, 선택 집계) - 내부 편집 연산이 증분 갱신
+        self.stats = SceneStats()
+        
+        # 읽기 전용 모드 (memmap 모델)
+        self.mapped: Optional[MappedModel] = None
+        self.mapped_selection = np.empty(0, dtype=np.int64)
+        self._mapped_segments = None  # (키, (시작점, 끝점, 타입)) - 렌더용 라인 캐시
+        
+        # 노드 번호 → 인덱스 검색용 (정렬된 번호, 원래 인덱스)
+        self._number_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._number_index_size = -1
+        
+        # 충돌 복구용 작업 저널 (None 이면 기록 안 함)
+        self.journal: Optional[SceneJournal] = None
         
         # 씬 설정
         self.show_grid = True
@@ -31,188 +134,760 @@ class Scene3D:
         
     def clear(self):
         """씬 초기화"""
-        self.nodes.clear()
-        self.lines.clear()
+        self.close_read_only()
+        self._swap_contents([], [])
         self.selected_nodes.clear()
         self.selected_lines.clear()
+    
+    def _log(self, op: int, *arrays):
+        """저널에 작업 기록"""
+        if self.journal is None:
+            return
+        self.journal.append(op, *arrays)
+    
+    def _maybe_compact(self):
+        """
+        저널이 커졌으면 백그라운드 압축 시작
+        
+        체크포인트는 작업 하나의 기록이 모두 끝난 뒤(단독 단계, 가장 바깥 트랜잭션,
+        실행 취소/다시 실행, 불러오기 직후)에만 찍습니다. 작업 중간에 찍으면
+        같은 작업의 남은 기록이 새 세대에 다시 적용되어 복구 시 중복이 생깁니다.
+        """
+        if self.journal is not None and self.journal.needs_compaction():
+            self.journal.start_compaction(self.to_arrays())
+    
+    def _log_lines(self, op: int, lines: List[Line3D]):
+        if self.journal is None or not lines:
+            return
+        self._log(op,
+                  [l.start_node.number for l in lines], [l.end_node.number for l in lines],
+                  [line_type_to_code(l.line_type) for l in lines])
+    
+    # ----- 변경 알림 -----
+    
+    def _emit(self, kind: SceneEventType, items: list, indices=None, lines: bool = False):
+        """변경 이벤트 발행 (구독자가 없으면 아무것도 하지 않음)"""
+        if not self.events.wants(kind):
+            return
+        # 읽기 전용 모드의 선택 변경은 대상 객체 없이 알림
+        if not items and kind is not SceneEventType.RESET and self.mapped is None:
+            return
+        if indices is None and items:
+            indices = self._slots_of(items, lines)
+        self.events.emit(SceneEvent(kind, indices, list(items), lines))
+    
+    def _slots_of(self, items: list, lines: bool = False) -> np.ndarray:
+        """노드/라인 객체 → 현재 리스트 인덱스 (오름차순이 아닐 수 있음)"""
+        if lines:
+            if self._line_slots is None:
+                self._line_slots = {id(l): i for i, l in enumerate(self.lines)}
+            slots = self._line_slots
+        else:
+            if self._node_slots is None:
+                self._node_slots = {id(n): i for i, n in enumerate(self.nodes)}
+            slots = self._node_slots
+        return np.fromiter((slots.get(id(x), -1) for x in items), dtype=np.int64,
+                           count=len(items))
+    
+    # ----- 히스토리 -----
+    
+    def _record(self, delta):
+        """변경분을 현재 트랜잭션에 기록 (트랜잭션 밖이면 단독 단계)"""
+        if self._history_suspended:
+            return
+        if self._edit is not None:
+            self._edit.deltas.append(delta)
+        else:
+            entry = HistoryEntry()
+            entry.deltas.append(delta)
+            self.history.push(entry)
+            self._maybe_compact()
+    
+    @property
+    def in_transaction(self) -> bool:
+        """트랜잭션(편집 단계) 진행 중 여부"""
+        return self._edit_depth > 0
+    
+    @contextmanager
+    def transaction(self, label: str = ""):
+        """
+        여러 변경을 실행 취소 한 단계로 묶는 트랜잭션 (중첩 가능)
+        
+        with scene.transaction("panel"):
+            ...
+        
+        블록 안에서 예외가 나면 블록에서 한 변경만 되돌리고 예외를 다시 던집니다.
+        변경 이벤트는 모아 두었다가 가장 바깥 트랜잭션이 끝날 때 한 번에 전달하고,
+        call_after_commit 으로 등록한 작업(다시 그리기 등)은 가장 바깥 트랜잭션이
+        끝날 때 한 번씩만 실행됩니다.
+        """
+        if self._edit_depth == 0:
+            self._edit = HistoryEntry(label)
+        self._edit_depth += 1
+        self.events.hold()
+        mark = len(self._edit.deltas)
+        try:
+            yield self
+        except BaseException:
+            self._rollback(mark)
+            raise
+        finally:
+            self._edit_depth -= 1
+            if self._edit_depth == 0:
+                entry, self._edit = self._edit, None
+                self.history.push(entry)
+                self._maybe_compact()
+            self.events.release()
+            if self._edit_depth == 0:
+                self._run_after_commit()
+    
+    @contextmanager
+    def loading(self):
+        """
+        파일 불러오기 블록 - 안에서 한 변경은 실행 취소에 기록하지 않고,
+        끝나면 히스토리를 비웁니다 (불러온 모델이 실행 취소의 시작점)
+        """
+        suspended, self._history_suspended = self._history_suspended, True
+        try:
+            yield self
+        finally:
+            self._history_suspended = suspended
+            self.history.clear()
+            self._maybe_compact()
+    
+    def _rollback(self, mark: int):
+        """현재 트랜잭션에서 mark 이후 변경을 되돌림"""
+        deltas = self._edit.deltas[mark:]
+        del self._edit.deltas[mark:]
+        suspended, self._history_suspended = self._history_suspended, True
+        try:
+            for delta in reversed(deltas):
+                delta.undo(self)
+        finally:
+            self._history_suspended = suspended
+        print("⚠️ 트랜잭션 중 오류로 변경을 되돌렸습니다.")
+    
+    def call_after_commit(self, callback):
+        """
+        트랜잭션이 끝난 뒤 실행할 작업 등록 (같은 작업은 한 번만)
+        
+        트랜잭션 밖이면 바로 실행합니다.
+        """
+        if self._edit_depth == 0:
+            callback()
+        elif callback not in self._after_commit:
+            self._after_commit.append(callback)
+    
+    def _run_after_commit(self):
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+    
+    # ----- 내부 편집 연산 (히스토리 기록 + 저널 기록) -----
+    
+    def _insert_nodes(self, indices, nodes: List[Node3D]):
+        """노드를 지정 위치(삽입 후 리스트 기준, 오름차순)에 넣기"""
+        if not len(indices):
+            return
+        indices = np.asarray(indices, dtype=np.int64)
+        _insert_at(self.nodes, indices, nodes)
+        self.selected_nodes.update(n for n in nodes if n.is_selected)
+        self.stats.nodes_added(nodes)
+        self._number_index = None
+        self._node_slots = None
+        if self.journal is not None and nodes:
+            self._log(OP_ADD_NODES, [n.number for n in nodes], [n.position for n in nodes],
+                      [n.group_id for n in nodes])
+        self._record(NodesDelta(indices, nodes, added=True))
+        self._emit(SceneEventType.NODES_ADDED, nodes, indices)
+    
+    def _delete_nodes(self, nodes: List[Node3D]):
+        """노드 삭제 (연결된 라인은 호출하는 쪽에서 먼저 삭제)"""
+        indices, nodes = _delete_from(self.nodes, nodes)
+        self.selected_nodes.difference_update(nodes)
+        self.stats.nodes_removed(nodes, [n for n in nodes if n.is_selected])
+        self._number_index = None
+        self._node_slots = None
+        if nodes:
+            self._log(OP_REMOVE_NODES, [n.number for n in nodes])
+        self._record(NodesDelta(indices, nodes, added=False))
+        self._emit(SceneEventType.NODES_REMOVED, nodes, indices)
+    
+    def _insert_lines(self, indices, lines: List[Line3D]):
+        """라인을 지정 위치(삽입 후 리스트 기준, 오름차순)에 넣기"""
+        if not len(indices):
+            return
+        indices = np.asarray(indices, dtype=np.int64)
+        _insert_at(self.lines, indices, lines)
+        self.selected_lines.update(l for l in lines if l.is_selected)
+        self._line_slots = None
+        self.stats.lines_changed()
+        self._log_lines(OP_ADD_LINES, lines)
+        self._record(LinesDelta(indices, lines, added=True))
+        self._emit(SceneEventType.EDGES_ADDED, lines, indices, lines=True)
+    
+    def _delete_lines(self, lines: List[Line3D]):
+        """라인 삭제"""
+        indices, lines = _delete_from(self.lines, lines)
+        self.selected_lines.difference_update(lines)
+        self._line_slots = None
+        self.stats.lines_changed()
+        self._log_lines(OP_REMOVE_LINES, lines)
+        self._record(LinesDelta(indices, lines, added=False))
+        self._emit(SceneEventType.EDGES_REMOVED, lines, indices, lines=True)
+    
+    def _set_positions(self, nodes: List[Node3D], positions: np.ndarray):
+        """노드 좌표 변경"""
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        old = np.array([n.position for n in nodes], dtype=np.float64).reshape(-1, 3)
+        # 노드마다 새 배열을 만들지 않고 positions 의 행(view)을 그대로 연결
+        for node, row, (x, y, z) in zip(nodes, positions, positions.tolist()):
+            data_point = node.data_point
+            data_point.x, data_point.y, data_point.z = x, y, z
+            node.position = row
+        self.stats.nodes_moved(nodes, old, positions)
+        self._log(OP_MOVE_NODES, [n.number for n in nodes], positions)
+        self._record(PositionsDelta(nodes, old, positions))
+        self._emit(SceneEventType.NODES_MOVED, nodes)
+    
+    def _set_groups(self, nodes: List[Node3D], group_ids: np.ndarray):
+        """노드 그룹 ID 변경"""
+        group_ids = np.asarray(group_ids, dtype=np.int32)
+        old = np.fromiter((n.group_id for n in nodes), dtype=np.int32, count=len(nodes))
+        for node, group_id in zip(nodes, group_ids.tolist()):
+            node.group_id = group_id
+        # 바뀐 노드에 닿은 라인의 그룹 다시 계산 (양 끝 노드 그룹)
+        changed = {id(n) for n in nodes}
+        for line in self.lines:
+            if id(line.start_node) in changed or id(line.end_node) in changed:
+                line.group_ids = {line.start_node.group_id, line.end_node.group_id}
+        self._log(OP_SET_GROUPS, [n.number for n in nodes], group_ids)
+        self._record(GroupsDelta(nodes, old, group_ids.copy()))
+        self._emit(SceneEventType.NODES_REGROUPED, nodes)
+    
+    def _swap_contents(self, nodes: List[Node3D], lines: List[Line3D]):
+        """노드/라인 리스트를 통째로 교체"""
+        before = (self.nodes, self.lines)
+        self.nodes, self.lines = nodes, lines
+        self.selected_nodes = {n for n in nodes if n.is_selected}
+        self.selected_lines = {l for l in lines if l.is_selected}
+        self._number_index = None
+        self._node_slots = self._line_slots = None
+        self.stats.reset(np.array([n.position for n in nodes], dtype=np.float64),
+                         list(self.selected_nodes))
+        self._log(OP_CLEAR)
+        if self.journal is not None and nodes:
+            self._log(OP_ADD_NODES, [n.number for n in nodes], [n.position for n in nodes],
+                      [n.group_id for n in nodes])
+            self._log_lines(OP_ADD_LINES, lines)
+        self._record(SwapDelta(before, (nodes, lines)))
+        self._emit(SceneEventType.RESET, [])
+    
+    @property
+    def read_only(self) -> bool:
+        """memmap 모델을 보고 있는 읽기 전용 모드 여부"""
+        return self.mapped is not None
+    
+    @property
+    def node_count(self) -> int:
+        """노드 수 (읽기 전용 모드 포함)"""
+        if self.mapped is not None:
+            return self.mapped.node_count
+        return len(self.nodes)
+    
+    @property
+    def line_count(self) -> int:
+        """라인 수 (읽기 전용 모드 포함)"""
+        if self.mapped is not None:
+            return self.mapped.edge_count
+        return len(self.lines)
+    
+    def open_read_only(self, filepath: str):
+        """
+        .ne3d 바이너리 모델을 읽기 전용으로 열기
+        
+        Node3D 객체를 만들지 않고 memmap 배열 위에서 조회/선택/렌더 준비를 수행합니다.
+        """
+        mapped = MappedModel(filepath)
+        self.clear()
+        self.history.clear()
+        self.mapped = mapped
+        self.mapped_selection = np.empty(0, dtype=np.int64)
+        self._mapped_segments = None
+        self._emit(SceneEventType.RESET, [])
+    
+    def close_read_only(self):
+        """읽기 전용 모델 닫기"""
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+        self.mapped_selection = np.empty(0, dtype=np.int64)
+        self._mapped_segments = None
+    
+    def _check_writable(self):
+        """읽기 전용 모드에서의 편집 방지"""
+        if self.mapped is not None:
+            raise RuntimeError("읽기 전용 모드에서는 편집할 수 없습니다.")
         
     def add_node(self, data_point: DataPoint) -> Node3D:
         """노드 추가"""
+        self._check_writable()
         node = Node3D(data_point)
-        self.nodes.append(node)
+        self._insert_nodes([len(self.nodes)], [node])
         return node
     
+    def add_nodes_bulk(self, numbers: np.ndarray, positions: np.ndarray,
+                       group_ids: Optional[np.ndarray] = None) -> List[Node3D]:
+        """
+        번호/좌표 배열로 노드를 한 번에 추가
+        
+        Args:
+            numbers: 노드 번호 (N,)
+            positions: 노드 좌표 (N, 3)
+            group_ids: 노드 그룹 ID (N,) - None 이면 0
+            
+        Returns:
+            생성된 Node3D 리스트
+        """
+        self._check_writable()
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        new_nodes = [
+            Node3D(DataPoint(number=number, x=x, y=y, z=z))
+            for number, (x, y, z) in zip(np.asarray(numbers).tolist(), positions.tolist())
+        ]
+        if group_ids is not None:
+            for node, group_id in zip(new_nodes, np.asarray(group_ids).tolist()):
+                node.group_id = group_id
+        start = len(self.nodes)
+        self._insert_nodes(np.arange(start, start + len(new_nodes)), new_nodes)
+        return new_nodes
+    
     def add_line(self, start_node: Node3D, end_node: Node3D, line_type: LineType) -> Line3D:
         """라인 추가"""
+        self._check_writable()
         line = Line3D(start_node, end_node, line_type)
-        self.lines.append(line)
+        self._insert_lines([len(self.lines)], [line])
         return line
     
+    def add_lines_bulk(self, start_indices: np.ndarray, end_indices: np.ndarray,
+                       line_types) -> List[Line3D]:
+        """
+        노드 인덱스 배열로 라인을 한 번에 추가 (그룹 ID 포함)
+        
+        Args:
+            start_indices: 시작 노드 인덱스 배열 (self.nodes 기준)
+            end_indices: 끝 노드 인덱스 배열
+            line_types: LineType 하나 또는 라인별 LineType 배열
+            
+        Returns:
+            생성된 Line3D 리스트
+        """
+        self._check_writable()
+        count = len(start_indices)
+        if isinstance(line_types, LineType):
+            line_types = [line_types] * count
+        
+        nodes = self.nodes
+        new_lines = []
+        for i, j, line_type in zip(np.asarray(start_indices).tolist(),
+                                   np.asarray(end_indices).tolist(), line_types):
+            start_node, end_node = nodes[i], nodes[j]
+            line = Line3D(start_node, end_node, line_type)
+            line.group_ids = {getattr(start_node, 'group_id', 0),
+                              getattr(end_node, 'group_id', 0)}
+            new_lines.append(line)
+        
+        start = len(self.lines)
+        self._insert_lines(np.arange(start, start + len(new_lines)), new_lines)
+        return new_lines
+    
+    def get_number_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        노드 번호 검색 인덱스 반환 (정렬된 번호, 해당 노드 인덱스)
+        
+        노드 추가/삭제 시 무효화되며 다음 조회 때 한 번만 다시 정렬합니다.
+        """
+        if self._number_index is None or self._number_index_size != len(self.nodes):
+            numbers = np.fromiter((n.number for n in self.nodes), dtype=np.int64,
+                                  count=len(self.nodes))
+            order = np.argsort(numbers, kind='stable')
+            self._number_index = (numbers[order], order)
+            self._number_index_size = len(self.nodes)
+        return self._number_index
+    
+    def lookup_node_indices(self, numbers: np.ndarray) -> np.ndarray:
+        """
+        노드 번호 배열 → 노드 인덱스 배열 (없는 번호는 -1)
+        """
+        numbers = np.asarray(numbers, dtype=np.int64)
+        sorted_numbers, order = self.get_number_index()
+        if len(sorted_numbers) == 0:
+            return np.full(numbers.shape, -1, dtype=np.int64)
+        
+        pos = np.searchsorted(sorted_numbers, numbers)
+        pos_clipped = np.minimum(pos, len(sorted_numbers) - 1)
+        found = sorted_numbers[pos_clipped] == numbers
+        return np.where(found, order[pos_clipped], -1)
+    
+    def get_node_by_number(self, number: int) -> Optional[Node3D]:
+        """번호로 노드 찾기"""
+        index = int(self.lookup_node_indices(np.array([number]))[0])
+        return self.nodes[index] if index >= 0 else None
+    
     def remove_node(self, node: Node3D):
         """노드 제거"""
-        if node in self.nodes:
-            # 연결된 라인도 제거
-            lines_to_remove = [
-                line for line in self.lines 
-                if line.start_node == node or line.end_node == node
-            ]
-            for line in lines_to_remove:
-                self.lines.remove(line)
-            
-            # 선택 해제
-            if node in self.selected_nodes:
-                self.selected_nodes.remove(node)
-            
-            # 노드 제거
-            self.nodes.remove(node)
+        self.remove_nodes([node])
+    
+    def remove_nodes(self, nodes):
+        """여러 노드와 연결된 라인을 한 번에 제거"""
+        self._check_writable()
+        removed = {id(node) for node in nodes}
+        if not removed:
+            return
+        attached = [l for l in self.lines
+                    if id(l.start_node) in removed or id(l.end_node) in removed]
+        with self.transaction("노드 삭제"):
+            self._delete_lines(attached)
+            self._delete_nodes(list(nodes))
+    
+    def set_node_positions(self, nodes: List[Node3D], positions: np.ndarray):
+        """
+        여러 노드의 좌표를 한 번에 변경
+        
+        Args:
+            nodes: 대상 노드 리스트
+            positions: 새 좌표 (len(nodes), 3)
+        """
+        self._check_writable()
+        self._set_positions(list(nodes), positions)
+    
+    def transform_nodes(self, nodes: List[Node3D], matrix: np.ndarray):
+        """
+        여러 노드에 4x4 아핀 변환을 한 번에 적용 (실행 취소 한 단계)
+        
+        Args:
+            nodes: 대상 노드 리스트
+            matrix: 4x4 변환 행렬 (transforms 모듈 참고)
+        """
+        self._check_writable()
+        nodes = list(nodes)
+        if not nodes:
+            return
+        positions = np.array([n.position for n in nodes], dtype=np.float64)
+        self._set_positions(nodes, apply_affine(positions, matrix))
+    
+    def set_node_groups(self, nodes: List[Node3D], group_ids):
+        """
+        여러 노드의 그룹 ID 변경
+        
+        Args:
+            nodes: 대상 노드 리스트
+            group_ids: 그룹 ID 하나 또는 노드별 그룹 ID 배열
+        """
+        nodes = list(nodes)
+        if np.isscalar(group_ids):
+            group_ids = np.full(len(nodes), group_ids, dtype=np.int32)
+        self._set_groups(nodes, group_ids)
     
     def remove_selected_nodes(self):
         """선택된 노드 제거"""
         if not self.selected_nodes:
             return
         
-        self.save_state()  # 히스토리 저장
-        
-        nodes_to_remove = list(self.selected_nodes)
-        for node in nodes_to_remove:
-            self.remove_node(node)
+        self.remove_nodes(list(self.selected_nodes))
     
     def select_node(self, node: Node3D, add_to_selection: bool = False):
         """노드 선택"""
         if not add_to_selection:
             self.clear_selection()
         
-        if node in self.selected_nodes:
-            self.selected_nodes.remove(node)
-            node.set_selected(False)
+        self.set_nodes_selected([node], node not in self.selected_nodes)
+    
+    def set_nodes_selected(self, nodes, selected: bool = True):
+        """
+        여러 노드의 선택 상태 변경 (실제로 바뀐 노드만 알림)
+        
+        Args:
+            nodes: 대상 노드들
+            selected: True 면 선택, False 면 해제
+        """
+        changed = [n for n in nodes if n.is_selected != selected]
+        for node in changed:
+            node.set_selected(selected)
+        if selected:
+            self.selected_nodes.update(changed)
+        else:
+            self.selected_nodes.difference_update(changed)
+        self.stats.selection_changed(changed, selected)
+        self._emit(SceneEventType.SELECTION_CHANGED, changed)
+    
+    def set_lines_selected(self, lines, selected: bool = True):
+        """여러 라인의 선택 상태 변경"""
+        changed = [l for l in lines if l.is_selected != selected]
+        for line in changed:
+            line.set_selected(selected)
+        if selected:
+            self.selected_lines.update(changed)
         else:
-            self.selected_nodes.add(node)
-            node.set_selected(True)
+            self.selected_lines.difference_update(changed)
+        self._emit(SceneEventType.SELECTION_CHANGED, changed, lines=True)
+    
+    def set_visibility(self, visible: bool, nodes=(), lines=()):
+        """
+        노드/라인 표시 상태 변경 (그룹/레이어 토글용)
+        
+        Args:
+            visible: 표시 여부
+            nodes: 대상 노드들
+            lines: 대상 라인들
+            
+        Returns:
+            (변경된 노드 수, 변경된 라인 수)
+        """
+        changed_nodes = [n for n in nodes if getattr(n, 'is_visible', True) != visible]
+        for node in changed_nodes:
+            node.is_visible = visible
+        changed_lines = [l for l in lines if getattr(l, 'is_visible', True) != visible]
+        for line in changed_lines:
+            line.is_visible = visible
+        self._emit(SceneEventType.VISIBILITY_CHANGED, changed_nodes)
+        self._emit(SceneEventType.VISIBILITY_CHANGED, changed_lines, lines=True)
+        return len(changed_nodes), len(changed_lines)
     
     def select_all_nodes(self):
         """모든 노드 선택"""
-        self.selected_nodes = set(self.nodes)
-        for node in self.nodes:
-            node.set_selected(True)
+        if self.mapped is not None:
+            self.mapped_selection = np.arange(self.mapped.node_count, dtype=np.int64)
+            self._emit(SceneEventType.SELECTION_CHANGED, [])
+            return
+        
+        self.set_nodes_selected(self.nodes, True)
     
     def clear_selection(self):
         """선택 해제"""
-        for node in self.selected_nodes:
-            node.set_selected(False)
-        for line in self.selected_lines:
-            line.set_selected(False)
-        
-        self.selected_nodes.clear()
-        self.selected_lines.clear()
+        self.mapped_selection = np.empty(0, dtype=np.int64)
+        self.events.hold()
+        try:
+            self.set_nodes_selected(list(self.selected_nodes), False)
+            self.set_lines_selected(list(self.selected_lines), False)
+        finally:
+            self.events.release()
     
     def select_nodes_in_region(self, min_coords: Tuple[float, float, float], 
                               max_coords: Tuple[float, float, float]):
         """특정 영역 내의 노드 선택"""
         self.clear_selection()
         
-        for node in self.nodes:
-            pos = node.position
-            if (min_coords[0] <= pos[0] <= max_coords[0] and
-                min_coords[1] <= pos[1] <= max_coords[1] and
-                min_coords[2] <= pos[2] <= max_coords[2]):
-                self.selected_nodes.add(node)
-                node.set_selected(True)
+        if self.mapped is not None:
+            self.mapped_selection = self.mapped.select_in_region(min_coords, max_coords)
+            self._emit(SceneEventType.SELECTION_CHANGED, [])
+            return
+        
+        inside = [node for node in self.nodes
+                  if (min_coords[0] <= node.position[0] <= max_coords[0] and
+                      min_coords[1] <= node.position[1] <= max_coords[1] and
+                      min_coords[2] <= node.position[2] <= max_coords[2])]
+        self.set_nodes_selected(inside, True)
     
-    def connect_selected_nodes(self, line_type: LineType) -> bool:
-        """선택된 노드들을 라인으로 연결"""
+    def select_issues(self, report: ValidationReport):
+        """검사에서 문제가 된 노드/라인만 선택 (읽기 전용 모드에서는 노드만)"""
+        self.clear_selection()
+        node_indices = report.node_indices()
+        if self.mapped is not None:
+            self.mapped_selection = node_indices
+            self._emit(SceneEventType.SELECTION_CHANGED, [])
+            return
+        
+        self.events.hold()
+        try:
+            self.set_nodes_selected([self.nodes[i] for i in node_indices.tolist()], True)
+            self.set_lines_selected([self.lines[i] for i in report.line_indices().tolist()], True)
+        finally:
+            self.events.release()
+    
+    def connect_selected_nodes(self, line_type: LineType, order: str = 'number') -> bool:
+        """
+        선택된 노드들을 라인으로 연결 (실행 취소 한 단계)
+        
+        Args:
+            line_type: 생성할 라인 타입
+            order: 연결 순서
+                'number'  - 노드 번호 순 폐곡선 (기본)
+                'nearest' - 최근접 이웃 체인
+                'mst'     - 최소 신장 트리
+                'path'    - 근사 최단 열린 경로
+                'loop'    - 근사 최단 닫힌 경로
+        """
+        self._check_writable()
         if len(self.selected_nodes) < 2:
             print("라인을 생성하려면 최소 2개의 노드를 선택해야 합니다.")
             return False
         
-        self.save_state()
-        
         # 노드 번호 순으로 정렬
         sorted_nodes = sorted(self.selected_nodes, 
                             key=lambda n: n.data_point.number)
         
-        # 순차적으로 연결
-        created_lines = []
-        for i in range(len(sorted_nodes) - 1):
-            line = self.add_line(sorted_nodes[i], sorted_nodes[i+1], line_type)
-            created_lines.append(line)
+        if order == 'number':
+            # 순차적으로 연결, 3개 이상이면 폐곡선
+            count = len(sorted_nodes)
+            edges = np.column_stack([np.arange(count - 1), np.arange(1, count)])
+            if count > 2:
+                edges = np.vstack([edges, [[count - 1, 0]]])
+        else:
+            points = np.array([n.position for n in sorted_nodes], dtype=np.float64)
+            edges = connection_edges(points, order)
         
-        # 폐곡선으로 만들기 (3개 이상일 때)
-        if len(sorted_nodes) > 2:
-            line = self.add_line(sorted_nodes[-1], sorted_nodes[0], line_type)
-            created_lines.append(line)
+        slots = self._slots_of(sorted_nodes)
+        with self.transaction("노드 연결"):
+            created_lines = self.add_lines_bulk(slots[edges[:, 0]], slots[edges[:, 1]], line_type)
         
         print(f"{len(created_lines)}개의 {line_type.value} 라인을 생성했습니다.")
         return True
     
-    def save_state(self):
-        """현재 상태를 히스토리에 저장"""
-        state = {
-            'nodes': [
-                {
-                    'data_point': node.data_point.to_dict(),
-                    'is_selected': node.is_selected
-                }
-                for node in self.nodes
-            ],
-            'lines': [
-                {
-                    'start_number': line.start_node.number,
-                    'end_number': line.end_node.number,
-                    'line_type': line.line_type.value
-                }
-                for line in self.lines
-            ]
-        }
-        
-        self.history.append(deepcopy(state))
-        
-        # 히스토리 크기 제한
-        if len(self.history) > self.max_history_size:
-            self.history.pop(0)
-    
     def undo(self) -> bool:
-        """마지막 작업 취소"""
-        if not self.history:
+        """마지막 작업 취소 (변경분만 되돌림)"""
+        self._check_writable()
+        if self.in_transaction:
+            print("⚠️ 트랜잭션 진행 중에는 실행 취소/다시 실행할 수 없습니다.")
+            return False
+        entry = self.history.pop_undo()
+        if entry is None:
             print("되돌릴 작업이 없습니다.")
             return False
         
-        state = self.history.pop()
-        self.clear()
-        
-        # 노드 복원
-        node_map = {}
-        for node_data in state['nodes']:
-            dp = DataPoint(**node_data['data_point'])
-            node = self.add_node(dp)
-            node_map[node.number] = node
-            
-            if node_data['is_selected']:
-                self.selected_nodes.add(node)
-                node.set_selected(True)
-        
-        # 라인 복원
-        for line_data in state['lines']:
-            start_node = node_map.get(line_data['start_number'])
-            end_node = node_map.get(line_data['end_number'])
-            
-            if start_node and end_node:
-                self.add_line(
-                    start_node, 
-                    end_node, 
-                    LineType(line_data['line_type'])
-                )
+        self._history_suspended = True
+        self.events.hold()
+        try:
+            entry.undo(self)
+        finally:
+            self._history_suspended = False
+            self.events.release()
+        self._maybe_compact()
         
         print("작업을 되돌렸습니다.")
         return True
     
+    def redo(self) -> bool:
+        """취소한 작업 다시 실행"""
+        self._check_writable()
+        if self.in_transaction:
+            print("⚠️ 트랜잭션 진행 중에는 실행 취소/다시 실행할 수 없습니다.")
+            return False
+        entry = self.history.pop_redo()
+        if entry is None:
+            print("다시 실행할 작업이 없습니다.")
+            return False
+        
+        self._history_suspended = True
+        self.events.hold()
+        try:
+            entry.redo(self)
+        finally:
+            self._history_suspended = False
+            self.events.release()
+        self._maybe_compact()
+        
+        print("작업을 다시 실행했습니다.")
+        return True
+    
+    def node_positions(self) -> np.ndarray:
+        """
+        전체 노드 좌표 배열 (N, 3)
+        
+        geometry 버전에 묶여 캐시되므로 좌표/구조가 바뀌지 않았으면 다시 만들지 않습니다.
+        반환된 배열은 수정하지 마세요.
+        """
+        return self.stats.cached(
+            'positions', ('geometry',),
+            lambda: np.array([n.position for n in self.nodes], dtype=np.float64).reshape(-1, 3))
+    
+    def spatial_index(self):
+        """
+        전체 노드 좌표 KD-트리 (scipy cKDTree, 인덱스는 self.nodes 기준)
+        
+        geometry 버전에 묶여 캐시되므로 좌표/구조가 바뀐 뒤 첫 조회 때만 다시 만듭니다.
+        """
+        return self.stats.cached('kdtree', ('geometry',),
+                                 lambda: build_kdtree(self.node_positions()))
+    
+    def line_endpoints(self) -> np.ndarray:
+        """
+        전체 라인 끝 노드 인덱스 (L, 2) - 씬에 없는 노드는 -1
+        
+        structure 버전에 묶여 캐시됩니다. 반환된 배열은 수정하지 마세요.
+        """
+        return self.stats.cached(
+            'line_endpoints', ('structure',),
+            lambda: np.column_stack([self._slots_of([l.start_node for l in self.lines]),
+                                     self._slots_of([l.end_node for l in self.lines])]))
+    
+    def line_codes(self) -> np.ndarray:
+        """전체 라인 타입 코드 (L,) int64 - structure 버전에 묶여 캐시"""
+        return self.stats.cached(
+            'line_codes', ('structure',),
+            lambda: np.fromiter((line_type_to_code(l.line_type) for l in self.lines),
+                                dtype=np.int64, count=len(self.lines)))
+    
+    def edge_index(self) -> np.ndarray:
+        """
+        기존 라인의 정렬된 키 배열 (_edge_keys, 노드 인덱스는 self.nodes 기준)
+        
+        structure 버전에 묶여 캐시되므로 라인/노드 추가·삭제 뒤 첫 조회 때만 다시 만듭니다.
+        """
+        def build():
+            starts, ends = self.line_endpoints().T
+            codes = self.line_codes()
+            ok = (starts >= 0) & (ends >= 0)
+            return np.sort(_edge_keys(starts[ok], ends[ok], codes[ok]))
+        return self.stats.cached('edge_keys', ('structure',), build)
+    
+    def new_edge_mask(self, start_indices: np.ndarray, end_indices: np.ndarray,
+                      codes) -> np.ndarray:
+        """
+        추가할 라인 후보 중 새로 만들 것만 True 인 마스크
+        
+        길이 0 라인, 후보끼리의 중복(방향 무시), 같은 타입으로 이미 있는 라인을 뺍니다.
+        
+        Args:
+            start_indices, end_indices: 노드 인덱스 배열 (새로 추가할 노드 인덱스 포함 가능)
+            codes: 라인 타입 코드 하나 또는 배열
+        """
+        start_indices = np.asarray(start_indices, dtype=np.int64)
+        end_indices = np.asarray(end_indices, dtype=np.int64)
+        codes = np.broadcast_to(np.asarray(codes, dtype=np.int64), start_indices.shape)
+        keys = _edge_keys(start_indices, end_indices, codes)
+        mask = start_indices != end_indices
+        
+        _, first = np.unique(keys, return_index=True)
+        unique = np.zeros(len(keys), dtype=bool)
+        unique[first] = True
+        mask &= unique
+        
+        existing = self.edge_index()
+        if len(existing):
+            pos = np.minimum(np.searchsorted(existing, keys), len(existing) - 1)
+            mask &= existing[pos] != keys
+        return mask
+    
+    def _sync_stats(self):
+        """집계가 실제 상태와 어긋났으면 (외부에서 직접 수정한 경우) 다시 만듦"""
+        stats = self.stats
+        if (stats.node_count != len(self.nodes) or
+                stats.selected_count != len(self.selected_nodes)):
+            stats.reset(np.array([n.position for n in self.nodes], dtype=np.float64),
+                        list(self.selected_nodes))
+    
     def get_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
-        """씬의 경계 좌표 반환"""
-        if not self.nodes:
+        """씬의 경계 좌표 반환 (증분 유지, 필요할 때만 다시 계산)"""
+        if self.mapped is not None and self.mapped.node_count:
+            # 헤더에 저장된 경계 사용 (데이터 페이지를 읽지 않음)
+            min_bounds = self.mapped.bounds_min.copy()
+            max_bounds = self.mapped.bounds_max.copy()
+        elif not self.nodes:
             return np.array([0, 0, 0]), np.array([1, 1, 1])
-        
-        positions = np.array([node.position for node in self.nodes])
-        min_bounds = np.min(positions, axis=0)
-        max_bounds = np.max(positions, axis=0)
+        else:
+            self._sync_stats()
+            min_bounds, max_bounds = self.stats.bounds(self.node_positions)
         
         # 최소 크기 보장
         size = max_bounds - min_bounds
@@ -225,14 +900,37 @@ class Scene3D:
     
     def get_center(self) -> np.ndarray:
         """씬의 중심점 반환"""
+        if self.mapped is not None and self.mapped.node_count:
+            return self.mapped.center.copy()
+        
         if not self.nodes:
             return np.array([0, 0, 0])
         
-        positions = np.array([node.position for node in self.nodes])
-        return np.mean(positions, axis=0)
+        self._sync_stats()
+        return self.stats.center()
+    
+    @property
+    def selected_count(self) -> int:
+        """선택된 노드 수 (읽기 전용 모드 포함, O(1))"""
+        if self.mapped is not None:
+            return len(self.mapped_selection)
+        return len(self.selected_nodes)
     
     def get_selected_info(self) -> dict:
         """선택된 노드들의 정보 반환"""
+        if self.mapped is not None and len(self.mapped_selection):
+            indices = self.mapped_selection
+            avg_position = self.mapped.positions[indices].mean(axis=0)
+            return {
+                'count': len(indices),
+                'numbers': np.sort(self.mapped.numbers[indices]).tolist(),
+                'average_position': {
+                    'x': float(avg_position[0]),
+                    'y': float(avg_position[1]),
+                    'z': float(avg_position[2])
+                }
+            }
+        
         if not self.selected_nodes:
             return {
                 'count': 0,
@@ -240,12 +938,13 @@ class Scene3D:
                 'average_position': {'x': 0, 'y': 0, 'z': 0}
             }
         
-        positions = [n.position for n in self.selected_nodes]
-        avg_position = np.mean(positions, axis=0)
+        # 선택 변경 시 증분 유지되는 집계 사용
+        self._sync_stats()
+        avg_position = self.stats.selected_average()
         
         return {
-            'count': len(self.selected_nodes),
-            'numbers': sorted([n.number for n in self.selected_nodes]),
+            'count': self.stats.selected_count,
+            'numbers': self.stats.selected_numbers,
             'average_position': {
                 'x': float(avg_position[0]),
                 'y': float(avg_position[1]),
@@ -253,6 +952,244 @@ class Scene3D:
             }
         }
 
+    
+    def get_render_arrays(self, region: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+                          max_points: Optional[int] = None,
+                          max_segments: Optional[int] = None,
+                          chunk_size: int = 1_000_000) -> dict:
+        """
+        렌더링용 배열 준비
+        
+        Args:
+            region: (min, max) 좌표 - 이 영역 안의 노드/라인만 반환
+            max_points: 반환할 최대 노드 수 (초과 시 균등 간격으로 솎아냄)
+            max_segments: 읽기 전용 모드에서 다룰 최대 라인 수 (초과 시 균등 간격으로 솎아냄)
+            chunk_size: memmap 모델을 스캔하는 청크 크기
+            
+        Returns:
+            {'positions', 'colors', 'segments', 'segment_types'} 딕셔너리
+            segments 는 (2M, 3) 배열로 GLLinePlotItem(mode='lines') 에 바로 사용 가능
+        """
+        if self.mapped is None:
+            visible = [n for n in self.nodes if getattr(n, 'is_visible', True)]
+            positions = np.array([n.position for n in visible]).reshape(-1, 3)
+            colors = np.array([n.color for n in visible]).reshape(-1, 4)
+            lines = [l for l in self.lines if getattr(l, 'is_visible', True)]
+            segments = np.array([(l.start_pos, l.end_pos) for l in lines]).reshape(-1, 3)
+            segment_types = np.array([line_type_to_code(l.line_type) for l in lines],
+                                     dtype=np.uint8)
+            if region is not None:
+                lo, hi = np.asarray(region[0]), np.asarray(region[1])
+                inside = np.all((positions >= lo) & (positions <= hi), axis=1)
+                positions, colors = positions[inside], colors[inside]
+            return {'positions': positions, 'colors': colors,
+                    'segments': segments, 'segment_types': segment_types}
+        
+        model = self.mapped
+        lo = hi = None
+        if region is not None:
+            lo, hi = np.asarray(region[0]), np.asarray(region[1])
+        
+        # 노드: 청크 단위로 영역 필터 + 솎아내기
+        stride = 1
+        if max_points and model.node_count > max_points:
+            stride = int(np.ceil(model.node_count / max_points))
+        blocks, block_indices = [], []
+        for start, stop in model.iter_chunks(chunk_size):
+            first = start + (-start) % stride
+            block = np.asarray(model.positions[first:stop:stride])
+            indices = np.arange(first, stop, stride)
+            if lo is not None:
+                inside = np.all((block >= lo) & (block <= hi), axis=1)
+                block, indices = block[inside], indices[inside]
+            blocks.append(block)
+            block_indices.append(indices)
+        positions = np.concatenate(blocks) if blocks else np.empty((0, 3))
+        indices = (np.concatenate(block_indices) if block_indices
+                   else np.empty(0, dtype=np.int64))
+        colors = np.ones((len(positions), 4))
+        if len(self.mapped_selection):
+            colors[np.isin(indices, self.mapped_selection), :3] = (1.0, 1.0, 0.0)
+        
+        # 라인: 예산 안에서 솎아낸 끝점 배열을 모델당 한 번만 만들고 재사용
+        a, b, segment_types = self._mapped_segment_arrays(max_segments, chunk_size)
+        if lo is not None:
+            keep = (np.all((a >= lo) & (a <= hi), axis=1) |
+                    np.all((b >= lo) & (b <= hi), axis=1))
+            a, b, segment_types = a[keep], b[keep], segment_types[keep]
+        segments = np.empty((len(a) * 2, 3), dtype=a.dtype)
+        segments[0::2] = a
+        segments[1::2] = b
+        
+        return {'positions': positions, 'colors': colors,
+                'segments': segments, 'segment_types': segment_types}
+    
+    def _mapped_segment_arrays(self, max_segments: Optional[int],
+                               chunk_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        읽기 전용 모델의 라인 끝점 배열 (예산 단위 캐시)
+        
+        memmap 모델은 바뀌지 않으므로 같은 모델/예산이면 이전 결과를 재사용합니다.
+        라인 수가 max_segments 를 넘으면 청크마다 같은 간격으로 솎아낸 라인만 모읍니다.
+        
+        Returns:
+            (시작점 (K, 3), 끝점 (K, 3), 라인 타입 코드 (K,))
+        """
+        model = self.mapped
+        key = (id(model), max_segments, chunk_size)
+        if self._mapped_segments is not None and self._mapped_segments[0] == key:
+            return self._mapped_segments[1]
+        
+        stride = 1
+        if max_segments and model.edge_count > max_segments:
+            stride = int(np.ceil(model.edge_count / max_segments))
+        a_blocks, b_blocks, type_blocks = [], [], []
+        for start in range(0, model.edge_count, chunk_size):
+            stop = min(start + chunk_size, model.edge_count)
+            first = start + (-start) % stride
+            edges = np.asarray(model.edges[first:stop:stride])
+            a_blocks.append(np.asarray(model.positions[edges[:, 0]]))
+            b_blocks.append(np.asarray(model.positions[edges[:, 1]]))
+            type_blocks.append(np.asarray(model.edge_types[first:stop:stride]))
+        if a_blocks:
+            arrays = (np.concatenate(a_blocks), np.concatenate(b_blocks),
+                      np.concatenate(type_blocks))
+        else:
+            arrays = (np.empty((0, 3)), np.empty((0, 3)), np.empty(0, dtype=np.uint8))
+        self._mapped_segments = (key, arrays)
+        return arrays
+    
+    def validate(self, tolerance: float = 1e-6) -> ValidationReport:
+        """
+        모델 검사 (중복 번호, 겹친 노드, 연결 없는 노드, 끝 노드 없는/길이 0/중복 라인)
+        
+        인덱스는 self.nodes / self.lines 기준이며, 읽기 전용 모드에서는 매핑된 배열을 바로 검사합니다.
+        
+        Args:
+            tolerance: 겹친 노드 / 길이 0 판정 거리
+        """
+        if self.mapped is not None:
+            model = self.mapped
+            return validate_arrays(model.numbers, model.positions, model.edges, tolerance)
+        
+        numbers = np.fromiter((n.number for n in self.nodes), dtype=np.int64,
+                              count=len(self.nodes))
+        return validate_arrays(numbers, self.node_positions(), self.line_endpoints(), tolerance)
+    
+    def to_arrays(self) -> dict:
+        """
+        현재 씬을 열 배열로 변환
+        
+        Returns:
+            {'numbers', 'positions', 'group_ids', 'edges', 'edge_types', 'element_ids'} 딕셔너리
+            edges 는 노드 배열 인덱스 (M, 2), element_ids 는 원본 요소 번호 (0 = 없음)
+        """
+        node_index = {id(node): i for i, node in enumerate(self.nodes)}
+        numbers = np.fromiter((n.number for n in self.nodes), dtype=np.int64,
+                              count=len(self.nodes))
+        positions = np.array([n.position for n in self.nodes],
+                             dtype=np.float64).reshape(-1, 3)
+        group_ids = np.fromiter((getattr(n, 'group_id', 0) for n in self.nodes),
+                                dtype=np.int32, count=len(self.nodes))
+        lines = [l for l in self.lines
+                 if id(l.start_node) in node_index and id(l.end_node) in node_index]
+        edges = np.array([(node_index[id(l.start_node)], node_index[id(l.end_node)])
+                          for l in lines], dtype=np.int64).reshape(-1, 2)
+        edge_types = np.array([line_type_to_code(l.line_type) for l in lines],
+                              dtype=np.uint8)
+        element_ids = np.fromiter((l.element_id or 0 for l in lines), dtype=np.int64,
+                                  count=len(lines))
+        return {'numbers': numbers, 'positions': positions, 'group_ids': group_ids,
+                'edges': edges, 'edge_types': edge_types, 'element_ids': element_ids}
+    
+    def load_arrays(self, numbers: np.ndarray, positions: np.ndarray, group_ids: np.ndarray,
+                    edges: np.ndarray, edge_types: np.ndarray,
+                    element_ids: Optional[np.ndarray] = None):
+        """
+        to_arrays 형식의 배열로 씬 내용 교체
+        
+        Args:
+            numbers: 노드 번호 (N,)
+            positions: 노드 좌표 (N, 3)
+            group_ids: 노드 그룹 ID (N,)
+            edges: 라인 양 끝 노드 인덱스 (M, 2)
+            edge_types: 라인 타입 코드 (M,)
+            element_ids: 라인별 원본 요소 번호 (M,) - 0 은 번호 없음
+        """
+        self.clear()
+        self.add_nodes_bulk(numbers, positions, group_ids)
+        
+        edges = np.asarray(edges).reshape(-1, 2)
+        type_table = np.array(LINE_TYPE_ORDER, dtype=object)
+        lines = self.add_lines_bulk(edges[:, 0], edges[:, 1], type_table[np.asarray(edge_types)])
+        if element_ids is not None:
+            for line, element_id in zip(lines, np.asarray(element_ids).tolist()):
+                if element_id:
+                    line.element_id = element_id
+    
+    def replay_journal(self, journal: SceneJournal) -> int:
+        """
+        마지막 체크포인트 위에 저널 기록을 재생해 씬 복구 (재생 중에는 기록하지 않음)
+        
+        Returns:
+            재생한 레코드 수
+        """
+        attached, self.journal = self.journal, None
+        self._history_suspended = True
+        try:
+            generation, arrays = journal.load_checkpoint()
+            if arrays is not None:
+                self.load_arrays(**arrays)
+            else:
+                self.clear()
+            
+            count = 0
+            for op, values in journal.iter_records(generation):
+                self._apply_record(op, values)
+                count += 1
+            return count
+        finally:
+            self.journal = attached
+            self._history_suspended = False
+            self.history.clear()
+    
+    def _apply_record(self, op: int, values: tuple):
+        """저널 레코드 하나를 씬에 적용"""
+        if op == OP_CLEAR:
+            self.clear()
+        elif op == OP_ADD_NODES:
+            self.add_nodes_bulk(*values)
+        elif op == OP_ADD_LINES:
+            starts, ends, codes = values
+            idx1 = self.lookup_node_indices(starts)
+            idx2 = self.lookup_node_indices(ends)
+            ok = (idx1 >= 0) & (idx2 >= 0)
+            type_table = np.array(LINE_TYPE_ORDER, dtype=object)
+            self.add_lines_bulk(idx1[ok], idx2[ok], type_table[codes[ok]])
+        elif op == OP_REMOVE_LINES:
+            # (시작 번호, 끝 번호, 타입) 이 같은 라인을 기록된 개수만큼 제거
+            pending = {}
+            for key in zip(*(v.tolist() for v in values)):
+                pending[key] = pending.get(key, 0) + 1
+            targets = []
+            for line in self.lines:
+                key = (line.start_node.number, line.end_node.number,
+                       line_type_to_code(line.line_type))
+                if pending.get(key):
+                    pending[key] -= 1
+                    targets.append(line)
+            self._delete_lines(targets)
+        else:
+            indices = self.lookup_node_indices(values[0])
+            nodes = [self.nodes[i] for i in indices.tolist() if i >= 0]
+            ok = indices >= 0
+            if op == OP_REMOVE_NODES:
+                self.remove_nodes(nodes)
+            elif op == OP_MOVE_NODES:
+                self.set_node_positions(nodes, values[1][ok])
+            elif op == OP_SET_GROUPS:
+                self.set_node_groups(nodes, values[1][ok])
+
 
 class NodeEditor3D:
     """3D 노드 에디터 메인 클래스"""
@@ -262,48 +1199,205 @@ class NodeEditor3D:
         self.csv_handler = CSVHandler()
         self.camera_view = CameraView.ISO
         self.total_node_count = 0     # ✨ 추가
-        self.group_size = 0           # ✨ 추가
+        self.last_element_failures = None  # 마지막 Elements 로드의 실패 요약
+        self.import_cache = ImportCache()  # CSV/MIDAS 파싱 결과 캐시
+        self.node_manager = NodeNumberAllocator()  # 새 노드 번호 할당
+        self.node_manager.attach(self.scene)
         
+    def open_read_only(self, filepath: str) -> bool:
+        """.ne3d 바이너리 모델을 읽기 전용 모드로 열기"""
+        try:
+            self.scene.open_read_only(filepath)
+            print(f"🔒 읽기 전용 모드: 노드 {self.scene.node_count}개, "
+                  f"라인 {self.scene.line_count}개 ({filepath})")
+            return True
+        except Exception as e:
+            print(f"바이너리 모델 열기 실패: {str(e)}")
+            return False
+    
+    def save_binary(self, filepath: str) -> bool:
+        """현재 씬을 .ne3d 바이너리 모델로 저장 (읽기 전용 보기용)"""
+        try:
+            arrays = self.scene.to_arrays()
+            write_binary_model(filepath, **arrays)
+            print(f"바이너리 모델을 저장했습니다: {filepath}")
+            return True
+        except Exception as e:
+            print(f"바이너리 모델 저장 실패: {str(e)}")
+            return False
+    
+    def save_mgt(self, filepath: str) -> bool:
+        """
+        현재 씬을 MIDAS MGT 파일로 내보내기
+        
+        절점 번호는 그대로, 요소 번호는 불러올 때의 번호를 유지하고
+        번호가 없거나 중복된 라인에는 최대 번호 다음부터 새 번호를 붙입니다.
+        면/솔리드 요소의 외곽 변(PANER 라인)은 요소가 아니므로 건너뛰고 개수를 알립니다.
+        """
+        try:
+            # LineType 코드 → ELEMENT_TYPES 코드 (내보내지 않는 타입은 제외 표시)
+            exportable = np.array([t in LINE_TYPE_ELEMENT_TYPES for t in LINE_TYPE_ORDER])
+            element_codes = np.array([ELEMENT_TYPES.index(LINE_TYPE_ELEMENT_TYPES.get(t, 'BEAM'))
+                                      for t in LINE_TYPE_ORDER], dtype=np.uint8)
+            
+            if self.scene.read_only:
+                model = self.scene.mapped
+                numbers, positions = model.numbers, model.positions
+                edges, edge_types = model.edges, model.edge_types
+                element_ids = np.asarray(model.element_ids)
+            else:
+                arrays = self.scene.to_arrays()
+                numbers, positions = arrays['numbers'], arrays['positions']
+                edges, edge_types = arrays['edges'], arrays['edge_types']
+                element_ids = arrays['element_ids']
+            
+            # 요소가 아닌 라인 (면 요소 외곽 변) 제외
+            keep_lines = exportable[np.asarray(edge_types)]
+            skipped = int((~keep_lines).sum())
+            if skipped:
+                edges = np.asarray(edges)[keep_lines]
+                edge_types = np.asarray(edge_types)[keep_lines]
+                element_ids = element_ids[keep_lines]
+            
+            # 번호 없음/중복 요소에 새 번호
+            _, first = np.unique(element_ids, return_index=True)
+            keep = np.zeros(len(element_ids), dtype=bool)
+            keep[first] = True
+            keep &= element_ids > 0
+            next_id = int(element_ids.max(initial=0)) + 1
+            element_ids = element_ids.copy()
+            element_ids[~keep] = np.arange(next_id, next_id + int((~keep).sum()))
+            
+            write_mgt(filepath, numbers, positions,
+                      numbers[edges[:, 0]], numbers[edges[:, 1]],
+                      element_codes[edge_types], element_ids)
+            print(f"MGT 파일로 내보냈습니다: 절점 {len(numbers)}개, 요소 {len(edges)}개 ({filepath})")
+            if skipped:
+                print(f"⚠️ 면 요소 외곽선(PANER) 라인 {skipped}개는 요소가 아니므로 내보내지 않았습니다")
+            return True
+        except Exception as e:
+            print(f"MGT 내보내기 실패: {str(e)}")
+            return False
+    
     def new_scene(self):
         """새 씬 생성"""
         self.scene.clear()
         self.scene.history.clear()
         print("새 씬을 생성했습니다.")
     
-    def load_csv(self, filepath: str) -> bool:
-            """CSV 파일 로드 - 그룹 자동 분할 추가"""
+    def enable_journal(self, directory: str = DEFAULT_JOURNAL_DIR) -> bool:
+        """
+        작업 저널 켜기 - 이전 세션이 비정상 종료되었으면 먼저 복구
+        
+        Args:
+            directory: 저널 루트 (실행마다 잠긴 세션 하위 디렉터리를 만듦)
+            
+        Returns:
+            복구 여부
+        """
+        # 다른 실행 중인 편집기의 세션은 잠겨 있으므로 끝난 세션만 복구 대상
+        orphan = SceneJournal.find_orphaned(directory)
+        recovered = False
+        if orphan is not None:
+            count = self.scene.replay_journal(orphan)
+            recovered = bool(self.scene.nodes)
+            print(f"🩹 저널 복구: 기록 {count}개 재생, "
+                  f"노드 {len(self.scene.nodes)}개, 라인 {len(self.scene.lines)}개")
+        journal = SceneJournal.new_session(directory)
+        journal.open()
+        self.scene.journal = journal
+        if orphan is not None:
+            if recovered:
+                # 복구된 상태를 이 세션의 체크포인트로 옮긴 뒤 이전 세션 삭제
+                journal.start_compaction(self.scene.to_arrays())
+                journal.wait_compaction()
+            orphan.close(discard=True)
+        return recovered
+    
+    def sync_journal(self):
+        """버퍼에 남은 저널 기록을 디스크에 기록"""
+        if self.scene.journal is not None:
+            self.scene.journal.sync()
+    
+    def compact_journal(self):
+        """현재 씬으로 저널 체크포인트를 백그라운드에서 새로 만듦"""
+        if self.scene.journal is not None:
+            self.scene.journal.start_compaction(self.scene.to_arrays())
+    
+    def close_journal(self, discard: bool = True):
+        """
+        저널 닫기
+        
+        Args:
+            discard: 정상 종료이면 True - 다음 시작 때 복구하지 않도록 파일 삭제
+        """
+        if self.scene.journal is not None:
+            self.scene.journal.close(discard=discard)
+            self.scene.journal = None
+    
+    def _load_from_cache(self, filepath: str, kind: str, use_cache: bool) -> bool:
+        """캐시에 파싱 결과가 있으면 씬에 올리고 True 반환"""
+        if not use_cache:
+            return False
+        try:
+            model = self.import_cache.get(filepath, kind)
+        except OSError as e:
+            print(f"⚠️ 캐시 조회 실패: {e}")
+            return False
+        if model is None:
+            return False
+        try:
+            with self.scene.loading():
+                self.scene.load_arrays(model.numbers, model.positions, model.group_ids,
+                                       model.edges, model.edge_types, model.element_ids)
+        finally:
+            model.close()
+        print(f"⚡ 캐시에서 로드: 노드 {len(self.scene.nodes)}개, 라인 {len(self.scene.lines)}개")
+        return True
+    
+    def _store_in_cache(self, filepath: str, kind: str, use_cache: bool):
+        """현재 씬을 원본 파일의 파싱 결과로 캐시에 저장 (실패해도 로드는 유지)"""
+        if not use_cache:
+            return
+        try:
+            self.import_cache.put(filepath, kind, **self.scene.to_arrays())
+        except Exception as e:
+            print(f"⚠️ 캐시 저장 실패: {e}")
+    
+    def clear_import_cache(self) -> int:
+        """가져오기 캐시 전체 삭제"""
+        removed = self.import_cache.clear()
+        print(f"🧹 가져오기 캐시 {removed}개 항목을 삭제했습니다.")
+        return removed
+    
+    def load_csv(self, filepath: str, use_cache: bool = True) -> bool:
+            """
+            CSV 파일 로드 - 그룹 자동 분할 추가
+            
+            같은 파일을 다시 열면 가져오기 캐시에서 바로 읽습니다 (use_cache=False 로 우회).
+            """
             try:
+                if self._load_from_cache(filepath, 'csv', use_cache):
+                    self.total_node_count = len(self.scene.nodes)
+                    return True
+                
                 data_points = self.csv_handler.load_csv(filepath)
                 
-                # ✨ 총 노드 수 및 그룹 크기 계산 ✨
+                # ✨ 총 노드 수 ✨
                 self.total_node_count = len(data_points)
-                self.group_size = max(1, self.total_node_count // 4)  # 최소 1개씩
-                
                 print(f"📊 총 노드 수: {self.total_node_count}")
-                print(f"📦 그룹 크기: {self.group_size} (그룹당)")
-                
-                # 기존 씬 초기화
-                self.scene.clear()
                 
-                # ✨ 새 노드 추가 + 그룹 ID 할당 ✨
-                for index, dp in enumerate(data_points):
-                    # 그룹 ID 계산 (0, 1, 2, 3)
-                    group_id = min(3, index // self.group_size)
-                    
-                    # 노드 추가
-                    node = self.scene.add_node(dp)
-                    
-                    # 그룹 ID 할당 (Node3D 객체에 추가해야 함)
-                    if hasattr(node, 'group_id'):
-                        node.group_id = group_id
-                    
-                print(f"✅ 그룹 분할 완료:")
-                print(f"   Group 1: 1 ~ {self.group_size}")
-                print(f"   Group 2: {self.group_size + 1} ~ {self.group_size * 2}")
-                print(f"   Group 3: {self.group_size * 2 + 1} ~ {self.group_size * 3}")
-                print(f"   Group 4: {self.group_size * 3 + 1} ~ {self.total_node_count}")
+                # 기존 씬을 새 노드로 교체 - 아직 라인이 없으므로 모두 Group 1,
+                # Elements 를 불러오면 연결 성분으로 다시 나눔 (group_by_connectivity)
+                with self.scene.loading():
+                    self.scene.clear()
+                    self.scene.add_nodes_bulk(
+                        [dp.number for dp in data_points],
+                        [(dp.x, dp.y, dp.z) for dp in data_points]
+                    )
                 
                 print(f"{len(data_points)}개의 노드를 로드했습니다.")
+                self._store_in_cache(filepath, 'csv', use_cache)
                 return True
         
             except Exception as e:
@@ -312,6 +1406,21 @@ class NodeEditor3D:
     
     def save_csv(self, filepath: str, include_lines: bool = False) -> bool:
         """현재 씬을 CSV로 저장"""
+        if self.scene.read_only:
+            # memmap 배열에서 바로 스트리밍
+            model = self.scene.mapped
+            if not include_lines:
+                return self.csv_handler.save_csv_arrays(filepath, model.numbers, model.positions)
+            selected = np.zeros(model.node_count, dtype=bool)
+            selected[self.scene.mapped_selection] = True
+            type_values = np.array([code_to_line_type(c).value for c in range(len(LINE_TYPE_ORDER))],
+                                   dtype=object)
+            return self.csv_handler.save_with_lines_arrays(
+                filepath, model.numbers, model.positions, selected,
+                model.numbers[model.edges[:, 0]], model.numbers[model.edges[:, 1]],
+                type_values[model.edge_types]
+            )
+        
         if include_lines:
             return self.csv_handler.save_with_lines(
                 filepath, self.scene.nodes, self.scene.lines
@@ -323,9 +1432,7 @@ class NodeEditor3D:
                             number: Optional[int] = None) -> Node3D:
         """특정 위치에 노드 추가"""
         if number is None:
-            # 자동으로 번호 할당
-            existing_numbers = [n.number for n in self.scene.nodes]
-            number = max(existing_numbers) + 1 if existing_numbers else 1
+            number = self.node_manager.next_number()
         
         data_point = DataPoint(number=number, x=x, y=y, z=z)
         node = self.scene.add_node(data_point)
@@ -335,26 +1442,459 @@ class NodeEditor3D:
     
     def move_selected_nodes(self, delta_x: float, delta_y: float, delta_z: float):
         """선택된 노드들 이동"""
+        if self.transform_selected(translation_matrix((delta_x, delta_y, delta_z))):
+            print(f"{len(self.scene.selected_nodes)}개의 노드를 이동했습니다.")
+    
+    def resolve_pivot(self, pivot='centroid') -> np.ndarray:
+        """
+        변환 기준점 좌표
+        
+        Args:
+            pivot: 'centroid'(선택 중심), 'origin'(원점), 노드 번호(int) 또는 좌표 (x, y, z)
+        """
+        if isinstance(pivot, str):
+            if pivot == 'centroid':
+                if not self.scene.selected_nodes:
+                    return np.zeros(3)
+                self.scene._sync_stats()
+                return self.scene.stats.selected_average()
+            if pivot == 'origin':
+                return np.zeros(3)
+            raise ValueError(f"알 수 없는 기준점입니다: {pivot}")
+        if np.isscalar(pivot):
+            node = self.scene.get_node_by_number(int(pivot))
+            if node is None:
+                raise ValueError(f"기준 노드 {pivot}을(를) 찾을 수 없습니다.")
+            return np.array(node.position, dtype=np.float64)
+        return np.asarray(pivot, dtype=np.float64).reshape(3)
+    
+    def transform_selected(self, matrix: np.ndarray, pivot='origin') -> bool:
+        """
+        선택된 노드에 아핀 변환 적용 (실행 취소 한 단계)
+        
+        Args:
+            matrix: 원점 기준 4x4 변환 행렬
+            pivot: 변환 기준점 (resolve_pivot 참고)
+            
+        Returns:
+            변환 여부 (선택된 노드가 없으면 False)
+        """
         if not self.scene.selected_nodes:
-            return
+            print("선택된 노드가 없습니다.")
+            return False
+        self.scene._check_writable()
+        if not (isinstance(pivot, str) and pivot == 'origin'):
+            matrix = about_pivot(matrix, self.resolve_pivot(pivot))
+        self.scene.transform_nodes(list(self.scene.selected_nodes), matrix)
+        return True
+    
+    def rotate_selected(self, axis, angle_deg: float, pivot='centroid') -> bool:
+        """선택된 노드 회전 (axis: 'x'/'y'/'z' 또는 벡터, 각도는 도)"""
+        if self.transform_selected(rotation_matrix(axis, angle_deg), pivot):
+            print(f"{len(self.scene.selected_nodes)}개의 노드를 {angle_deg}° 회전했습니다.")
+            return True
+        return False
+    
+    def scale_selected(self, factors, pivot='centroid') -> bool:
+        """선택된 노드 크기 변경 (균일 배율 또는 (sx, sy, sz))"""
+        if self.transform_selected(scale_matrix(factors), pivot):
+            print(f"{len(self.scene.selected_nodes)}개의 노드 크기를 변경했습니다.")
+            return True
+        return False
+    
+    def mirror_selected(self, normal, pivot='centroid') -> bool:
+        """선택된 노드 대칭 (normal: 대칭 평면 법선 'x'/'y'/'z' 또는 벡터)"""
+        if self.transform_selected(mirror_matrix(normal), pivot):
+            print(f"{len(self.scene.selected_nodes)}개의 노드를 대칭 이동했습니다.")
+            return True
+        return False
+        
+    def array_copy_selected(self, transforms: np.ndarray,
+                            weld_tolerance: Optional[float] = None) -> List[Node3D]:
+        """
+        선택된 노드와 그 사이 라인을 변환 행렬마다 복사 (실행 취소 한 단계)
+        
+        Args:
+            transforms: 복사본별 4x4 변환 행렬 (m, 4, 4) - array_copy 모듈 참고
+            weld_tolerance: 지정하면 이 거리 이내의 기존 노드/다른 복사본 노드와 합침
+            
+        Returns:
+            새로 만든 노드 리스트
+        """
+        scene = self.scene
+        if not scene.selected_nodes:
+            print("선택된 노드가 없습니다.")
+            return []
+        if len(transforms) == 0:
+            return []
+        scene._check_writable()
+        
+        nodes = sorted(scene.selected_nodes, key=lambda n: n.number)
+        edges, types = internal_edges({id(n): i for i, n in enumerate(nodes)}, scene.lines)
+        positions = np.array([n.position for n in nodes], dtype=np.float64)
+        group_ids = np.fromiter((getattr(n, 'group_id', 0) for n in nodes), dtype=np.int32,
+                                count=len(nodes))
+        copies = len(transforms)
+        new_positions, new_edges = copy_blocks(positions, edges, transforms)
+        new_groups = np.tile(group_ids, copies)
+        new_types = np.array(types * copies, dtype=object)
+        count = len(new_positions)
+        existing = len(scene.nodes)
+        
+        # 용접: 기존 노드에 붙는 점, 복사본끼리 겹치는 점 묶기
+        if weld_tolerance:
+            target = match_points(scene.spatial_index(), new_positions, weld_tolerance)
+            rep = merge_coincident(new_positions, weld_tolerance)
+            # 묶음 중 하나라도 기존 노드에 붙으면 묶음 전체를 그 노드로
+            group_target = np.full(count, -1, dtype=np.int64)
+            np.maximum.at(group_target, rep, target)
+            target = group_target[rep]
+        else:
+            target = np.full(count, -1, dtype=np.int64)
+            rep = np.arange(count, dtype=np.int64)
         
-        self.scene.save_state()
+        keep = (target < 0) & (rep == np.arange(count))
+        kept = np.flatnonzero(keep)
+        final = np.zeros(count, dtype=np.int64)
+        final[kept] = existing + np.arange(len(kept))
+        final = np.where(target >= 0, target, final[rep])
         
-        for node in self.scene.selected_nodes:
-            new_pos = node.position + np.array([delta_x, delta_y, delta_z])
-            node.update_position(new_pos[0], new_pos[1], new_pos[2])
+        # 라인: 새 인덱스로 옮긴 뒤 길이 0 / 중복 / 기존과 같은 라인 제거
+        mapped = final[new_edges]
+        codes = np.array([line_type_to_code(t) for t in new_types], dtype=np.int64)
+        valid = scene.new_edge_mask(mapped[:, 0], mapped[:, 1], codes)
         
-        print(f"{len(self.scene.selected_nodes)}개의 노드를 이동했습니다.")
+        with scene.transaction("배열 복사"):
+            new_nodes = scene.add_nodes_bulk(self.node_manager.reserve(len(kept)),
+                                             new_positions[kept], new_groups[kept])
+            lines = scene.add_lines_bulk(mapped[valid, 0], mapped[valid, 1], new_types[valid])
         
-    def load_mgb(self, filepath: str) -> bool:
+        print(f"🔁 배열 복사: 복사본 {copies}개, 새 노드 {len(new_nodes)}개, "
+              f"라인 {len(lines)}개 (합친 노드 {count - len(kept)}개)")
+        return new_nodes
+    
+    def array_copy_linear(self, offset, count: int,
+                          weld_tolerance: Optional[float] = None) -> List[Node3D]:
+        """선택 영역을 offset 간격으로 count 개 복사"""
+        return self.array_copy_selected(linear_transforms(offset, count), weld_tolerance)
+    
+    def array_copy_grid(self, offset_u, count_u: int, offset_v, count_v: int,
+                        weld_tolerance: Optional[float] = None) -> List[Node3D]:
+        """선택 영역을 두 방향 격자로 복사 (개수는 원본 포함)"""
+        return self.array_copy_selected(grid_transforms(offset_u, count_u, offset_v, count_v),
+                                        weld_tolerance)
+    
+    def array_copy_polar(self, axis, count: int, step_deg: float, center='origin',
+                         weld_tolerance: Optional[float] = None) -> List[Node3D]:
+        """선택 영역을 축 기준으로 step_deg 씩 회전하며 count 개 복사"""
+        return self.array_copy_selected(
+            polar_transforms(axis, self.resolve_pivot(center), count, step_deg), weld_tolerance)
+    
+    def auto_connect_selected(self, line_type: LineType, max_distance: float,
+                              min_distance: float = 0.0, axes=None,
+                              angle_tolerance: float = 5.0) -> List[Line3D]:
         """
-        MIDAS MGB 파일 로드
+        선택된 노드 중 거리 범위 안의 모든 쌍을 라인으로 연결 (실행 취소 한 단계)
+        
+        이미 같은 타입으로 연결된 쌍은 건너뜁니다.
+        
         Args:
-            filepath: MGB 파일 경로
+            line_type: 생성할 라인 타입
+            max_distance: 최대 거리
+            min_distance: 최소 거리
+            axes: 방향 제약 ('x', 'xy' 등 또는 방향 벡터 리스트, None 이면 제약 없음)
+            angle_tolerance: 방향 허용 각도 (도)
+            
+        Returns:
+            생성된 Line3D 리스트
+        """
+        scene = self.scene
+        if len(scene.selected_nodes) < 2:
+            print("라인을 생성하려면 최소 2개의 노드를 선택해야 합니다.")
+            return []
+        scene._check_writable()
+        
+        nodes = sorted(scene.selected_nodes, key=lambda n: n.number)
+        positions = np.array([n.position for n in nodes], dtype=np.float64)
+        try:
+            pairs = radius_pairs(positions, max_distance, min_distance, axes, angle_tolerance)
+        except ValueError as e:
+            print(f"❌ 자동 연결 실패: {e}")
+            return []
+        
+        slots = scene._slots_of(nodes)
+        starts, ends = slots[pairs[:, 0]], slots[pairs[:, 1]]
+        valid = scene.new_edge_mask(starts, ends, line_type_to_code(line_type))
+        
+        with scene.transaction("자동 연결"):
+            lines = scene.add_lines_bulk(starts[valid], ends[valid], line_type)
+        
+        print(f"🔗 자동 연결: 후보 {len(pairs)}쌍, {line_type.value} 라인 {len(lines)}개 생성")
+        return lines
+    
+    def weld_nodes(self, tolerance: float, selected_only: bool = False) -> int:
+        """
+        tolerance 이내로 겹친 노드를 하나로 합침 (실행 취소 한 단계)
+        
+        연쇄적으로 가까운 노드도 한 묶음이며, 묶음에서 번호가 가장 작은 노드가 남습니다.
+        합쳐지는 노드에 붙은 라인은 남는 노드로 옮기고, 길이 0 이 되거나
+        같은 타입으로 이미 있는 라인과 겹치면 버립니다.
+        
+        Args:
+            tolerance: 합칠 거리
+            selected_only: 선택된 노드끼리만 합침
+            
+        Returns:
+            삭제(합쳐진) 노드 수
+        """
+        scene = self.scene
+        scene._check_writable()
+        source = scene.selected_nodes if selected_only else scene.nodes
+        nodes = sorted(source, key=lambda n: n.number)
+        if len(nodes) < 2:
+            print("합칠 노드가 없습니다.")
+            return 0
+        
+        positions = np.array([n.position for n in nodes], dtype=np.float64)
+        rep = merge_coincident(positions, tolerance)
+        merged = np.flatnonzero(rep != np.arange(len(nodes)))
+        if not len(merged):
+            print(f"{tolerance} 이내로 겹친 노드가 없습니다.")
+            return 0
+        
+        # 노드 인덱스 → 남는 노드 인덱스 (전체 라인 끝점을 한 번에 옮김)
+        slots = scene._slots_of(nodes)
+        remap = np.arange(len(scene.nodes), dtype=np.int64)
+        remap[slots] = slots[rep]
+        starts, ends = scene.line_endpoints().T
+        ok = (starts >= 0) & (ends >= 0)
+        new_starts = np.where(ok, remap[np.maximum(starts, 0)], starts)
+        new_ends = np.where(ok, remap[np.maximum(ends, 0)], ends)
+        moved = np.flatnonzero(ok & ((new_starts != starts) | (new_ends != ends)))
+        
+        old_lines = [scene.lines[i] for i in moved.tolist()]
+        types = np.array([l.line_type for l in old_lines], dtype=object)
+        codes = scene.line_codes()[moved]
+        
+        # 옮긴 라인의 새 키에는 합쳐지는 노드가 없으므로 옮기기 전 인덱스로 검사해도 같음
+        keep = scene.new_edge_mask(new_starts[moved], new_ends[moved], codes)
+        
+        with scene.transaction("노드 용접"):
+            scene._delete_lines(old_lines)
+            lines = scene.add_lines_bulk(new_starts[moved][keep], new_ends[moved][keep], types[keep])
+            for line, i in zip(lines, np.flatnonzero(keep).tolist()):
+                if getattr(old_lines[i], 'element_id', 0):
+                    line.element_id = old_lines[i].element_id
+            scene._delete_nodes([nodes[i] for i in merged.tolist()])
+        
+        print(f"🧲 노드 용접: {len(merged)}개 노드 합침, 라인 {len(lines)}개 옮김 "
+              f"({len(old_lines) - len(lines)}개 제거)")
+        return len(merged)
+    
+    def split_intersections(self, tolerance: float = 1e-3, split: bool = True,
+                            selected_only: bool = False) -> int:
+        """
+        노드 없이 교차하는 라인 찾기 / 교차점에서 나누기 (실행 취소 한 단계)
+        
+        교차점이 한 라인의 끝 노드 위에 있으면(T자) 그 노드로 다른 라인만 나누고,
+        두 라인의 가운데에서 만나면 새 노드를 만들어 둘 다 나눕니다.
+        같은 위치의 교차점은 노드 하나를 함께 씁니다.
+        
+        Args:
+            tolerance: 교차 판정 거리
+            split: False 면 나누지 않고 교차하는 라인만 선택
+            selected_only: 선택된 라인끼리만 검사
+            
+        Returns:
+            찾은 교차 수
+        """
+        scene = self.scene
+        scene._check_writable()
+        endpoints = scene.line_endpoints()
+        usable = (endpoints >= 0).all(axis=1)
+        if selected_only:
+            chosen = np.zeros(len(scene.lines), dtype=bool)
+            chosen[scene._slots_of(list(scene.selected_lines), lines=True)] = True
+            usable &= chosen
+        line_ids = np.flatnonzero(usable)
+        segments = endpoints[line_ids]
+        positions = scene.node_positions()
+        starts, ends = positions[segments[:, 0]], positions[segments[:, 1]]
+        
+        found = find_intersections(starts, ends, tolerance, endpoint_ids=segments)
+        pairs, s, t = found['pairs'], found['s'], found['t']
+        if not len(pairs):
+            print("✅ 교차하는 라인이 없습니다.")
+            return 0
+        i, j = pairs[:, 0], pairs[:, 1]
+        
+        if not split:
+            scene.clear_selection()
+            scene.set_lines_selected([scene.lines[k] for k in line_ids[np.unique(pairs)].tolist()])
+            print(f"✂️ 교차 {len(pairs)}곳 (라인 {len(np.unique(pairs))}개 선택)")
+            return len(pairs)
+        
+        # 교차점 노드: 어느 한 라인의 끝이면 그 끝 노드, 아니면 새 노드
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        node = np.full(len(pairs), -1, dtype=np.int64)
+        for seg, param in ((i, s), (j, t)):
+            node = np.where(param * lengths[seg] <= tolerance, segments[seg, 0], node)
+            node = np.where((1 - param) * lengths[seg] <= tolerance, segments[seg, 1], node)
+        fresh = np.flatnonzero(node < 0)
+        rep = merge_coincident(found['points'][fresh], tolerance)
+        unique = np.flatnonzero(rep == np.arange(len(fresh)))
+        slot = np.zeros(len(fresh), dtype=np.int64)
+        slot[unique] = len(scene.nodes) + np.arange(len(unique))
+        node[fresh] = slot[rep]
+        
+        # 라인별 분할점 (끝 노드 위에 있는 교차점으로는 그 라인을 나누지 않음)
+        inner_i = (node != segments[i, 0]) & (node != segments[i, 1])
+        inner_j = (node != segments[j, 0]) & (node != segments[j, 1])
+        owner, pieces = split_pieces(np.concatenate([i[inner_i], j[inner_j]]),
+                                     np.concatenate([s[inner_i], t[inner_j]]),
+                                     np.concatenate([node[inner_i], node[inner_j]]), segments)
+        old_lines = [scene.lines[k] for k in line_ids[np.unique(owner)].tolist()]
+        piece_lines = [scene.lines[k] for k in line_ids[owner].tolist()]
+        types = np.array([l.line_type for l in piece_lines], dtype=object)
+        codes = scene.line_codes()[line_ids[owner]]
+        groups = np.fromiter((scene.lines[k].start_node.group_id
+                              for k in line_ids[i[fresh[unique]]].tolist()),
+                             dtype=np.int32, count=len(unique))
+        
+        with scene.transaction("교차 분할"):
+            new_nodes = scene.add_nodes_bulk(self.node_manager.reserve(len(unique)),
+                                             found['points'][fresh[unique]], groups)
+            scene._delete_lines(old_lines)
+            keep = scene.new_edge_mask(pieces[:, 0], pieces[:, 1], codes)
+            lines = scene.add_lines_bulk(pieces[keep, 0], pieces[keep, 1], types[keep])
+        
+        print(f"✂️ 교차 분할: 교차 {len(pairs)}곳, 새 노드 {len(new_nodes)}개, "
+              f"라인 {len(old_lines)}개 → {len(lines)}개")
+        return len(pairs)
+    
+    def group_by_connectivity(self, min_size: int = 2,
+                              keep=(EXTERIOR_GROUP_ID,)) -> int:
+        """
+        라인으로 연결된 노드끼리 같은 그룹이 되도록 그룹 ID 재계산 (실행 취소 한 단계)
+        
+        큰 성분부터 Group 1, 2, ... 순서이며, 라인이 없는 노드는 마지막 그룹 하나로 모읍니다.
+        
+        Args:
+            min_size: 이보다 작은 성분은 외톨이 그룹으로 모음
+            keep: 그대로 둘 그룹 ID (기본: 외장 그룹) - 새 그룹 번호에서도 건너뜀
+            
+        Returns:
+            만든 그룹 수
+        """
+        scene = self.scene
+        scene._check_writable()
+        nodes = scene.nodes
+        current = np.fromiter((n.group_id for n in nodes), dtype=np.int32, count=len(nodes))
+        free = ~np.isin(current, list(keep))
+        
+        starts, ends = scene.line_endpoints().T
+        ok = (starts >= 0) & (ends >= 0)
+        starts, ends = starts[ok], ends[ok]
+        inside = free[starts] & free[ends]
+        local = np.cumsum(free) - 1
+        edges = np.column_stack([local[starts[inside]], local[ends[inside]]])
+        
+        group_ids, group_count = component_group_ids(int(free.sum()), edges, min_size, keep)
+        new = current.copy()
+        new[free] = group_ids
+        changed = self._assign_groups(nodes, new, "연결 성분 그룹")
+        
+        print(f"🧩 연결 성분 그룹: {group_count}개 (변경된 노드 {changed}개)")
+        return group_count
+    
+    def _assign_groups(self, nodes: List[Node3D], group_ids: np.ndarray, label: str) -> int:
+        """그룹 ID 가 바뀌는 노드만 한 단계로 변경하고 변경된 노드 수 반환"""
+        current = np.fromiter((n.group_id for n in nodes), dtype=np.int32, count=len(nodes))
+        changed = np.flatnonzero(np.asarray(group_ids) != current)
+        if len(changed):
+            with self.scene.transaction(label):
+                self.scene.set_node_groups([nodes[i] for i in changed.tolist()],
+                                           np.asarray(group_ids)[changed])
+        return len(changed)
+    
+    def start_cluster_groups(self, method: str = 'voxel', distance: float = 1.0,
+                             min_points: int = 1, selected_only: bool = False,
+                             keep=(EXTERIOR_GROUP_ID,)) -> Optional[ClusterJob]:
+        """
+        공간 군집 계산을 작업 스레드에서 시작 (끝나면 apply_cluster_job 으로 적용)
+        
+        Args:
+            method: 'dbscan' | 'voxel' (clustering 모듈 참고)
+            distance: dbscan eps 또는 복셀 크기
+            min_points: dbscan 핵심점 기준 / voxel 최소 군집 크기
+            selected_only: 선택된 노드만 나눔 (나머지 노드의 그룹 번호는 건너뜀)
+            keep: 그대로 둘 그룹 ID (기본: 외장 그룹)
+        """
+        scene = self.scene
+        scene._check_writable()
+        source = scene.selected_nodes if selected_only else scene.nodes
+        nodes = sorted((n for n in source if n.group_id not in keep), key=lambda n: n.number)
+        if not nodes:
+            print("군집으로 나눌 노드가 없습니다.")
+            return None
+        positions = np.array([n.position for n in nodes], dtype=np.float64)
+        versions = (scene.stats.versions['structure'], scene.stats.versions['geometry'])
+        return ClusterJob(nodes, positions, method, distance, min_points, versions).start()
+    
+    def apply_cluster_job(self, job: ClusterJob, keep=(EXTERIOR_GROUP_ID,)) -> int:
+        """
+        끝난 군집 계산 결과를 그룹 ID 로 적용 (실행 취소 한 단계)
+        
+        큰 군집부터 그룹 번호를 주고 잡음은 마지막 그룹 하나로 모읍니다.
+        계산 중에 노드가 추가/삭제/이동되었으면 적용하지 않습니다.
+        
+        Returns:
+            만든 그룹 수 (적용하지 않았으면 0)
+        """
+        if job.error is not None:
+            print(f"❌ 군집 계산 실패: {job.error}")
+            return 0
+        stats = self.scene.stats
+        if job.versions != (stats.versions['structure'], stats.versions['geometry']):
+            print("⚠️ 군집 계산 중 씬이 바뀌어 결과를 적용하지 않았습니다.")
+            return 0
+        
+        # 대상이 아닌 노드가 쓰는 그룹 번호는 건너뜀
+        targets = {id(n) for n in job.nodes}
+        reserved = set(keep) | {n.group_id for n in self.scene.nodes if id(n) not in targets}
+        group_ids, group_count = ranked_group_ids(job.labels, 1, reserved)
+        changed = self._assign_groups(job.nodes, group_ids, "군집 그룹")
+        
+        noise = int((job.labels < 0).sum())
+        print(f"🧩 {job.method} 군집 그룹: {group_count}개 (잡음 {noise}개, 변경된 노드 {changed}개)")
+        return group_count
+    
+    def cluster_groups(self, method: str = 'voxel', distance: float = 1.0,
+                       min_points: int = 1, selected_only: bool = False) -> int:
+        """공간 군집으로 그룹 나누기 (계산이 끝날 때까지 기다리는 버전)"""
+        job = self.start_cluster_groups(method, distance, min_points, selected_only)
+        if job is None:
+            return 0
+        job.wait()
+        return self.apply_cluster_job(job)
+    
+    def load_mgb(self, filepath: str, use_cache: bool = True) -> bool:
+        """
+        MIDAS MGT 파일 로드 (.mgb 는 지원하지 않음 - 안내 후 False)
+        
+        파서가 만든 배열로 노드를 한 번에 추가하고, 요소(면 요소는 외곽 변)를
+        connect_elements 로 일괄 연결합니다. 같은 파일은 가져오기 캐시에서 읽습니다.
+        Args:
+            filepath: MGT 파일 경로
+            use_cache: False 이면 캐시를 우회하고 항상 다시 파싱
         Returns:
             bool: 성공 여부
         """
         try:
+            if self._load_from_cache(filepath, 'midas', use_cache):
+                self.last_element_failures = None
+                return True
+            
             # 파일 확장자에 따라 파서 선택
             if filepath.lower().endswith('.mgb'):
                 parser = MidasMGBParser()
@@ -366,25 +1906,27 @@ class NodeEditor3D:
             if not success:
                 return False
             
-            # 기존 씬 클리어
-            self.scene.clear_all()
-            
-            # 절점 데이터 추가
-            nodes_3d = parser.get_nodes_as_node3d()
-            for node in nodes_3d:
-                self.scene.add_node(node)
-            
-            # 요소 데이터로 라인 연결
-            if hasattr(parser, 'get_elements_info'):
-                elements_data = parser.get_elements_info()
-                for element in elements_data:
-                    start_node = self.scene.get_node_by_number(element['start_node'])
-                    end_node = self.scene.get_node_by_number(element['end_node'])
-                    
-                    if start_node and end_node:
-                        line_type = parser.get_element_line_type(element)
-                        self.scene.connect_nodes(start_node, end_node, line_type)
+            with self.scene.loading():
+                # 기존 씬을 절점으로 교체
+                self.scene.clear()
+                self.scene.add_nodes_bulk(parser.node_numbers, parser.node_coords)
+                
+                # 요소 데이터로 라인 연결
+                edges = parser.get_edge_arrays()
+                # 선 요소만 원본 요소 번호 유지 (면 요소 외곽 변은 번호 없음)
+                is_line_element = edges['types'] <= ELEMENT_TYPES.index('COMPTR')
+                created, self.last_element_failures = self.connect_elements(
+                    edges['start'], edges['end'], edges['types'],
+                    line_types=ELEMENT_LINE_TYPE_TABLE,
+                    element_ids=np.where(is_line_element, edges['element_ids'], 0)
+                )
+                
+                self.group_by_connectivity()
             
+            print(f"✅ MIDAS 모델 로드 완료: 노드 {len(self.scene.nodes)}개, 라인 {created}개")
+            if len(self.last_element_failures):
+                print(f"⚠️ 연결 실패: {len(self.last_element_failures)}개")
+            self._store_in_cache(filepath, 'midas', use_cache)
             return True
             
         except Exception as e:
@@ -392,125 +1934,133 @@ class NodeEditor3D:
             return False
         
     def load_elements_csv(self, filepath: str) -> bool:
-            """
-            Elements CSV 파일 로드하여 절점들을 연결
-            CSV 형식: Element, Type, Node1, Node2, ... 
-            Args:
-                filepath: Elements CSV 파일 경로
-            Returns:
-                bool: 성공 여부
-            """
-            try:
-                import pandas as pd
-                from .data_structures import LineType
-                
-                print(f"🔍 Elements CSV 파싱 시작: {filepath}")
-                
-                # CSV 파일 읽기
-                df = pd.read_csv(filepath)
-                print(f"📊 Elements CSV 데이터 형태: {df.shape}")
-                print(f"📋 컬럼들: {list(df.columns)}")
-                
-                # 컬럼명 정리 (공백 제거)
-                df.columns = df.columns.str.strip()
-                
-                # Node1, Node2 컬럼 찾기
-                node1_col = None
-                node2_col = None
-                
-                for col in df.columns:
-                    if 'node1' in col.lower() or 'node 1' in col.lower():
-                        node1_col = col
-                    elif 'node2' in col.lower() or 'node 2' in col.lower():
-                        node2_col = col
-                
-                if node1_col is None or node2_col is None:
-                    print(f"❌ Node1, Node2 컬럼을 찾을 수 없습니다. 컬럼들: {list(df.columns)}")
-                    return False
-                    
-                print(f"✅ 연결 컬럼 발견: {node1_col} → {node2_col}")
-                
-                # 기존 노드들로 딕셔너리 생성 (빠른 검색을 위해)
-                nodes_dict = {}
-                if hasattr(self.scene, 'nodes'):
-                    for node in self.scene.nodes:
-                        nodes_dict[node.number] = node
-                    print(f"📍 기존 노드 수: {len(nodes_dict)}")
-                else:
-                    print("❌ scene.nodes가 없습니다!")
-                    return False
-                
-                # 연결선 생성
-                connections_made = 0
-                failed_connections = 0
-                
-                for index, row in df.iterrows():
-                    try:
-                        # 노드 번호 추출
-                        node1_num = int(row[node1_col])
-                        node2_num = int(row[node2_col])
-                        
-                        # 노드가 0이면 스킵 (빈 연결)
-                        if node1_num == 0 or node2_num == 0:
-                            continue
-                        
-                        # 노드 찾기
-                        node1 = nodes_dict.get(node1_num)
-                        node2 = nodes_dict.get(node2_num)
-                        
-                        if node1 and node2:
-                            # 요소 타입에 따른 LineType 결정
-                            element_type = str(row.get('Type', 'BEAM')).upper()
-                            
-                            if 'BEAM' in element_type:
-                                line_type = LineType.MATERIAL  # 빨간색
-                            else:
-                                line_type = LineType.PANER     # 초록색
-                                 # ✨ 디버깅 추가 ✨
-                            print(f"🔍 Scene 확인:")
-                            print(f"   - hasattr(self.scene, 'lines'): {hasattr(self.scene, 'lines')}")
-                            
-                            # 라인 연결 (원래 순서로 복원)
-                        if hasattr(self.scene, 'connect_nodes'):
-                            self.scene.connect_nodes(node1, node2, line_type)
-                        elif hasattr(self.scene, 'lines'):
-                            # 직접 Line3D 객체 생성
-                            from .data_structures import Line3D
-                            line = Line3D(node1, node2, line_type)
-                            
-                            # 그룹 정보 추가
-                            if hasattr(node1, 'group_id') and hasattr(node2, 'group_id'):
-                                line.group_ids = {node1.group_id, node2.group_id}
-                                print(f"🏷️  라인 그룹: {line.group_ids}")
-                            else:
-                                line.group_ids = {0}
-                            
-                            self.scene.lines.append(line)
-
-                            connections_made += 1
-                            print(f"🔗 연결 생성: Node {node1_num} → Node {node2_num} ({element_type})")
-                            
-                        else:
-                            failed_connections += 1
-                            missing = []
-                            if not node1:
-                                missing.append(f"Node{node1_num}")
-                            if not node2:
-                                missing.append(f"Node{node2_num}")
-                            print(f"⚠️  연결 실패: {', '.join(missing)} 노드를 찾을 수 없음")
-                            
-                    except Exception as e:
-                        failed_connections += 1
-                        print(f"❌ 행 {index} 처리 중 오류: {e}")
-                        continue
-                
-                print(f"✅ Elements 로드 완료:")
-                print(f"   - 성공한 연결: {connections_made}개")
-                print(f"   - 실패한 연결: {failed_connections}개")
-                print(f"   - 총 라인 수: {len(self.scene.lines) if hasattr(self.scene, 'lines') else 0}개")
-                
-                return connections_made > 0
+        """
+        Elements CSV 파일 로드하여 절점들을 연결
+        CSV 형식: Element, Type, Node1, Node2, ... 
+        
+        연결 실패 행은 self.last_element_failures 에 구조 배열
+        (row, node1, node2, reason) 로 남깁니다.
+        Args:
+            filepath: Elements CSV 파일 경로
+        Returns:
+            bool: 성공 여부
+        """
+        try:
+            print(f"🔍 Elements CSV 파싱 시작: {filepath}")
+            
+            # CSV 파일 읽기
+            df = pd.read_csv(filepath)
+            print(f"📊 Elements CSV 데이터 형태: {df.shape}")
+            
+            # 컬럼명 정리 (공백 제거)
+            df.columns = df.columns.str.strip()
+            
+            # Node1, Node2 컬럼 찾기
+            node1_col = None
+            node2_col = None
+            
+            for col in df.columns:
+                if 'node1' in col.lower() or 'node 1' in col.lower():
+                    node1_col = col
+                elif 'node2' in col.lower() or 'node 2' in col.lower():
+                    node2_col = col
+            
+            if node1_col is None or node2_col is None:
+                print(f"❌ Node1, Node2 컬럼을 찾을 수 없습니다. 컬럼들: {list(df.columns)}")
+                return False
                 
-            except Exception as e:
-                print(f"❌ Elements CSV 로드 실패: {e}")
-                return False
\ No newline at end of file
+            print(f"✅ 연결 컬럼 발견: {node1_col} → {node2_col}")
+            
+            # 요소 타입 분류 (BEAM → MATERIAL, 그 외 → PANER)
+            if 'Type' in df.columns:
+                is_beam = df['Type'].astype(str).str.upper().str.contains('BEAM', regex=False).to_numpy()
+            else:
+                is_beam = np.ones(len(df), dtype=bool)
+            
+            created, failures = self.connect_elements(
+                pd.to_numeric(df[node1_col], errors='coerce').to_numpy(dtype=np.float64),
+                pd.to_numeric(df[node2_col], errors='coerce').to_numpy(dtype=np.float64),
+                np.where(is_beam, 0, 1)
+            )
+            self.last_element_failures = failures
+            if created:
+                self.group_by_connectivity()
+            
+            print(f"✅ Elements 로드 완료:")
+            print(f"   - 성공한 연결: {created}개")
+            print(f"   - 실패한 연결: {len(failures)}개")
+            if len(failures):
+                reasons, counts = np.unique(failures['reason'], return_counts=True)
+                for reason, count in zip(reasons, counts):
+                    print(f"     · {reason}: {count}개")
+            print(f"   - 총 라인 수: {len(self.scene.lines)}개")
+            
+            return created > 0
+            
+        except Exception as e:
+            print(f"❌ Elements CSV 로드 실패: {e}")
+            return False
+    
+    def connect_elements(self, node1_numbers: np.ndarray, node2_numbers: np.ndarray,
+                         type_codes: np.ndarray,
+                         line_types: Tuple[LineType, ...] = (LineType.MATERIAL, LineType.PANER),
+                         element_ids: Optional[np.ndarray] = None
+                         ) -> Tuple[int, np.ndarray]:
+        """
+        요소 연결 배열을 한 번에 라인으로 생성
+        
+        Args:
+            node1_numbers: 시작 노드 번호 (NaN = 잘못된 값)
+            node2_numbers: 끝 노드 번호
+            type_codes: line_types 에 대한 인덱스 배열
+            line_types: 코드 → LineType 표
+            element_ids: 라인에 남길 원본 요소 번호 (0 = 없음)
+            
+        Returns:
+            (생성된 라인 수, 실패 구조 배열) 튜플
+            실패 배열 필드: row, node1, node2, reason
+        """
+        n1 = np.asarray(node1_numbers, dtype=np.float64)
+        n2 = np.asarray(node2_numbers, dtype=np.float64)
+        type_codes = np.asarray(type_codes)
+        rows = np.arange(len(n1))
+        
+        invalid = ~(np.isfinite(n1) & np.isfinite(n2))
+        n1_int = np.where(invalid, 0, n1).astype(np.int64)
+        n2_int = np.where(invalid, 0, n2).astype(np.int64)
+        
+        # 노드 번호 0 은 빈 연결 → 조용히 건너뜀
+        empty = ~invalid & ((n1_int == 0) | (n2_int == 0))
+        candidate = ~invalid & ~empty
+        
+        idx1 = self.scene.lookup_node_indices(n1_int)
+        idx2 = self.scene.lookup_node_indices(n2_int)
+        missing1 = candidate & (idx1 < 0)
+        missing2 = candidate & (idx2 < 0)
+        ok = candidate & ~missing1 & ~missing2
+        
+        # 유효한 연결을 한 번에 추가
+        type_table = np.array(line_types, dtype=object)
+        new_lines = self.scene.add_lines_bulk(idx1[ok], idx2[ok], type_table[type_codes[ok]])
+        if element_ids is not None:
+            for line, element_id in zip(new_lines, np.asarray(element_ids)[ok].tolist()):
+                if element_id:
+                    line.element_id = element_id
+        
+        # 실패 요약
+        failed = invalid | missing1 | missing2
+        reason = np.full(len(n1), '', dtype='U16')
+        reason[invalid] = 'invalid_number'
+        reason[missing1] = 'missing_node1'
+        reason[missing2] = 'missing_node2'
+        reason[missing1 & missing2] = 'missing_both'
+        
+        failures = np.zeros(int(failed.sum()), dtype=[
+            ('row', np.int64), ('node1', np.int64), ('node2', np.int64), ('reason', 'U16')
+        ])
+        failures['row'] = rows[failed]
+        failures['node1'] = n1_int[failed]
+        failures['node2'] = n2_int[failed]
+        failures['reason'] = reason[failed]
+        
+        return int(ok.sum()), failures
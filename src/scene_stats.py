@@ -0,0 +1,210 @@
+"""
+씬 파생 값 캐시 (경계, 중심, 선택 집계)
+
+Scene3D 의 내부 편집 연산이 변경분을 직접 알려 주면 경계/합계/선택 집계를
+증분으로 갱신합니다. 버전 카운터가 바뀌지 않는 한 cached() 결과를 재사용합니다.
+"""
+from bisect import bisect_left, insort
+from collections import Counter
+import numpy as np
+from typing import Callable, List, Optional, Tuple
+
+
+# 이 개수 이하면 하나씩 이진 삽입/삭제, 넘으면 한 번에 병합
+_INSORT_LIMIT = 64
+
+
+def _position_sum(nodes: list) -> np.ndarray:
+    if not nodes:
+        return np.zeros(3)
+    return np.array([n.position for n in nodes], dtype=np.float64).sum(axis=0)
+
+
+class SceneStats:
+    """
+    씬 파생 값과 버전 카운터
+
+    버전:
+        structure - 노드/라인 추가·삭제, 씬 교체
+        geometry  - 노드 좌표가 바뀌는 모든 변경 (structure 포함)
+        selection - 선택 상태 변경
+
+    경계는 추가 시 넓히고, 삭제/이동한 좌표가 경계면에 닿아 있었을 때만
+    무효화해 다음 조회 때 다시 계산합니다.
+    """
+
+    def __init__(self):
+        self.versions = {'structure': 0, 'geometry': 0, 'selection': 0}
+        self._memo = {}
+        self.reset()
+
+    # ----- 버전 / 메모 -----
+
+    def bump(self, *names: str):
+        for name in names:
+            self.versions[name] += 1
+
+    def cached(self, key: str, depends: Tuple[str, ...], compute: Callable):
+        """
+        버전 카운터에 묶인 값 캐시
+
+        Args:
+            key: 캐시 이름
+            depends: 의존하는 버전 이름들 - 하나라도 바뀌면 다시 계산
+            compute: 값을 만드는 함수
+        """
+        stamp = tuple(self.versions[name] for name in depends)
+        hit = self._memo.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+        value = compute()
+        self._memo[key] = (stamp, value)
+        return value
+
+    # ----- 전체 노드 집계 -----
+
+    def reset(self, positions: Optional[np.ndarray] = None, selected: Optional[list] = None):
+        """집계를 처음부터 다시 만듦 (씬 교체/불일치 복구)"""
+        positions = (np.empty((0, 3)) if positions is None
+                     else np.asarray(positions, dtype=np.float64).reshape(-1, 3))
+        self.node_count = len(positions)
+        self.position_sum = positions.sum(axis=0)
+        if len(positions):
+            self._lo, self._hi = positions.min(axis=0), positions.max(axis=0)
+        else:
+            self._lo = self._hi = None
+        self._bounds_stale = False
+
+        selected = selected or []
+        self.selected_count = len(selected)
+        self.selected_sum = _position_sum(selected)
+        self._selected_numbers: List[int] = sorted(n.number for n in selected)
+        self.bump('structure', 'geometry', 'selection')
+
+    def _touches_bounds(self, positions: np.ndarray) -> bool:
+        if self._lo is None:
+            return False
+        return bool(np.any(positions <= self._lo) or np.any(positions >= self._hi))
+
+    def _widen(self, positions: np.ndarray):
+        if self._bounds_stale or not len(positions):
+            return
+        lo, hi = positions.min(axis=0), positions.max(axis=0)
+        if self._lo is None:
+            self._lo, self._hi = lo, hi
+        else:
+            self._lo = np.minimum(self._lo, lo)
+            self._hi = np.maximum(self._hi, hi)
+
+    def nodes_added(self, nodes: list):
+        positions = np.array([n.position for n in nodes], dtype=np.float64).reshape(-1, 3)
+        self.node_count += len(nodes)
+        self.position_sum = self.position_sum + positions.sum(axis=0)
+        self._widen(positions)
+        self._selection_add([n for n in nodes if n.is_selected], bump=False)
+        self.bump('structure', 'geometry')
+
+    def nodes_removed(self, nodes: list, selected: list):
+        positions = np.array([n.position for n in nodes], dtype=np.float64).reshape(-1, 3)
+        self.node_count -= len(nodes)
+        self.position_sum = self.position_sum - positions.sum(axis=0)
+        if self.node_count == 0:
+            self._lo = self._hi = None
+            self._bounds_stale = False
+            self.position_sum = np.zeros(3)
+        elif self._touches_bounds(positions):
+            self._bounds_stale = True
+        self._selection_remove(selected, bump=False)
+        self.bump('structure', 'geometry')
+
+    def nodes_moved(self, nodes: list, old: np.ndarray, new: np.ndarray):
+        self.position_sum = self.position_sum + (new.sum(axis=0) - old.sum(axis=0))
+        if self._touches_bounds(old):
+            self._bounds_stale = True
+        self._widen(new)
+        selected = np.fromiter((n.is_selected for n in nodes), dtype=bool, count=len(nodes))
+        if selected.any():
+            self.selected_sum = self.selected_sum + (new[selected] - old[selected]).sum(axis=0)
+        self.bump('geometry')
+
+    def lines_changed(self):
+        self.bump('structure')
+
+    def bounds(self, all_positions: Callable[[], np.ndarray]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        정확한 (min, max) 경계 - 무효화된 경우에만 all_positions() 로 다시 계산
+
+        Returns:
+            (min, max) 또는 노드가 없으면 None
+        """
+        if self.node_count == 0:
+            return None
+        if self._bounds_stale or self._lo is None:
+            positions = all_positions()
+            self._lo, self._hi = positions.min(axis=0), positions.max(axis=0)
+            self._bounds_stale = False
+        return self._lo.copy(), self._hi.copy()
+
+    def center(self) -> np.ndarray:
+        if self.node_count == 0:
+            return np.zeros(3)
+        return self.position_sum / self.node_count
+
+    # ----- 선택 집계 -----
+
+    def _selection_add(self, nodes: list, bump: bool = True):
+        if not nodes:
+            return
+        self.selected_sum = self.selected_sum + _position_sum(nodes)
+        numbers = self._selected_numbers
+        if len(nodes) <= _INSORT_LIMIT:
+            for node in nodes:
+                insort(numbers, node.number)
+        else:
+            # 정렬된 두 구간 병합 (timsort 는 선형 시간)
+            numbers.extend(sorted(n.number for n in nodes))
+            numbers.sort()
+        self.selected_count += len(nodes)
+        if bump:
+            self.bump('selection')
+
+    def _selection_remove(self, nodes: list, bump: bool = True):
+        if not nodes:
+            return
+        self.selected_sum = self.selected_sum - _position_sum(nodes)
+        numbers = self._selected_numbers
+        if len(nodes) <= _INSORT_LIMIT:
+            for node in nodes:
+                i = bisect_left(numbers, node.number)
+                if i < len(numbers) and numbers[i] == node.number:
+                    del numbers[i]
+        else:
+            pending = Counter(n.number for n in nodes)
+            kept = []
+            for number in numbers:
+                if pending.get(number):
+                    pending[number] -= 1
+                else:
+                    kept.append(number)
+            numbers[:] = kept
+        self.selected_count -= len(nodes)
+        if self.selected_count == 0:
+            self.selected_sum = np.zeros(3)
+        if bump:
+            self.bump('selection')
+
+    def selection_changed(self, nodes: list, selected: bool):
+        if selected:
+            self._selection_add(nodes)
+        else:
+            self._selection_remove(nodes)
+
+    @property
+    def selected_numbers(self) -> List[int]:
+        """선택된 노드 번호 (정렬됨, 복사본)"""
+        return list(self._selected_numbers)
+
+    def selected_average(self) -> np.ndarray:
+        if self.selected_count == 0:
+            return np.zeros(3)
+        return self.selected_sum / self.selected_count
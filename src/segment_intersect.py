@@ -0,0 +1,196 @@
+"""
+3D 선분 교차 검사 (균등 격자 + 벡터화 최근접점 계산)
+
+    1. 넓은 단계: 선분이 지나는 격자 칸마다 (칸 키, 선분) 항목을 만들고
+       정렬해 같은 칸에 있는 선분 쌍만 후보로 남깁니다 (O(L²) 비교 없음).
+    2. 좁은 단계: 후보 쌍의 최근접점을 한꺼번에 계산해 tolerance 이내인 쌍을 찾습니다.
+    3. 분할: 교차점 매개변수로 선분을 여러 조각으로 나눕니다.
+"""
+import numpy as np
+from typing import Optional, Tuple
+
+
+def _cell_entries(lo: np.ndarray, hi: np.ndarray, cell: float) -> Tuple[np.ndarray, np.ndarray]:
+    """상자 (lo, hi) 들이 걸치는 격자 칸의 (칸 키, 상자 인덱스) 배열"""
+    origin = lo.min(axis=0)
+    c_lo = np.floor((lo - origin) / cell).astype(np.int64)
+    c_hi = np.floor((hi - origin) / cell).astype(np.int64)
+    span = c_hi - c_lo + 1
+    dims = c_hi.max(axis=0) + 1
+    if float(np.prod(dims.astype(np.float64))) >= 2.0 ** 62:
+        raise ValueError("격자 칸 크기가 좌표 범위에 비해 너무 작습니다.")
+
+    counts = span.prod(axis=1)
+    box = np.repeat(np.arange(len(lo), dtype=np.int64), counts)
+    # 상자마다 0..count-1 을 (x, y, z) 칸 오프셋으로 풀기
+    local = np.arange(counts.sum(), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+    sy, sz = span[box, 1], span[box, 2]
+    ox, rest = np.divmod(local, sy * sz)
+    oy, oz = np.divmod(rest, sz)
+    cx = c_lo[box, 0] + ox
+    cy = c_lo[box, 1] + oy
+    cz = c_lo[box, 2] + oz
+    return (cx * dims[1] + cy) * dims[2] + cz, box
+
+
+def candidate_pairs(starts: np.ndarray, ends: np.ndarray, tolerance: float,
+                    cell_size: Optional[float] = None) -> np.ndarray:
+    """
+    같은 격자 칸을 지나는 선분 쌍 (넓은 단계)
+
+    선분 위를 칸 크기의 절반 간격으로 찍은 점마다 작은 상자(칸 1/4 + tolerance)를
+    격자에 등록하므로, 긴 선분도 실제로 지나는 칸에만 들어갑니다.
+
+    Args:
+        starts, ends: (L, 3) 선분 양 끝 좌표
+        tolerance: 교차 판정 거리
+        cell_size: 격자 칸 크기 (None 이면 선분 길이 중앙값, 최소 4 * tolerance)
+
+    Returns:
+        (P, 2) int64 선분 인덱스 쌍 (i < j, 중복 없음)
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+    count = len(starts)
+    if count < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    lengths = np.linalg.norm(ends - starts, axis=1)
+    cell = float(cell_size) if cell_size else float(np.median(lengths))
+    cell = max(cell, 4 * tolerance, 1e-9)
+
+    # 선분별 표본점 (양 끝 포함, 간격 cell / 2 이하)
+    samples = np.ceil(lengths / (cell / 2)).astype(np.int64) + 1
+    segment = np.repeat(np.arange(count, dtype=np.int64), samples)
+    step = np.arange(len(segment)) - np.repeat(np.cumsum(samples) - samples, samples)
+    u = step / np.maximum(samples - 1, 1)[segment]
+    points = starts[segment] + (ends - starts)[segment] * u[:, None]
+    reach = cell / 4 + tolerance
+    keys, box = _cell_entries(points - reach, points + reach, cell)
+    segment = segment[box]
+
+    # (칸, 선분) 중복 제거 후 칸 키 순으로 정렬
+    order = np.lexsort((segment, keys))
+    keys, segment = keys[order], segment[order]
+    fresh = np.ones(len(keys), dtype=bool)
+    fresh[1:] = (keys[1:] != keys[:-1]) | (segment[1:] != segment[:-1])
+    keys, segment = keys[fresh], segment[fresh]
+
+    # 같은 칸 안의 모든 쌍: 각 항목이 같은 칸의 뒤쪽 항목들과 짝
+    boundary = np.flatnonzero(np.diff(keys)) + 1
+    group_start = np.concatenate([[0], boundary])
+    group_size = np.diff(np.concatenate([group_start, [len(keys)]]))
+    position = np.arange(len(keys)) - np.repeat(group_start, group_size)
+    partners = np.repeat(group_size, group_size) - position - 1
+    first = np.repeat(np.arange(len(keys)), partners)
+    offset = np.arange(len(first)) - np.repeat(np.cumsum(partners) - partners, partners)
+    a, b = segment[first], segment[first + 1 + offset]
+    if not len(a):
+        return np.empty((0, 2), dtype=np.int64)
+
+    # 같은 쌍이 여러 칸에서 나오므로 하나만 남김
+    pair_keys = np.unique(np.minimum(a, b) * count + np.maximum(a, b))
+    return np.column_stack(np.divmod(pair_keys, count)).astype(np.int64)
+
+
+def closest_points(p1: np.ndarray, q1: np.ndarray, p2: np.ndarray,
+                   q2: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    선분 쌍 (p1-q1, p2-q2) 의 최근접점 매개변수 (벡터화)
+
+    Returns:
+        (s, t, distance, parallel) - 최근접점은 p1 + s*(q1-p1), p2 + t*(q2-p2),
+        parallel 은 두 선분이 평행(또는 길이 0)인 쌍
+    """
+    d1, d2, r = q1 - p1, q2 - p2, p1 - p2
+    a = np.einsum('ij,ij->i', d1, d1)
+    e = np.einsum('ij,ij->i', d2, d2)
+    b = np.einsum('ij,ij->i', d1, d2)
+    c = np.einsum('ij,ij->i', d1, r)
+    f = np.einsum('ij,ij->i', d2, r)
+    denom = a * e - b * b
+    parallel = denom <= 1e-12 * np.maximum(a * e, 1e-300)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(parallel, 0.0, np.clip((b * f - c * e) / denom, 0.0, 1.0))
+        t = (b * s + f) / e
+        s = np.where(t < 0, np.clip(-c / a, 0.0, 1.0), s)
+        s = np.where(t > 1, np.clip((b - c) / a, 0.0, 1.0), s)
+        t = np.clip(t, 0.0, 1.0)
+    s = np.nan_to_num(s)
+    t = np.nan_to_num(t)
+    gap = (p1 + d1 * s[:, None]) - (p2 + d2 * t[:, None])
+    return s, t, np.sqrt(np.einsum('ij,ij->i', gap, gap)), parallel
+
+
+def find_intersections(starts: np.ndarray, ends: np.ndarray, tolerance: float,
+                       endpoint_ids: Optional[np.ndarray] = None,
+                       cell_size: Optional[float] = None) -> dict:
+    """
+    tolerance 이내로 만나는 선분 쌍
+
+    끝 노드를 공유하는 쌍(endpoint_ids 가 같은 쌍), 평행한 쌍, 두 선분의 끝점끼리만
+    닿는 쌍은 교차로 보지 않습니다.
+
+    Args:
+        starts, ends: (L, 3) 선분 양 끝 좌표
+        tolerance: 교차 판정 거리
+        endpoint_ids: (L, 2) 양 끝 노드 인덱스 (공유 노드 제외용)
+        cell_size: 격자 칸 크기 (candidate_pairs 참고)
+
+    Returns:
+        {'pairs': (K, 2), 's': (K,), 't': (K,), 'points': (K, 3)} 딕셔너리
+        points 는 두 최근접점의 중점
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+    pairs = candidate_pairs(starts, ends, tolerance, cell_size)
+    if endpoint_ids is not None and len(pairs):
+        ids = np.asarray(endpoint_ids, dtype=np.int64).reshape(-1, 2)
+        a, b = ids[pairs[:, 0]], ids[pairs[:, 1]]
+        shared = (a[:, :1] == b).any(axis=1) | (a[:, 1:] == b).any(axis=1)
+        pairs = pairs[~shared]
+
+    i, j = pairs[:, 0], pairs[:, 1]
+    s, t, distance, parallel = closest_points(starts[i], ends[i], starts[j], ends[j])
+    length_i = np.linalg.norm(ends[i] - starts[i], axis=1)
+    length_j = np.linalg.norm(ends[j] - starts[j], axis=1)
+    inner_i = (s * length_i > tolerance) & ((1 - s) * length_i > tolerance)
+    inner_j = (t * length_j > tolerance) & ((1 - t) * length_j > tolerance)
+    hit = (distance <= tolerance) & ~parallel & (inner_i | inner_j)
+
+    pairs, s, t = pairs[hit], s[hit], t[hit]
+    i, j = pairs[:, 0], pairs[:, 1]
+    points = 0.5 * ((starts[i] + (ends[i] - starts[i]) * s[:, None]) +
+                    (starts[j] + (ends[j] - starts[j]) * t[:, None]))
+    return {'pairs': pairs, 's': s, 't': t, 'points': points}
+
+
+def split_pieces(segment_ids: np.ndarray, params: np.ndarray, node_ids: np.ndarray,
+                 endpoint_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    분할점으로 선분을 조각으로 나눔
+
+    Args:
+        segment_ids: (K,) 분할할 선분 인덱스
+        params: (K,) 선분 위 분할 위치 (0~1)
+        node_ids: (K,) 분할점 노드 인덱스
+        endpoint_ids: (L, 2) 선분 양 끝 노드 인덱스
+
+    Returns:
+        (조각별 원래 선분 인덱스 (M,), 조각 양 끝 노드 인덱스 (M, 2))
+        - 분할점이 없는 선분은 포함하지 않음
+    """
+    endpoint_ids = np.asarray(endpoint_ids, dtype=np.int64).reshape(-1, 2)
+    split = np.unique(segment_ids)
+    # 각 분할 선분의 시작(0)/끝(1)과 분할점을 한 표로 모아 (선분, 위치) 순으로 정렬
+    segment = np.concatenate([split, split, segment_ids])
+    param = np.concatenate([np.zeros(len(split)), np.ones(len(split)), params])
+    node = np.concatenate([endpoint_ids[split, 0], endpoint_ids[split, 1], node_ids])
+    order = np.lexsort((param, segment))
+    segment, node = segment[order], node[order]
+
+    same = segment[1:] == segment[:-1]
+    pieces = np.column_stack([node[:-1], node[1:]])[same]
+    owner = segment[:-1][same]
+    keep = pieces[:, 0] != pieces[:, 1]
+    return owner[keep], pieces[keep]
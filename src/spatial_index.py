@@ -0,0 +1,116 @@
+"""
+노드 좌표 공간 인덱스 (scipy cKDTree)
+
+Scene3D.spatial_index() 가 geometry 버전에 묶어 캐시하므로 좌표가 바뀌지 않는 동안
+같은 트리를 재사용합니다. 용접(weld)·근접 검색에 쓰는 배열 함수도 여기 둡니다.
+"""
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+
+def build_kdtree(positions: np.ndarray) -> cKDTree:
+    """(N, 3) 좌표로 KD-트리 생성"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    return cKDTree(positions)
+
+
+def match_points(tree: cKDTree, points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    각 점에서 tolerance 이내의 가장 가까운 트리 점 인덱스
+
+    Returns:
+        (len(points),) int64 배열 - 없으면 -1
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if tree.n == 0 or len(points) == 0:
+        return np.full(len(points), -1, dtype=np.int64)
+    distance, index = tree.query(points, k=1, distance_upper_bound=tolerance)
+    return np.where(np.isfinite(distance), index, -1).astype(np.int64)
+
+
+def pair_components(count: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    (i, j) 쌍으로 연결된 성분마다 대표(가장 작은 인덱스) 배열
+
+    Returns:
+        (count,) int64 배열 - 각 항목이 속한 성분의 가장 작은 인덱스
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if len(pairs) == 0:
+        return np.arange(count, dtype=np.int64)
+    graph = coo_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+                       shape=(count, count))
+    _, labels = connected_components(graph, directed=False)
+    # 각 성분의 첫 등장 인덱스 = 가장 작은 인덱스
+    _, first = np.unique(labels, return_index=True)
+    return first[labels].astype(np.int64)
+
+
+def merge_coincident(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    tolerance 이내로 겹치는 점끼리 묶은 대표 인덱스 (연쇄적으로 가까운 점도 한 묶음)
+
+    Returns:
+        (N,) int64 배열 - 자기 자신이 대표면 자기 인덱스
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) < 2:
+        return np.arange(len(points), dtype=np.int64)
+    pairs = cKDTree(points).query_pairs(tolerance, output_type='ndarray')
+    return pair_components(len(points), pairs)
+
+
+_AXIS_VECTORS = {'x': (1.0, 0.0, 0.0), 'y': (0.0, 1.0, 0.0), 'z': (0.0, 0.0, 1.0)}
+
+
+def axis_directions(axes) -> np.ndarray:
+    """
+    방향 제약을 단위 벡터 배열로 변환
+
+    Args:
+        axes: 'x', 'xy', 'xyz' 같은 축 문자열 또는 방향 벡터 리스트
+    """
+    if isinstance(axes, str):
+        try:
+            vectors = [_AXIS_VECTORS[a] for a in axes.lower()]
+        except KeyError:
+            raise ValueError(f"알 수 없는 축입니다: {axes}")
+    else:
+        vectors = axes
+    vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, 3)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def radius_pairs(points: np.ndarray, max_distance: float, min_distance: float = 0.0,
+                 axes=None, angle_tolerance: float = 5.0) -> np.ndarray:
+    """
+    거리 범위 안의 모든 점 쌍 (반경 그래프)
+
+    Args:
+        points: (N, 3) 좌표
+        max_distance: 최대 거리 (포함)
+        min_distance: 최소 거리 (포함)
+        axes: 지정하면 쌍의 방향이 이 축들 중 하나와 angle_tolerance 도 이내인 것만
+        angle_tolerance: 방향 허용 각도 (도)
+
+    Returns:
+        (M, 2) int64 점 인덱스 쌍 (i < j)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = cKDTree(points).query_pairs(max_distance, output_type='ndarray').astype(np.int64)
+    if not len(pairs):
+        return pairs.reshape(0, 2)
+
+    diffs = points[pairs[:, 1]] - points[pairs[:, 0]]
+    lengths = np.sqrt(np.einsum('ij,ij->i', diffs, diffs))
+    keep = lengths >= min_distance
+    if axes is not None:
+        directions = axis_directions(axes)
+        cosines = np.abs(diffs @ directions.T).max(axis=1)
+        limit = np.cos(np.radians(angle_tolerance))
+        keep &= cosines >= limit * np.maximum(lengths, 1e-300)
+    return pairs[keep]
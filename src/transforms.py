@@ -0,0 +1,85 @@
+"""
+4x4 아핀 변환 행렬 (이동, 회전, 크기, 대칭)
+
+행렬은 열 벡터 기준(p' = M @ [x, y, z, 1])이며, apply_affine 은
+(N, 3) 좌표 배열 전체에 한 번의 행렬 곱으로 적용합니다.
+"""
+import numpy as np
+from typing import Sequence, Union
+
+
+_AXES = {'x': 0, 'y': 1, 'z': 2}
+
+
+def _axis_vector(axis: Union[str, Sequence[float]]) -> np.ndarray:
+    """'x'/'y'/'z' 또는 벡터 → 단위 벡터"""
+    if isinstance(axis, str):
+        if axis.lower() not in _AXES:
+            raise ValueError(f"알 수 없는 축입니다: {axis}")
+        vector = np.zeros(3)
+        vector[_AXES[axis.lower()]] = 1.0
+        return vector
+    vector = np.asarray(axis, dtype=np.float64).reshape(3)
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        raise ValueError("축 벡터의 길이가 0입니다.")
+    return vector / norm
+
+
+def translation_matrix(offset: Sequence[float]) -> np.ndarray:
+    """이동 행렬"""
+    matrix = np.eye(4)
+    matrix[:3, 3] = np.asarray(offset, dtype=np.float64).reshape(3)
+    return matrix
+
+
+def rotation_matrix(axis: Union[str, Sequence[float]], angle_deg: float) -> np.ndarray:
+    """
+    원점을 지나는 축 기준 회전 행렬 (로드리게스 공식)
+
+    Args:
+        axis: 'x'/'y'/'z' 또는 회전축 벡터
+        angle_deg: 회전 각도 (도, 오른손 법칙)
+    """
+    k = _axis_vector(axis)
+    theta = np.radians(angle_deg)
+    cross = np.array([[0, -k[2], k[1]],
+                      [k[2], 0, -k[0]],
+                      [-k[1], k[0], 0]])
+    matrix = np.eye(4)
+    matrix[:3, :3] = np.eye(3) + np.sin(theta) * cross + (1 - np.cos(theta)) * (cross @ cross)
+    return matrix
+
+
+def scale_matrix(factors: Union[float, Sequence[float]]) -> np.ndarray:
+    """크기 변경 행렬 (균일 또는 축별 배율)"""
+    factors = np.broadcast_to(np.asarray(factors, dtype=np.float64), (3,))
+    matrix = np.eye(4)
+    matrix[:3, :3] = np.diag(factors)
+    return matrix
+
+
+def mirror_matrix(normal: Union[str, Sequence[float]]) -> np.ndarray:
+    """
+    원점을 지나는 평면 기준 대칭 행렬
+
+    Args:
+        normal: 평면 법선 - 'x' 면 YZ 평면 기준 대칭 (x → -x)
+    """
+    n = _axis_vector(normal)
+    matrix = np.eye(4)
+    matrix[:3, :3] = np.eye(3) - 2.0 * np.outer(n, n)
+    return matrix
+
+
+def about_pivot(matrix: np.ndarray, pivot: Sequence[float]) -> np.ndarray:
+    """변환 기준점을 pivot 으로 옮긴 행렬 (T(p) @ M @ T(-p))"""
+    pivot = np.asarray(pivot, dtype=np.float64).reshape(3)
+    return translation_matrix(pivot) @ matrix @ translation_matrix(-pivot)
+
+
+def apply_affine(positions: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """(N, 3) 좌표 배열에 4x4 아핀 행렬 적용"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return positions @ matrix[:3, :3].T + matrix[:3, 3]
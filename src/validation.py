@@ -0,0 +1,116 @@
+"""
+모델 검사 (내보내기 전 오류 찾기)
+
+노드/라인 배열 전체에 대해 정렬·np.unique·KD-트리로 한 번에 검사합니다.
+    duplicate_numbers - 같은 번호를 가진 노드 (모든 중복 노드)
+    coincident_nodes  - tolerance 이내로 겹친 노드
+    orphan_nodes      - 라인이 하나도 연결되지 않은 노드
+    dangling_lines    - 끝 노드가 씬에 없는 라인
+    zero_length_lines - 양 끝이 같은 노드이거나 길이가 tolerance 이하인 라인
+    duplicate_lines   - 같은 두 노드를 잇는 두 번째 이후 라인 (방향/타입 무시)
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Dict, List
+
+
+NODE_CHECKS = ('duplicate_numbers', 'coincident_nodes', 'orphan_nodes')
+LINE_CHECKS = ('dangling_lines', 'zero_length_lines', 'duplicate_lines')
+
+CHECK_LABELS = {
+    'duplicate_numbers': '중복 노드 번호',
+    'coincident_nodes': '겹친 노드',
+    'orphan_nodes': '연결 없는 노드',
+    'dangling_lines': '끝 노드 없는 라인',
+    'zero_length_lines': '길이 0 라인',
+    'duplicate_lines': '중복 라인',
+}
+
+
+class ValidationReport:
+    """
+    검사 결과
+
+    각 검사 이름(NODE_CHECKS, LINE_CHECKS)의 속성에 해당 노드/라인 인덱스 배열
+    (오름차순 int64)이 들어 있습니다. coincident_pairs 는 겹친 노드 쌍 (k, 2) 입니다.
+    """
+
+    def __init__(self, tolerance: float):
+        self.tolerance = tolerance
+        for name in NODE_CHECKS + LINE_CHECKS:
+            setattr(self, name, np.empty(0, dtype=np.int64))
+        self.coincident_pairs = np.empty((0, 2), dtype=np.int64)
+
+    @property
+    def is_clean(self) -> bool:
+        return not any(len(getattr(self, name)) for name in NODE_CHECKS + LINE_CHECKS)
+
+    def counts(self) -> Dict[str, int]:
+        """검사별 문제 개수"""
+        return {name: len(getattr(self, name)) for name in NODE_CHECKS + LINE_CHECKS}
+
+    def node_indices(self) -> np.ndarray:
+        """문제가 있는 노드 인덱스 전체"""
+        return np.unique(np.concatenate([getattr(self, name) for name in NODE_CHECKS]))
+
+    def line_indices(self) -> np.ndarray:
+        """문제가 있는 라인 인덱스 전체"""
+        return np.unique(np.concatenate([getattr(self, name) for name in LINE_CHECKS]))
+
+    def summary(self) -> List[str]:
+        """검사별 한 줄 요약"""
+        return [f"{CHECK_LABELS[name]}: {count}개" for name, count in self.counts().items()]
+
+
+def _mark_duplicates(keys: np.ndarray, all_occurrences: bool) -> np.ndarray:
+    """같은 키가 두 번 이상 나온 위치 (all_occurrences 가 False 면 첫 번째는 제외)"""
+    order = np.argsort(keys, kind='stable')
+    same = keys[order][1:] == keys[order][:-1]
+    flag = np.zeros(len(keys), dtype=bool)
+    flag[1:] |= same
+    if all_occurrences:
+        flag[:-1] |= same
+    return np.sort(order[flag])
+
+
+def validate_arrays(numbers: np.ndarray, positions: np.ndarray, edges: np.ndarray,
+                    tolerance: float = 1e-6) -> ValidationReport:
+    """
+    노드/라인 배열 검사
+
+    Args:
+        numbers: (N,) 노드 번호
+        positions: (N, 3) 좌표
+        edges: (E, 2) 노드 인덱스 쌍 - 없는 노드는 -1
+        tolerance: 겹친 노드 / 길이 0 판정 거리
+
+    Returns:
+        ValidationReport
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    n = len(numbers)
+    report = ValidationReport(tolerance)
+
+    if n:
+        report.duplicate_numbers = _mark_duplicates(numbers, all_occurrences=True)
+        pairs = cKDTree(positions).query_pairs(tolerance, output_type='ndarray')
+        report.coincident_pairs = pairs.astype(np.int64).reshape(-1, 2)
+        report.coincident_nodes = np.unique(report.coincident_pairs)
+
+    dangling = (edges < 0).any(axis=1) | (edges >= n).any(axis=1)
+    report.dangling_lines = np.flatnonzero(dangling)
+    valid = np.flatnonzero(~dangling)
+    start, end = edges[valid, 0], edges[valid, 1]
+
+    degree = np.bincount(np.concatenate([start, end]), minlength=n)
+    report.orphan_nodes = np.flatnonzero(degree == 0)
+
+    diffs = positions[start] - positions[end]
+    lengths = np.sqrt(np.einsum('ij,ij->i', diffs, diffs))
+    report.zero_length_lines = valid[(start == end) | (lengths <= tolerance)]
+
+    keys = np.minimum(start, end) * max(n, 1) + np.maximum(start, end)
+    report.duplicate_lines = valid[_mark_duplicates(keys, all_occurrences=False)]
+    return report